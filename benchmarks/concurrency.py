@@ -0,0 +1,74 @@
+"""
+Measures how the throughput of the thread-pool helper scales with the number of threads.
+
+Each workload runs a fixed list of independent calls through pyclothoids.parallel.map with 1, 2, 4, ...
+threads up to the number of cores and reports the calls per second together with the speedup over a single
+thread.  Since every binding releases the GIL while it computes, the speedup should be close to the thread
+count as long as there are idle cores.
+
+Usage: python benchmarks/concurrency.py [--calls N] [--repeat R]
+"""
+
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+import pyclothoids
+from pyclothoids import Clothoid, SolveG2
+
+
+def make_workloads(ncalls):
+    rng = np.random.default_rng(0)
+    x1 = rng.uniform(5, 50, ncalls)
+    y1 = rng.uniform(-20, 20, ncalls)
+    t1 = rng.uniform(-math.pi / 2, math.pi / 2, ncalls)
+    k1 = rng.uniform(-0.05, 0.05, ncalls)
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.05, 0.004, 60)
+    qx = rng.uniform(-20, 40, ncalls)
+    qy = rng.uniform(-20, 40, ncalls)
+    return {
+        "SolveG2": (lambda *p: SolveG2(0, 0, 0, 0, *p), (x1, y1, t1, k1)),
+        "G1Hermite": (lambda *p: Clothoid.G1Hermite(0, 0, 0, *p), (x1, y1, t1)),
+        "Projection": (clothoid._ProjectPointOntoClothoid, (qx, qy)),
+    }
+
+
+def thread_counts():
+    counts, n = [], 1
+    while n < (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count() or 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        "{:<12} {:>8} {:>14} {:>8}".format("workload", "threads", "calls/s", "speedup")
+    )
+    for name, (func, inputs) in make_workloads(args.calls).items():
+        baseline = None
+        for num_threads in thread_counts():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                pyclothoids.parallel.map(func, *inputs, num_threads=num_threads)
+                best = min(best, time.perf_counter() - start)
+            rate = args.calls / best
+            baseline = baseline or rate
+            print(
+                "{:<12} {:>8} {:>14.0f} {:>8.2f}".format(
+                    name, num_threads, rate, rate / baseline
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
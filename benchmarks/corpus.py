@@ -0,0 +1,80 @@
+"""
+A fixed-seed corpus of road geometries shared by the benchmarks.
+
+Segments follow the alignment elements of road design: tangents, circular arcs with radii between 30 m and
+1.5 km, and transition spirals whose clothoid parameter A lies between 30 m and 500 m, with lengths of tens to
+hundreds of meters.  Interpolation problems join poses 30 m to 200 m apart with heading changes of up to 60
+degrees, as between the control points of a lane centerline.
+"""
+
+import math
+
+import numpy as np
+
+from pyclothoids import ClothoidArray
+
+SEED = 20200621
+
+
+def road_segments(n, seed=SEED):
+    """
+    Returns a float64 array of shape (n, 6) whose rows are the StandardParams of tangents, arcs and spirals
+    in equal proportions, starting at points spread over a 1 km square
+    """
+    rng = np.random.default_rng(seed)
+    x0 = rng.uniform(0, 1000, n)
+    y0 = rng.uniform(0, 1000, n)
+    t0 = rng.uniform(-math.pi, math.pi, n)
+    kind = np.arange(n) % 3
+    sign = rng.choice((-1.0, 1.0), n)
+    radius = np.exp(rng.uniform(math.log(30), math.log(1500), n))
+    a = rng.uniform(30, 500, n)
+    k0 = np.where(kind == 1, sign / radius, 0.0)
+    dk = np.where(kind == 2, sign / a**2, 0.0)
+    length = np.where(
+        kind == 2, np.minimum(a**2 / radius, 400), rng.uniform(20, 300, n)
+    )
+    return np.stack([x0, y0, t0, k0, dk, length], axis=1)
+
+
+def g2_problems(n, seed=SEED):
+    """
+    Returns a float64 array of shape (n, 8) whose rows are the arguments x0, y0, t0, k0, x1, y1, t1, k1 of
+    SolveG2.  Each problem starts at the origin heading along the X axis.
+    """
+    rng = np.random.default_rng(seed + 1)
+    distance = rng.uniform(30, 200, n)
+    bearing = rng.uniform(-math.pi / 6, math.pi / 6, n)
+    t1 = bearing + rng.uniform(-math.pi / 6, math.pi / 6, n)
+    k0 = rng.uniform(-1 / 200, 1 / 200, n)
+    k1 = rng.uniform(-1 / 200, 1 / 200, n)
+    zeros = np.zeros(n)
+    return np.stack(
+        [
+            zeros,
+            zeros,
+            zeros,
+            k0,
+            distance * np.cos(bearing),
+            distance * np.sin(bearing),
+            t1,
+            k1,
+        ],
+        axis=1,
+    )
+
+
+def query_points(segments, n, seed=SEED):
+    """
+    Returns a float64 array of shape (n, 3) whose rows hold the index of a segment and the X and Y coordinates
+    of a point within 10 m of it, as reported by a vehicle following the road
+    """
+    rng = np.random.default_rng(seed + 2)
+    index = rng.integers(0, len(segments), n)
+    chosen = ClothoidArray.FromParameters(segments[index])
+    s = rng.uniform(0, 1, n) * chosen.length
+    x, y, theta = chosen.Evaluate(s, ("X", "Y", "Theta"))
+    offset = rng.uniform(-10, 10, n)
+    return np.stack(
+        [index, x - offset * np.sin(theta), y + offset * np.cos(theta)], axis=1
+    )
@@ -0,0 +1,49 @@
+"""
+Measures the per-call overhead of the Clothoid object model.
+
+Each operation is timed with timeit and reported in nanoseconds per call: reading the defining parameters,
+which are cached in the object, reading end values and binding evaluation functions, which go to the C++
+layer, and constructing, copying and pickling Clothoids.
+
+Usage: python benchmarks/object_model.py [--number N] [--repeat R]
+"""
+
+import argparse
+import pickle
+import timeit
+
+from pyclothoids import Clothoid
+
+OPERATIONS = (
+    ("length", "clothoid.length"),
+    ("XStart", "clothoid.XStart"),
+    ("Parameters", "clothoid.Parameters"),
+    ("KappaEnd", "clothoid.KappaEnd"),
+    ("bind X", "clothoid.X"),
+    ("X(s)", "clothoid.X(1.0)"),
+    ("StandardParams", "Clothoid.StandardParams(0, 0, 0, 0.1, 0.01, 5)"),
+    ("copy", "Clothoid(clothoid)"),
+    ("pickle", "pickle.loads(pickle.dumps(clothoid))"),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    namespace = {
+        "Clothoid": Clothoid,
+        "pickle": pickle,
+        "clothoid": Clothoid.StandardParams(0, 0, 0, 0.1, 0.01, 5),
+    }
+    print("{:<16} {:>10}".format("operation", "ns/call"))
+    for name, statement in OPERATIONS:
+        timer = timeit.Timer(statement, globals=namespace)
+        best = min(timer.repeat(repeat=args.repeat, number=args.number))
+        print("{:<16} {:>10.0f}".format(name, best / args.number * 1e9))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures the speedup and the accuracy of the fast precision mode of sampling over the exact mode.
+
+For each tolerance, every clothoid of the road corpus is sampled at --points points with SampleXY, once with
+the exact mode and once with the fast mode at that tolerance.  The script reports the sampled points per
+second of both modes, the speedup, and the largest distance found between the fast and the exact points
+relative to the tolerance.  This stays below 1 until the tolerance nears the rounding error of the
+coordinates, about 1e-13 for the corpus, whose coordinates run into the thousands.
+
+Usage: python benchmarks/precision.py [--segments N] [--points P] [--repeat R]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pyclothoids import Clothoid
+
+from corpus import road_segments
+
+TOLERANCES = (1e-3, 1e-6, 1e-9, 1e-12)
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=300)
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    clothoids = [Clothoid.StandardParams(*row) for row in road_segments(args.segments)]
+    npts = args.points
+    exact = [clothoid.SampleXY(npts) for clothoid in clothoids]
+    seconds = best_time(lambda: [c.SampleXY(npts) for c in clothoids], args.repeat)
+    baseline = len(clothoids) * npts / seconds
+
+    print(
+        "{:<10} {:>14} {:>8} {:>14}".format(
+            "precision", "points/s", "speedup", "error/tol"
+        )
+    )
+    print("{:<10} {:>14.0f} {:>8.2f} {:>14}".format("exact", baseline, 1, "-"))
+    for tol in TOLERANCES:
+        seconds = best_time(
+            lambda: [c.SampleXY(npts, precision=tol) for c in clothoids], args.repeat
+        )
+        rate = len(clothoids) * npts / seconds
+        error = max(
+            np.hypot(*(c.SampleXY(npts, precision=tol) - e)).max()
+            for c, e in zip(clothoids, exact)
+        )
+        print(
+            "{:<10} {:>14.0f} {:>8.2f} {:>14.3f}".format(
+                "{:g}".format(tol), rate, rate / baseline, error / tol
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""
+Benchmarks the hot paths of pyclothoids over the fixed-seed road corpus of benchmarks/corpus.py.
+
+The run command times every benchmark whose name contains one of the --filter substrings and prints the
+time per operation.  Each round repeats its workload until it lasts at least --min-time seconds, and the
+statistics are taken over --rounds rounds.  With --output the results are also written as JSON, in the
+layout of pytest-benchmark.
+
+The compare command reads two such files and prints the ratio of a statistic, the minimum by default, for
+every benchmark found in both.  A ratio above 1 + threshold is flagged as a regression, and the command exits
+with status 1 when there is any, so it can gate a CI job.
+
+Usage:
+    python benchmarks/suite.py run [--filter NAME ...] [--output results.json] [--rounds R] [--min-time T]
+    python benchmarks/suite.py compare baseline.json candidate.json [--threshold 0.1] [--stat min]
+    python benchmarks/suite.py list
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import pyclothoids
+from pyclothoids import Clothoid, ClothoidArray, SolveG2, SolveG2Batch
+
+from corpus import road_segments, g2_problems, query_points
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Registers a benchmark.  The decorated function receives the corpus and returns a tuple of a callable and
+    the number of operations that one call of it performs.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def make_corpus(size):
+    segments = road_segments(size)
+    clothoids = [Clothoid.StandardParams(*row) for row in segments]
+    queries = query_points(segments, size)
+    return {
+        "segments": segments,
+        "clothoids": clothoids,
+        "problems": g2_problems(max(size // 4, 1)),
+        "queries": [(clothoids[int(i)], x, y) for i, x, y in queries],
+        "mid": [clothoid.length / 2 for clothoid in clothoids],
+    }
+
+
+# --- Construction ---
+
+
+@benchmark("construct.StandardParams")
+def construct_standard_params(corpus):
+    rows = [tuple(row) for row in corpus["segments"]]
+    return (lambda: [Clothoid.StandardParams(*row) for row in rows]), len(rows)
+
+
+@benchmark("construct.G1Hermite")
+def construct_g1_hermite(corpus):
+    rows = [tuple(row[[0, 1, 2, 4, 5, 6]]) for row in corpus["problems"]]
+    return (lambda: [Clothoid.G1Hermite(*row) for row in rows]), len(rows)
+
+
+@benchmark("construct.Forward")
+def construct_forward(corpus):
+    rows = [tuple(row[:6]) for row in corpus["problems"]]
+    return (lambda: [Clothoid.Forward(*row) for row in rows]), len(rows)
+
+
+# --- Evaluation ---
+
+
+@benchmark("evaluate.X")
+def evaluate_x(corpus):
+    pairs = list(zip(corpus["clothoids"], corpus["mid"]))
+    return (lambda: [clothoid.X(s) for clothoid, s in pairs]), len(pairs)
+
+
+@benchmark("evaluate.Evaluate")
+def evaluate_evaluate(corpus):
+    pairs = list(zip(corpus["clothoids"], corpus["mid"]))
+    return (lambda: [clothoid.Evaluate(s) for clothoid, s in pairs]), len(pairs)
+
+
+@benchmark("evaluate.SampleXY")
+def evaluate_sample_xy(corpus):
+    clothoids = corpus["clothoids"]
+    return (lambda: [clothoid.SampleXY(100) for clothoid in clothoids]), len(clothoids)
+
+
+@benchmark("evaluate.ClothoidArray.SampleXY")
+def evaluate_array_sample_xy(corpus):
+    array = ClothoidArray.FromClothoids(corpus["clothoids"])
+    return (lambda: array.SampleXY(100)), len(array)
+
+
+@benchmark("evaluate.SampleXY.fast")
+def evaluate_sample_xy_fast(corpus):
+    clothoids = corpus["clothoids"]
+    return (
+        lambda: [clothoid.SampleXY(100, precision="fast") for clothoid in clothoids]
+    ), len(clothoids)
+
+
+@benchmark("evaluate.ClothoidArray.SampleXY.fast")
+def evaluate_array_sample_xy_fast(corpus):
+    array = ClothoidArray.FromClothoids(corpus["clothoids"])
+    return (lambda: array.SampleXY(100, precision="fast")), len(array)
+
+
+# --- Projection ---
+
+
+def project_all(queries):
+    return [clothoid.Distance(x, y) for clothoid, x, y in queries]
+
+
+@benchmark("project.cache-hit")
+def project_cache_hit(corpus):
+    queries = [(Clothoid(clothoid), x, y) for clothoid, x, y in corpus["queries"][:200]]
+    project_all(queries)
+    return (lambda: project_all(queries)), len(queries)
+
+
+@benchmark("project.cache-miss")
+def project_cache_miss(corpus):
+    queries = [(Clothoid(clothoid), x, y) for clothoid, x, y in corpus["queries"]]
+    for clothoid, _, _ in queries:
+        clothoid.SetupProjectionCache(0)
+    project_all(queries)
+    return (lambda: project_all(queries)), len(queries)
+
+
+@benchmark("project.uncached")
+def project_uncached(corpus):
+    queries = [(Clothoid(clothoid), x, y) for clothoid, x, y in corpus["queries"]]
+    for clothoid, _, _ in queries:
+        clothoid.SetupProjectionCache(None)
+    project_all(queries)
+    return (lambda: project_all(queries)), len(queries)
+
+
+@benchmark("project.ClothoidArray.ProjectPoints")
+def project_array(corpus):
+    array = ClothoidArray.FromClothoids([c for c, _, _ in corpus["queries"]])
+    xy = np.array([[x, y] for _, x, y in corpus["queries"]]).T
+    return (lambda: array.ProjectPoints(xy)), len(array)
+
+
+# --- Intersection ---
+
+
+@benchmark("intersect.IntersectionArcLengths")
+def intersect_arc_lengths(corpus):
+    pairs = []
+    for clothoid, s in zip(corpus["clothoids"][:200], corpus["mid"]):
+        crossing = clothoid.Rotate(math.pi / 3, (clothoid.X(s), clothoid.Y(s)))
+        pairs.append((Clothoid(clothoid), crossing))
+    for clothoid, other in pairs:
+        clothoid.IntersectionArcLengths(other)
+    return (lambda: [c.IntersectionArcLengths(o) for c, o in pairs]), len(pairs)
+
+
+# --- Distance ---
+
+
+def distance_pairs(corpus):
+    # each clothoid and a copy turned about its middle and moved sideways, which may or may not cross it
+    pairs = []
+    for clothoid, s in zip(corpus["clothoids"][:200], corpus["mid"]):
+        turned = clothoid.Rotate(math.pi / 6, (clothoid.X(s), clothoid.Y(s)))
+        pairs.append((clothoid, turned.Translate(0, 4)))
+    return pairs
+
+
+@benchmark("distance.DistanceTo")
+def distance_to(corpus):
+    pairs = distance_pairs(corpus)
+    return (lambda: [c.DistanceTo(o) for c, o in pairs]), len(pairs)
+
+
+@benchmark("distance.ClothoidArray.DistanceTo")
+def distance_array(corpus):
+    pairs = distance_pairs(corpus)
+    array = ClothoidArray.FromClothoids([c for c, _ in pairs])
+    others = ClothoidArray.FromClothoids([o for _, o in pairs])
+    return (lambda: array.DistanceTo(others)), len(array)
+
+
+# --- Transforms and pickling ---
+
+
+@benchmark("transform.Translate")
+def transform_translate(corpus):
+    clothoids = corpus["clothoids"]
+    return (lambda: [c.Translate(10.0, -5.0) for c in clothoids]), len(clothoids)
+
+
+@benchmark("transform.Rotate")
+def transform_rotate(corpus):
+    clothoids = corpus["clothoids"]
+    return (lambda: [c.Rotate(0.3, (500, 500)) for c in clothoids]), len(clothoids)
+
+
+@benchmark("transform.Scale")
+def transform_scale(corpus):
+    clothoids = corpus["clothoids"]
+    return (lambda: [c.Scale(1.5, (500, 500)) for c in clothoids]), len(clothoids)
+
+
+@benchmark("transform.Reverse")
+def transform_reverse(corpus):
+    clothoids = corpus["clothoids"]
+    return (lambda: [c.Reverse() for c in clothoids]), len(clothoids)
+
+
+@benchmark("transform.Trim")
+def transform_trim(corpus):
+    pairs = list(zip(corpus["clothoids"], corpus["mid"]))
+    return (lambda: [c.Trim(s / 2, s) for c, s in pairs]), len(pairs)
+
+
+@benchmark("pickle.roundtrip")
+def pickle_roundtrip(corpus):
+    clothoids = corpus["clothoids"]
+    return (lambda: pickle.loads(pickle.dumps(clothoids))), len(clothoids)
+
+
+# --- G2 interpolation ---
+
+
+@benchmark("solve.SolveG2")
+def solve_g2(corpus):
+    rows = [tuple(row) for row in corpus["problems"]]
+    return (lambda: [SolveG2(*row) for row in rows]), len(rows)
+
+
+@benchmark("solve.SolveG2Batch")
+def solve_g2_batch(corpus):
+    columns = corpus["problems"].T
+    return (lambda: SolveG2Batch(*columns, num_threads=1)), len(corpus["problems"])
+
+
+# --- Running ---
+
+
+def measure(func, ops, rounds, min_time):
+    func()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(1.2 * min_time / elapsed)))
+    times = [elapsed / (loops * ops)]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        times.append((time.perf_counter() - start) / (loops * ops))
+    mean = statistics.mean(times)
+    return {
+        "min": min(times),
+        "max": max(times),
+        "mean": mean,
+        "median": statistics.median(times),
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": len(times),
+        "iterations": loops * ops,
+        "ops": 1 / mean,
+    }
+
+
+def machine_info():
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "python_implementation": platform.python_implementation(),
+        "python_version": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "numpy_version": np.__version__,
+        "pyclothoids_path": os.path.dirname(pyclothoids.__file__),
+    }
+
+
+def commit_info():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"id": commit}
+
+
+def run(args):
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.filter or any(part in name for part in args.filter)
+    ]
+    corpus = make_corpus(args.size)
+    print(
+        "{:<38} {:>12} {:>12} {:>12} {:>7} {:>12}".format(
+            "benchmark", "min (us)", "median (us)", "stddev (us)", "rounds", "ops/s"
+        )
+    )
+    results = []
+    for name in names:
+        func, ops = BENCHMARKS[name](corpus)
+        stats = measure(func, ops, args.rounds, args.min_time)
+        results.append({"name": name, "group": name.split(".")[0], "stats": stats})
+        print(
+            "{:<38} {:>12.3f} {:>12.3f} {:>12.3f} {:>7} {:>12.0f}".format(
+                name,
+                stats["min"] * 1e6,
+                stats["median"] * 1e6,
+                stats["stddev"] * 1e6,
+                stats["rounds"],
+                stats["ops"],
+            )
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "machine_info": machine_info(),
+                    "commit_info": commit_info(),
+                    "datetime": datetime.datetime.now(
+                        datetime.timezone.utc
+                    ).isoformat(),
+                    "corpus": {"size": args.size},
+                    "benchmarks": results,
+                },
+                f,
+                indent=2,
+            )
+    return 0
+
+
+def compare(args):
+    def load(path):
+        with open(path) as f:
+            return {b["name"]: b["stats"] for b in json.load(f)["benchmarks"]}
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(
+        "{:<38} {:>12} {:>12} {:>8}  {}".format(
+            "benchmark", "base (us)", "new (us)", "ratio", "status"
+        )
+    )
+    regressions = 0
+    for name in sorted(set(baseline) | set(candidate)):
+        if name not in baseline or name not in candidate:
+            print(
+                "{:<38} {:>12} {:>12} {:>8}  {}".format(
+                    name,
+                    "",
+                    "",
+                    "",
+                    "only in " + ("candidate" if name in candidate else "baseline"),
+                )
+            )
+            continue
+        old, new = baseline[name][args.stat], candidate[name][args.stat]
+        ratio = new / old if old > 0 else math.inf
+        if ratio > 1 + args.threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + args.threshold):
+            status = "improved"
+        else:
+            status = ""
+        print(
+            "{:<38} {:>12.3f} {:>12.3f} {:>8.3f}  {}".format(
+                name, old * 1e6, new * 1e6, ratio, status
+            )
+        )
+    print(
+        "{} regression(s) beyond {:.0%} in {}".format(
+            regressions, args.threshold, args.stat
+        )
+    )
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--filter", nargs="*", default=[])
+    run_parser.add_argument("--output")
+    run_parser.add_argument("--rounds", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.1)
+    run_parser.add_argument("--size", type=int, default=400)
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    compare_parser.add_argument(
+        "--stat", default="min", choices=("min", "median", "mean")
+    )
+    commands.add_parser("list", help="list the benchmarks")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        print("\n".join(BENCHMARKS))
+        return 0
+    if args.command == "run":
+        return run(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,15 @@
-from .clothoid import Clothoid, SolveG2
+from .clothoid import (
+    Clothoid,
+    SolveG2,
+    SolveG2Batch,
+    G2BatchSolution,
+    G1HermiteBatch,
+    ForwardBatch,
+)
+from .path import ClothoidPath
+from .array import ClothoidArray, TransformChain
+from .index import ClothoidIndex, IntersectSets
+from .cache import ProjectionCache, SolutionCache
+from .tracker import Tracker
+from .polyline import Polyline
+from . import cache, instrumentation, parallel, precision, store, stream
@@ -0,0 +1,426 @@
+from ._clothoids_cpp import (
+    _evaluate_columns,
+    _project_columns,
+    _distance_columns,
+    _polyline_columns,
+    _bounding_triangles_columns,
+    _bounding_box_columns,
+)
+from .clothoid import Clothoid
+from .precision import Tolerance
+
+from math import cos, sin, pi
+
+import numpy as np
+
+
+class TransformChain(object):
+    """
+    A composition of translations, rotations and uniform scalings, stored as the single transform
+    p -> scale * R(angle) * p + (xoff, yoff) that they compose to.  The methods return a new chain with one
+    more step appended, so a chain reads in the order the steps are applied:
+
+    ::
+
+        chain = TransformChain().Rotate(pi / 2).Scale(2, center=(1, 0)).Translate(3, 4)
+        moved = clothoids.Transform(chain)
+
+    Applying a chain to a `ClothoidArray` touches each curve once, whatever the number of steps, and gives
+    the same result as applying the steps one by one with the methods of `Clothoid`.
+    """
+
+    def __init__(self, scale=1.0, angle=0.0, xoff=0.0, yoff=0.0):
+        self.scale = float(scale)
+        self.angle = float(angle)
+        self.xoff = float(xoff)
+        self.yoff = float(yoff)
+
+    def __repr__(self):
+        return "TransformChain(scale={}, angle={}, xoff={}, yoff={})".format(
+            self.scale, self.angle, self.xoff, self.yoff
+        )
+
+    def Then(self, other):
+        """
+        Returns the chain that applies the calling chain followed by other
+        """
+        c, s = cos(other.angle), sin(other.angle)
+        return self.__class__(
+            other.scale * self.scale,
+            self.angle + other.angle,
+            other.scale * (c * self.xoff - s * self.yoff) + other.xoff,
+            other.scale * (s * self.xoff + c * self.yoff) + other.yoff,
+        )
+
+    def Translate(self, xoff, yoff):
+        """
+        Returns the chain followed by a pure translation described by a vector (xoff,yoff)
+        """
+        return self.Then(self.__class__(xoff=xoff, yoff=yoff))
+
+    def Rotate(self, angle, center=(0, 0)):
+        """
+        Returns the chain followed by a pure rotation of angle with a stationary point at center
+        """
+        cx, cy = center
+        c, s = cos(angle), sin(angle)
+        return self.Then(
+            self.__class__(1.0, angle, cx - (c * cx - s * cy), cy - (s * cx + c * cy))
+        )
+
+    def Scale(self, sfactor, center=(0, 0)):
+        """
+        Returns the chain followed by a scaling of sfactor with a stationary point at center.  Unlike
+        `Clothoid.Scale`, a zero sfactor is rejected since it does not map clothoids onto clothoids.
+        """
+        if sfactor == 0:
+            raise ValueError("TransformChain cannot scale by zero")
+        cx, cy = center
+        return self.Then(
+            self.__class__(sfactor, 0.0, (1 - sfactor) * cx, (1 - sfactor) * cy)
+        )
+
+
+class ClothoidArray(object):
+    """
+    An immutable, array-backed collection of N clothoids.  The StandardParams of the clothoids are stored as a
+    single float64 array of shape (6, N), so each of x0, y0, t0, k0, dk and L is a contiguous column, and
+    evaluation, projection and transforms run over the whole collection in single calls to the C++ layer or
+    numpy.  Clothoid objects are only created when the array is indexed with an integer.
+
+    Indexing with a slice, an integer array or a boolean mask returns a new ClothoidArray.  Pickling and
+    unpickling is supported.
+    """
+
+    def __init__(self, x0, y0, t0, k0, dk, L):
+        columns = np.broadcast_arrays(
+            *(np.asarray(c, dtype=np.float64) for c in (x0, y0, t0, k0, dk, L))
+        )
+        self._Columns = np.stack([np.ravel(c) for c in columns])
+        self._Columns.flags.writeable = False
+
+    @classmethod
+    def FromParameters(cls, parameters):
+        """
+        A method to initialize a ClothoidArray from an array-like of shape (N, 6) whose rows are the
+        `Parameters` of each clothoid, such as the arrays returned by `G1HermiteBatch`.
+        """
+        parameters = np.asarray(parameters, dtype=np.float64).reshape(-1, 6)
+        return cls(*parameters.T)
+
+    @classmethod
+    def _FromColumns(cls, columns):
+        # Wraps a read-only (6, N) float64 table without copying it, such as a table mapped from a file
+        array = cls.__new__(cls)
+        array._Columns = columns
+        return array
+
+    @classmethod
+    def FromClothoids(cls, clothoids):
+        """
+        A method to initialize a ClothoidArray from an iterable of Clothoids
+        """
+        return cls.FromParameters([clothoid.Parameters for clothoid in clothoids])
+
+    def __len__(self):
+        return self._Columns.shape[1]
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            n = len(self)
+            if index < 0:
+                index += n
+            if not 0 <= index < n:
+                raise IndexError("ClothoidArray index out of range")
+            return Clothoid.StandardParams(*self._Columns[:, index])
+        return self.__class__(*self._Columns[:, index])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __str__(self):
+        return "ClothoidArray: {} clothoids".format(len(self))
+
+    def __repr__(self):
+        return str(self)
+
+    def __getstate__(self):
+        return self.Parameters
+
+    def __setstate__(self, state):
+        self.__init__(*np.asarray(state).T)
+
+    @property
+    def Parameters(self):
+        """
+        Complete data describing the clothoids of the array
+
+        :getter: Returns a read-only float64 array of shape (N, 6) holding the `Parameters` of each clothoid
+        :setter: Parameters cannot be modified
+        :type: numpy.ndarray
+        """
+        return self._Columns.T
+
+    @property
+    def XStart(self):
+        """
+        :getter: Returns a read-only float64 array of the starting X coordinate of each clothoid
+        :type: numpy.ndarray
+        """
+        return self._Columns[0]
+
+    @property
+    def YStart(self):
+        """
+        :getter: Returns a read-only float64 array of the starting Y coordinate of each clothoid
+        :type: numpy.ndarray
+        """
+        return self._Columns[1]
+
+    @property
+    def ThetaStart(self):
+        """
+        :getter: Returns a read-only float64 array of the starting tangent angle of each clothoid
+        :type: numpy.ndarray
+        """
+        return self._Columns[2]
+
+    @property
+    def KappaStart(self):
+        """
+        :getter: Returns a read-only float64 array of the starting curvature of each clothoid
+        :type: numpy.ndarray
+        """
+        return self._Columns[3]
+
+    @property
+    def dk(self):
+        """
+        :getter: Returns a read-only float64 array of the curvature rate of each clothoid
+        :type: numpy.ndarray
+        """
+        return self._Columns[4]
+
+    @property
+    def length(self):
+        """
+        :getter: Returns a read-only float64 array of the length of each clothoid
+        :type: numpy.ndarray
+        """
+        return self._Columns[5]
+
+    def _Stations(self, s):
+        s = np.asarray(s, dtype=np.float64)
+        if s.ndim == 0 or s.shape[0] == 1:
+            s = np.broadcast_to(s, (len(self),) + s.shape[1:])
+        return s
+
+    def Evaluate(
+        self, s, quantities=("X", "Y", "Theta", "Kappa"), num_threads=1, precision=None
+    ):
+        """
+        Evaluates several quantities of every clothoid at once.  s holds the arc lengths, with its first axis
+        running over the clothoids, so that s[i, ...] are evaluated on clothoid i.  A float, or an array whose
+        first axis has length one, is shared by all clothoids: pass `s[numpy.newaxis, :]` to evaluate every
+        clothoid at the same M arc lengths.
+
+        Returns a float64 array of shape (len(quantities), N, ...).  The accepted quantities are those of
+        `Clothoid.Evaluate`.  The clothoids are split across num_threads threads with the GIL released, where
+        `num_threads = 0` uses one thread per core.  X and Y are computed at the given precision, as in
+        `Clothoid.Evaluate`.
+        """
+        return _evaluate_columns(
+            self._Columns,
+            self._Stations(s),
+            quantities,
+            num_threads,
+            Tolerance(precision),
+        )
+
+    @property
+    def XEnd(self):
+        """
+        :getter: Returns a float64 array of the final X coordinate of each clothoid
+        :type: numpy.ndarray
+        """
+        return self.Evaluate(self.length, ("X",))[0]
+
+    @property
+    def YEnd(self):
+        """
+        :getter: Returns a float64 array of the final Y coordinate of each clothoid
+        :type: numpy.ndarray
+        """
+        return self.Evaluate(self.length, ("Y",))[0]
+
+    @property
+    def ThetaEnd(self):
+        """
+        :getter: Returns a float64 array of the final tangent angle of each clothoid
+        :type: numpy.ndarray
+        """
+        return self.ThetaStart + self.length * (
+            self.KappaStart + 0.5 * self.length * self.dk
+        )
+
+    @property
+    def KappaEnd(self):
+        """
+        :getter: Returns a float64 array of the final curvature of each clothoid
+        :type: numpy.ndarray
+        """
+        return self.KappaStart + self.length * self.dk
+
+    def SampleXY(self, npts, num_threads=1, precision=None):
+        """
+        Returns a float64 array of shape (2, N, npts) holding the X and Y coordinates of npts points equally
+        spaced along each clothoid, computed at the given precision.
+        """
+        s = self.length[:, np.newaxis] * np.linspace(0.0, 1.0, npts)
+        return self.Evaluate(s, ("X", "Y"), num_threads, precision)
+
+    def ProjectPoints(self, xy, num_threads=1):
+        """
+        Projects point i onto clothoid i for every clothoid at once.  xy is an array-like of shape (2, N), or of
+        shape (2,) to project the same point onto every clothoid.
+
+        Returns a float64 array of shape (4, N) whose rows hold the X and Y coordinates of the projected points,
+        the arc lengths of the projected points and the signed distances, laid out like the result of
+        `Clothoid.ProjectPoints`.  The clothoids are split across num_threads threads with the GIL released.
+        """
+        xy = np.asarray(xy, dtype=np.float64)
+        xy = np.broadcast_to(xy.reshape((2, -1)), (2, len(self)))
+        return _project_columns(self._Columns, xy, num_threads)
+
+    def Distance(self, X, Y, num_threads=1):
+        """
+        Returns a float64 array holding the minimum distance between the point (X, Y) and each clothoid
+        """
+        return np.abs(self.ProjectPoints((X, Y), num_threads)[3])
+
+    def DistanceTo(self, other, max_distance=float("inf"), num_threads=0):
+        """
+        Runs `Clothoid.DistanceTo` between clothoid i and clothoid i of the ClothoidArray other for every i at
+        once.  other may also hold a single clothoid or be a Clothoid, measured against every clothoid.
+
+        Returns a float64 array of shape (3, N) whose rows hold the distances and the arc lengths of the closest
+        points along the clothoids of the calling array and of other.  Pairs farther apart than max_distance
+        get a distance of inf and NaN arc lengths, and pairs whose search does not converge get NaN in all three
+        rows.  The pairs are split across num_threads threads with the GIL released.
+
+        ::
+
+            clear = candidates.DistanceTo(obstacles, max_distance=clearance)[0] > clearance
+        """
+        if isinstance(other, Clothoid):
+            columns = np.reshape(other.Parameters, (6, 1))
+        else:
+            columns = other._Columns
+        return _distance_columns(self._Columns, columns, max_distance, num_threads)
+
+    def ToPolylines(self, tol, num_threads=0):
+        """
+        Runs `Clothoid.ToPolyline` for every clothoid at once, splitting the clothoids across num_threads
+        threads with the GIL released.  Returns a tuple of a float64 array of shape (2, V) holding the vertices
+        of every polyline one after the other and an integer array of N + 1 offsets, so that the vertices of
+        clothoid i are `vertices[:, offsets[i]:offsets[i + 1]]`.
+        """
+        return _polyline_columns(self._Columns, tol, num_threads)
+
+    def BoundingTriangles(
+        self, max_angle=pi / 18, max_size=float("inf"), offset=0, num_threads=0
+    ):
+        """
+        Runs `Clothoid.BoundingTriangles` for every clothoid at once, splitting the clothoids across
+        num_threads threads with the GIL released.  Returns a tuple of a float64 array of shape (K, 8) holding
+        the triangles of every clothoid one after the other and an integer array of N + 1 offsets, so that the
+        triangles of clothoid i are `triangles[offsets[i]:offsets[i + 1]]`.
+        """
+        return _bounding_triangles_columns(
+            self._Columns, max_angle, max_size, offset, num_threads
+        )
+
+    def BoundingBoxes(self, offset=0, num_threads=0):
+        """
+        Runs `Clothoid.BoundingBox` for every clothoid at once.  Returns a float64 array of shape (N, 4) whose
+        rows are xmin, ymin, xmax, ymax.
+        """
+        return _bounding_box_columns(self._Columns, offset, num_threads)
+
+    def Transform(self, chain):
+        """
+        Returns a copy of the calling array with every clothoid moved by a `TransformChain`, in one pass over
+        the parameters.
+        """
+        x0, y0, t0, k0, dk, L = self._Columns
+        c, s = cos(chain.angle), sin(chain.angle)
+        return self.__class__(
+            chain.scale * (c * x0 - s * y0) + chain.xoff,
+            chain.scale * (s * x0 + c * y0) + chain.yoff,
+            t0 + chain.angle,
+            k0 / chain.scale,
+            dk / chain.scale**2,
+            L * chain.scale,
+        )
+
+    def Translate(self, xoff, yoff):
+        """
+        Returns a copy of the calling array translated by a vector (xoff,yoff)
+        """
+        return self.Transform(TransformChain().Translate(xoff, yoff))
+
+    def Rotate(self, angle, center=(0, 0)):
+        """
+        Returns a copy of the calling array rotated by angle around a stationary point at center
+        """
+        return self.Transform(TransformChain().Rotate(angle, center))
+
+    def Scale(self, sfactor, center=(0, 0)):
+        """
+        Returns a copy of the calling array scaled by sfactor around a stationary point at center.  As with
+        `Clothoid.Scale`, passing `center = 'start'` scales each clothoid around its own starting point.
+        """
+        if isinstance(center, str) and center == "start":
+            if sfactor == 0:
+                raise ValueError("ClothoidArray cannot scale by zero")
+            x0, y0, t0, k0, dk, L = self._Columns
+            return self.__class__(
+                x0, y0, t0, k0 / sfactor, dk / sfactor**2, L * sfactor
+            )
+        return self.Transform(TransformChain().Scale(sfactor, center))
+
+    def Reverse(self):
+        """
+        Returns a copy of the calling array with the direction of the arc length parameter of each clothoid
+        reversed
+        """
+        x1, y1, t1, k1 = self.Evaluate(self.length)
+        t1 = pi - np.remainder(pi - (t1 + pi), 2 * pi)
+        return self.__class__(x1, y1, t1, -k1, self.dk, self.length)
+
+    def Trim(self, s_begin, s_end):
+        """
+        Returns a copy of the subsections of the clothoids that lie between s_begin and s_end, which may be
+        floats or arrays with one entry per clothoid
+        """
+        s_begin = np.broadcast_to(np.asarray(s_begin, dtype=np.float64), (len(self),))
+        x0, y0, t0, k0 = self.Evaluate(s_begin)
+        return self.__class__(x0, y0, t0, k0, self.dk, np.subtract(s_end, s_begin))
+
+    def Flip(self, axis="y"):
+        """
+        Returns a copy of the calling array with each clothoid flipped symmetrically along a specified axis.
+        The axis options are those of `Clothoid.Flip`.
+        """
+        x0, y0, t0, k0, dk, L = self._Columns
+        if axis == "y":
+            return self.__class__(
+                -x0, y0, np.arctan2(np.sin(t0), -np.cos(t0)), -k0, -dk, L
+            )
+        if axis == "x":
+            return self.__class__(
+                x0, -y0, np.arctan2(-np.sin(t0), np.cos(t0)), -k0, -dk, L
+            )
+        if axis == "start":
+            return self.__class__(x0, y0, t0, -k0, -dk, L)
+        raise ValueError("Unknown axis '{}'".format(axis))
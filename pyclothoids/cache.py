@@ -0,0 +1,288 @@
+from collections import OrderedDict, namedtuple
+from math import atan2, hypot, pi, remainder
+from threading import Lock
+import sys
+
+
+class CacheInfo(
+    namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "evictions"])
+):
+    """
+    The counters of a cache, as returned by its cache_info method
+    """
+
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups that were hits, or 0 before the first lookup
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _EstimateEntryBytes():
+    # A rough footprint of one cached projection: the key, the ((x, y), s, distance) result and the linked
+    # list node of the OrderedDict
+    key = (None, 1.0, 2.0)
+    value = ((1.0, 2.0), 3.0, 4.0)
+    return (
+        sys.getsizeof(key)
+        + 2 * sys.getsizeof(1.0)
+        + sys.getsizeof(value)
+        + sys.getsizeof(value[0])
+        + 4 * sys.getsizeof(1.0)
+        + 100
+    )
+
+
+ENTRY_BYTES = _EstimateEntryBytes()
+
+
+def _EstimateSolutionEntryBytes():
+    # A rough footprint of one cached G2 solution, the larger of the two kinds: the key, the three tuples of
+    # clothoid parameters and the linked list node of the OrderedDict
+    key = ("G2", 0.0, 0.0, 1, 2, 3, 4)
+    value = ((1.0,) * 6,) * 3
+    return (
+        sys.getsizeof(key)
+        + 4 * sys.getsizeof(2**40)
+        + sys.getsizeof(value)
+        + 3 * (sys.getsizeof(value[0]) + 6 * sys.getsizeof(1.0))
+        + 100
+    )
+
+
+SOLUTION_ENTRY_BYTES = _EstimateSolutionEntryBytes()
+
+
+class _LRUCache(object):
+    # The thread-safe least recently used store shared by the caches of this module, with at most maxsize
+    # entries and at most about max_bytes of memory given the estimated size of one entry
+
+    def __init__(self, maxsize, max_bytes, entry_bytes):
+        limits = [
+            limit
+            for limit in (
+                maxsize,
+                None if max_bytes is None else max_bytes // entry_bytes,
+            )
+            if limit is not None
+        ]
+        self.maxsize = min(limits) if limits else None
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def Get(self, key):
+        """
+        Returns the result stored under key, or None
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def Put(self, key, value):
+        """
+        Stores value under key, evicting the least recently used entries beyond the size limit
+        """
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def cache_info(self):
+        """
+        Returns a CacheInfo named tuple of the hits, misses, maxsize, currsize and evictions of the cache, whose
+        hit_rate property is the fraction of lookups that were hits
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self.maxsize,
+                len(self._entries),
+                self._evictions,
+            )
+
+    def cache_clear(self):
+        """
+        Removes every entry and resets the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+class ProjectionCache(_LRUCache):
+    """
+    A thread-safe least recently used store of point projection results, which may be private to one Clothoid
+    or shared by any number of them.  Entries of a shared cache are keyed by the parameters of the clothoid as
+    well as the point, so equal clothoids, such as unpickled copies, share their entries.
+
+    * maxsize : the maximum number of entries, or None for no limit
+    * max_bytes : an approximate memory budget for all entries, or None for no limit
+    * quantum : when given, points are snapped to a grid of this spacing before lookup, so that points closer
+      than about quantum to a cached point reuse its result.  The reused projection is then only accurate to
+      about quantum.  For example `quantum = 1e-3` shares results between points a millimeter apart when
+      coordinates are in meters.
+
+    Hits, misses and evictions are counted and reported by `cache_info`.
+    """
+
+    def __init__(self, maxsize=None, max_bytes=None, quantum=None):
+        super().__init__(maxsize, max_bytes, ENTRY_BYTES)
+        self.quantum = quantum
+
+    def Key(self, owner, X, Y):
+        """
+        Returns the key under which the projection of (X, Y) onto the clothoid identified by owner is stored
+        """
+        if self.quantum is None:
+            return (owner, X, Y)
+        return (owner, round(X / self.quantum), round(Y / self.quantum))
+
+
+class CachedProjection(object):
+    """
+    The callable installed as `Clothoid.ProjectPointOntoClothoid` when caching is enabled.  It holds the C++
+    clothoid rather than the Python Clothoid, so it does not create a reference cycle.
+    """
+
+    def __init__(self, project, curve, cache, owner=None):
+        self._project = project
+        self._curve = curve
+        self._cache = cache
+        self._owner = owner
+
+    def __call__(self, X, Y):
+        key = self._cache.Key(self._owner, X, Y)
+        result = self._cache.Get(key)
+        if result is None:
+            result = self._project(self._curve, X, Y)
+            self._cache.Put(key, result)
+        return result
+
+    def cache_info(self):
+        return self._cache.cache_info()
+
+    def cache_clear(self):
+        self._cache.cache_clear()
+
+
+_DefaultProjectionCache = None
+
+
+def SetDefaultProjectionCache(cache):
+    """
+    Makes every Clothoid created afterwards, including unpickled ones, share the given `ProjectionCache`
+    instead of creating a private cache.  Pass None to go back to private caches.
+
+    ::
+
+        pyclothoids.cache.SetDefaultProjectionCache(ProjectionCache(max_bytes=64 * 2**20, quantum=1e-3))
+    """
+    global _DefaultProjectionCache
+    _DefaultProjectionCache = cache
+
+
+def GetDefaultProjectionCache():
+    """
+    Returns the `ProjectionCache` shared by new Clothoids, or None when each Clothoid has a private cache
+    """
+    return _DefaultProjectionCache
+
+
+class SolutionCache(_LRUCache):
+    """
+    A thread-safe least recently used store of the solutions of `SolveG2` and `Clothoid.G1Hermite`, used by
+    every call once installed with `SetSolutionCache`.  A solution depends only on the boundary conditions
+    relative to the start pose, up to a uniform scale, so problems are keyed in the frame with its origin at the
+    start point, its x axis along the start tangent, or along the chord for `SolveG2`, and the distance
+    between the endpoints as its unit length.
+    The same relative problem posed anywhere in the plane, at any heading and at any scale then hits the
+    solution cached by the first call, transformed back to the pose and scale of the new problem.
+
+    * maxsize : the maximum number of entries, or None for no limit
+    * max_bytes : an approximate memory budget for all entries, or None for no limit
+    * quantum : the spacing of the grid the relative boundary conditions are snapped to before lookup.  These
+      are angles and curvatures multiplied by the distance between the endpoints, so a reused solution meets
+      the boundary conditions of the new problem to about quantum in angle and quantum times that distance in
+      position.  The default of 1e-9 only absorbs the rounding of the change of frame.  None keys the exact
+      relative values, which rarely match after that rounding.
+
+    Problems whose endpoints coincide and solver failures are never cached.  Hits, misses and evictions are
+    counted and reported by `cache_info`.
+
+    A hit skips the solver but still builds the returned Clothoids.  This saves about a third of the time of a
+    SolveG2 call, but nothing on G1Hermite, whose solver is about as fast as a lookup.
+    """
+
+    def __init__(self, maxsize=None, max_bytes=None, quantum=1e-9):
+        super().__init__(maxsize, max_bytes, SOLUTION_ENTRY_BYTES)
+        self.quantum = quantum
+
+    def G1Key(self, x0, y0, t0, x1, y1, t1, tol):
+        """
+        Returns the key of the G1 Hermite problem with the arguments of `Clothoid.G1Hermite`, or None when it
+        cannot be cached.  Its frame is along the start tangent t0.
+        """
+        if not 0 < hypot(x1 - x0, y1 - y0) < float("inf"):
+            return None
+        bearing = remainder(atan2(y1 - y0, x1 - x0) - t0, 2 * pi)
+        turn = t1 - t0
+        q = self.quantum
+        if q is not None:
+            bearing, turn = round(bearing / q), round(turn / q)
+        return ("G1", tol, bearing, turn)
+
+    def G2Key(self, x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax):
+        """
+        Returns the key of the G2 problem with the arguments of `SolveG2`, or None when it cannot be cached.
+        Its frame is along the chord from (x0, y0) to (x1, y1), relative to which the solver defines and wraps
+        the angles of its solution.
+        """
+        d = hypot(x1 - x0, y1 - y0)
+        if not 0 < d < float("inf"):
+            return None
+        chord = atan2(y1 - y0, x1 - x0)
+        th0, th1 = remainder(t0 - chord, 2 * pi), remainder(t1 - chord, 2 * pi)
+        K0, K1 = k0 * d, k1 * d
+        q = self.quantum
+        if q is not None:
+            th0, th1 = round(th0 / q), round(th1 / q)
+            K0, K1 = round(K0 / q), round(K1 / q)
+        return ("G2", Dmax, dmax, th0, th1, K0, K1)
+
+
+_SolutionCache = None
+
+
+def SetSolutionCache(cache):
+    """
+    Makes `SolveG2` and `Clothoid.G1Hermite` look up and store their solutions in the given `SolutionCache`.
+    Pass None, the default, to solve every problem.
+
+    ::
+
+        pyclothoids.cache.SetSolutionCache(SolutionCache(max_bytes=16 * 2**20))
+    """
+    global _SolutionCache
+    _SolutionCache = cache
+
+
+def GetSolutionCache():
+    """
+    Returns the `SolutionCache` used by SolveG2 and G1Hermite, or None when solutions are not cached
+    """
+    return _SolutionCache
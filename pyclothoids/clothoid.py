@@ -1,7 +1,25 @@
-from ._clothoids_cpp import ClothoidCurve, G2solve3arc
+from ._clothoids_cpp import (
+    ClothoidCurve,
+    G2solve3arc,
+    _solve_g2_batch,
+    _build_G1_batch,
+    _build_forward_batch,
+)
+
+from .cache import (
+    ProjectionCache,
+    CachedProjection,
+    GetDefaultProjectionCache,
+    GetSolutionCache,
+)
+from .precision import Tolerance
+from . import instrumentation
 
-from math import cos, sin, atan2
-from functools import lru_cache
+from math import cos, sin, atan2, hypot, pi
+from functools import partial
+from time import perf_counter
+
+import numpy as np
 
 CLOTHOID_FUNCTION_WINDOW = frozenset(
     (
@@ -20,22 +38,98 @@ CLOTHOID_FUNCTION_WINDOW = frozenset(
     )
 )
 
-CLOTHOID_PROPERTY_WINDOW = frozenset(
-    (
-        "length",
-        "dk",
-        "ThetaStart",
-        "ThetaEnd",
-        "XStart",
-        "XEnd",
-        "YStart",
-        "YEnd",
-        "KappaStart",
-        "KappaEnd",
+PROJECTION_CACHE_SIZE = 32
+
+
+PROJECTION_OUTCOMES = {1: "orthogonal", 0: "ambiguous", -1: "endpoint"}
+
+
+def _ProjectPoint(curve, X, Y):
+    if instrumentation.ENABLED:
+        return _ProjectPointInstrumented(curve, X, Y)
+    ProjectedX, ProjectedY, ProjectedArclength, ProjectionDistance, _ = (
+        curve._project_point_to_clothoid(X, Y)
     )
-)
+    return ((ProjectedX, ProjectedY), ProjectedArclength, ProjectionDistance)
+
+
+def _ProjectPointInstrumented(curve, X, Y):
+    start = perf_counter()
+    ProjectedX, ProjectedY, ProjectedArclength, ProjectionDistance, status = (
+        curve._project_point_to_clothoid(X, Y)
+    )
+    instrumentation.Record(
+        "ProjectPoint", perf_counter() - start, outcome=PROJECTION_OUTCOMES[status]
+    )
+    return ((ProjectedX, ProjectedY), ProjectedArclength, ProjectionDistance)
 
-PROJECTION_CACHE_SIZE = 32
+
+def _Diagnose(
+    clothoids, entry_point, seconds, iterations=None, converged=True, cached=False
+):
+    # Records a solver call and attaches its diagnostics to the clothoids it returned.  They are kept as a plain
+    # tuple, which the Diagnostics property wraps on access.  Calls answered by the solution cache are counted
+    # with the cache_hit outcome.
+    instrumentation.Record(
+        entry_point, seconds, iterations, converged, "cache_hit" if cached else None
+    )
+    diagnostics = (entry_point, seconds, iterations, converged, cached)
+    for clothoid in clothoids:
+        _Assign(clothoid, "_Diagnostics", diagnostics)
+    return clothoids
+
+
+def _ToFrame(parameters, x0, y0, t0, d):
+    # The parameters of a clothoid in the frame with its origin at (x0, y0), its x axis at the angle t0 and d
+    # as its unit length
+    x, y, t, k, dk, length = parameters
+    c, s = cos(t0), sin(t0)
+    dx, dy = x - x0, y - y0
+    return (
+        (c * dx + s * dy) / d,
+        (c * dy - s * dx) / d,
+        t - t0,
+        k * d,
+        dk * d * d,
+        length / d,
+    )
+
+
+def _FromFrame(parameters, x0, y0, t0, d):
+    # The inverse of _ToFrame, returning the C++ clothoid scaled by d about the origin, rotated by t0 and
+    # moved to (x0, y0).  This is the composition of _scale, _rotate and _translate, applied to the parameters
+    # so that the clothoid is built with a single call.
+    x, y, t, k, dk, length = parameters
+    c, s = cos(t0), sin(t0)
+    return ClothoidCurve(
+        x0 + d * (c * x - s * y),
+        y0 + d * (s * x + c * y),
+        t + t0,
+        k / d,
+        dk / (d * d),
+        length * d,
+    )
+
+
+class _CurveFunction(object):
+    """
+    A descriptor that reads one of the evaluation functions of the C++ clothoid straight from the underlying
+    curve, so calling `clothoid.X(s)` costs a single attribute lookup before the call to the C++ layer.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.__doc__ = "Evaluates {} at the arc length(s) s, which may be a float or any array-like".format(
+            name
+        )
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return getattr(instance._ClothoidCurve, self.name)
+
+
+_Assign = object.__setattr__
 
 
 class Clothoid(object):
@@ -43,16 +137,55 @@ class Clothoid(object):
     An object representing a single clothoid curve. Pickling and unpickling is supported. The class
     constructor is meant for internal use for interfacing with the C++ layer.  To initialize a Clothoid, use
     one of the classmethods instead.
+
+    Clothoids are immutable.  The six defining parameters are read from the C++ layer once on construction,
+    so reading `length`, `XStart` or `Parameters` does not call into C++, and attributes cannot be assigned.
+    Copies share the underlying C++ clothoid, and the transforms return new Clothoids.
     """
 
+    __slots__ = (
+        "_ClothoidCurve",
+        "_Parameters",
+        "_ProjectionCacheSetup",
+        "_Projection",
+        "_Diagnostics",
+        "__weakref__",
+    )
+
+    X = _CurveFunction("X")
+    XD = _CurveFunction("XD")
+    XDD = _CurveFunction("XDD")
+    XDDD = _CurveFunction("XDDD")
+    Y = _CurveFunction("Y")
+    YD = _CurveFunction("YD")
+    YDD = _CurveFunction("YDD")
+    YDDD = _CurveFunction("YDDD")
+    Theta = _CurveFunction("Theta")
+    ThetaD = _CurveFunction("ThetaD")
+    ThetaDD = _CurveFunction("ThetaDD")
+    ThetaDDD = _CurveFunction("ThetaDDD")
+
     def __init__(self, clothoid_curve):
         if type(clothoid_curve) == type(self):
-            # Create a copy of the underlying C++ clothoid when constructor is called with a Python Clothoid
-            self._ClothoidCurve = ClothoidCurve(clothoid_curve._ClothoidCurve)
+            # The C++ clothoid of a Python Clothoid is never modified, so the copy can share it.  The copy is
+            # configured like the original but does not share a private cache with it.
+            setup = clothoid_curve._ProjectionCacheSetup
+            parameters = clothoid_curve._Parameters
+            clothoid_curve = clothoid_curve._ClothoidCurve
         else:
-            # No need to create a copy when a C++ clothoid is passed directly by the classmethods or G2solver
-            self._ClothoidCurve = clothoid_curve
-        self.SetupProjectionCache(PROJECTION_CACHE_SIZE)
+            # A C++ clothoid passed directly by the classmethods or G2solver is owned by the new object
+            setup = (PROJECTION_CACHE_SIZE, None, GetDefaultProjectionCache())
+            parameters = clothoid_curve._parameters()
+        _Assign(self, "_ClothoidCurve", clothoid_curve)
+        _Assign(self, "_Parameters", parameters)
+        _Assign(self, "_ProjectionCacheSetup", setup)
+        _Assign(self, "_Projection", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'{}' object is immutable".format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("'{}' object is immutable".format(type(self).__name__))
 
     @classmethod
     def StandardParams(cls, x0, y0, t0, k0, kd, s_f):
@@ -60,17 +193,38 @@ class Clothoid(object):
         A method to initialize a Clothoid given a starting point, starting tangent, starting curvature,
         curvature rate, and final length.
         """
-        temp_clothoid = ClothoidCurve()
-        temp_clothoid.build(x0, y0, t0, k0, kd, s_f)
-        return cls(temp_clothoid)
+        return cls(ClothoidCurve(x0, y0, t0, k0, kd, s_f))
 
     @classmethod
     def G1Hermite(cls, x0, y0, t0, x1, y1, t1, tol=1e-10):
         """
         A method to numerically compute the solution to the G1 Hermite interpolation problem and initialize a
-        Clothoid object with the solution parameters.
-        """
+        Clothoid object with the solution parameters.  Solutions are reused from the `SolutionCache` installed
+        with `pyclothoids.cache.SetSolutionCache`, if any.
+        """
+        cache = GetSolutionCache()
+        key = None if cache is None else cache.G1Key(x0, y0, t0, x1, y1, t1, tol)
+        if key is None:
+            return cls._G1Hermite(x0, y0, t0, x1, y1, t1, tol)
+        frame = (x0, y0, t0, hypot(x1 - x0, y1 - y0))
+        start = perf_counter()
+        solution = cache.Get(key)
+        if solution is not None:
+            clothoid = cls(_FromFrame(solution, *frame))
+            if instrumentation.ENABLED:
+                _Diagnose((clothoid,), "G1Hermite", perf_counter() - start, cached=True)
+            return clothoid
+        clothoid = cls._G1Hermite(x0, y0, t0, x1, y1, t1, tol)
+        if clothoid.length > 0:
+            cache.Put(key, _ToFrame(clothoid._Parameters, *frame))
+        return clothoid
+
+    @classmethod
+    def _G1Hermite(cls, x0, y0, t0, x1, y1, t1, tol):
         temp_clothoid = ClothoidCurve()
+        if instrumentation.ENABLED:
+            args = (x0, y0, t0, x1, y1, t1, tol)
+            return cls._BuildInstrumented("G1Hermite", temp_clothoid.build_G1, args)
         temp_clothoid.build_G1(x0, y0, t0, x1, y1, t1, tol)
         return cls(temp_clothoid)
 
@@ -82,22 +236,36 @@ class Clothoid(object):
         parameters.
         """
         temp_clothoid = ClothoidCurve()
+        if instrumentation.ENABLED:
+            args = (x0, y0, t0, k0, x1, y1, tol)
+            return cls._BuildInstrumented("Forward", temp_clothoid.build_forward, args)
         temp_clothoid.build_forward(x0, y0, t0, k0, x1, y1, tol)
         return cls(temp_clothoid)
 
-    def __getattr__(self, name):
-        if name in CLOTHOID_FUNCTION_WINDOW:
-            return getattr(self._ClothoidCurve, name)
-        if name in CLOTHOID_PROPERTY_WINDOW:
-            return getattr(self._ClothoidCurve, name)()  # mimic property getter syntax
-        return super().__getattribute__(name)()
+    @classmethod
+    def _BuildInstrumented(cls, entry_point, build, args):
+        # Runs a build method of a fresh C++ clothoid, which returns an iteration count or a success flag, and
+        # records the call.  A build that raises is recorded as a failure.
+        start = perf_counter()
+        try:
+            status = build(*args)
+        except Exception:
+            instrumentation.Record(entry_point, perf_counter() - start, converged=False)
+            raise
+        seconds = perf_counter() - start
+        clothoid = cls(build.__self__)
+        if isinstance(status, bool):
+            _Diagnose((clothoid,), entry_point, seconds, None, status)
+        else:
+            _Diagnose((clothoid,), entry_point, seconds, status)
+        return clothoid
 
     def __str__(self):
         return "Clothoid: " + "".join(
             map(
-                lambda m, n: m + ":" + str(getattr(self, n)) + " ",
+                lambda m, n: m + ":" + str(n) + " ",
                 ("x0", "y0", "t0", "k0", "kd", "s"),
-                ("XStart", "YStart", "ThetaStart", "KappaStart", "dk", "length"),
+                self._Parameters,
             )
         )
 
@@ -105,14 +273,21 @@ class Clothoid(object):
         return str(self)
 
     def __getstate__(self):
-        return self.Parameters
+        cachesize, quantum, _ = self._ProjectionCacheSetup
+        return self._Parameters, cachesize, quantum
 
     def __setstate__(self, state):
-        temp_clothoid = ClothoidCurve()
-        temp_clothoid.build(*state)
-        self._ClothoidCurve = temp_clothoid
-
-    def SetupProjectionCache(self, cachesize):
+        if len(state) == 6:
+            # state pickled before the cache configuration was stored
+            state = (state, PROJECTION_CACHE_SIZE, None)
+        parameters, cachesize, quantum = state
+        temp_clothoid = ClothoidCurve(*parameters)
+        _Assign(self, "_ClothoidCurve", temp_clothoid)
+        _Assign(self, "_Parameters", temp_clothoid._parameters())
+        shared = GetDefaultProjectionCache() if cachesize is not None else None
+        self.SetupProjectionCache(cachesize, quantum, shared)
+
+    def SetupProjectionCache(self, cachesize, quantum=None, cache=None):
         """
         By default, each instance of the Clothoid object maintains an lru cache of the results from projecting
         any point onto the clothoid.  This is because the projection operation calculates several potentially
@@ -120,13 +295,56 @@ class Clothoid(object):
         Caching the results means that users can call `ClosestPoint` and `Distance` separately and sequentially
         without recomputing the projection.  The default cachesize is set to 32 but this method allows
         configuring the cache with a custom size.  Pass `cachesize = None` to disable caching entirely.
+
+        Pass a quantum to snap points to a grid of that spacing before lookup, so that jittery inputs closer
+        than about quantum to a cached point hit the cache, at the price of results only accurate to about
+        quantum.  Pass a `pyclothoids.cache.ProjectionCache` as cache to share one cache, and its memory
+        budget, between many clothoids, in which case cachesize and quantum are taken from it.  The hits,
+        misses and evictions of the cache are reported by `ProjectPointOntoClothoid.cache_info()`.
+
+        The configuration is kept by copies and across pickling, although cached results are not.  The cache
+        itself is created by the first projection.
         """
-        if cachesize is not None:
-            self.ProjectPointOntoClothoid = lru_cache(maxsize=cachesize)(
-                self._ProjectPointOntoClothoid
-            )
-        else:
-            self.ProjectPointOntoClothoid = self._ProjectPointOntoClothoid
+        _Assign(self, "_ProjectionCacheSetup", (cachesize, quantum, cache))
+        _Assign(self, "_Projection", None)
+
+    @property
+    def ProjectPointOntoClothoid(self):
+        # The projection function configured by SetupProjectionCache, created on first use so that clothoids
+        # which are never projected do not allocate a cache
+        projection = self._Projection
+        if projection is None:
+            cachesize, quantum, cache = self._ProjectionCacheSetup
+            if cache is not None:
+                projection = CachedProjection(
+                    _ProjectPoint, self._ClothoidCurve, cache, self._Parameters
+                )
+            elif cachesize is not None:
+                projection = CachedProjection(
+                    _ProjectPoint,
+                    self._ClothoidCurve,
+                    ProjectionCache(cachesize, quantum=quantum),
+                )
+            else:
+                projection = partial(_ProjectPoint, self._ClothoidCurve)
+            _Assign(self, "_Projection", projection)
+        return projection
+
+    @property
+    def Diagnostics(self):
+        """
+        Diagnostics of the solver call that created the calling Clothoid
+
+        :getter: Returns the `pyclothoids.instrumentation.Diagnostics` of the call of G1Hermite, Forward or
+                 SolveG2 that created the clothoid while instrumentation was enabled, including calls answered
+                 by the solution cache, and None otherwise
+        :setter: Diagnostics cannot be modified
+        :type: Diagnostics
+        """
+        try:
+            return instrumentation.Diagnostics._make(self._Diagnostics)
+        except AttributeError:
+            return None
 
     @property
     def Parameters(self):
@@ -137,19 +355,96 @@ class Clothoid(object):
         :setter: Parameters cannot be modified
         :type: tuple
         """
-        return (
-            self.XStart,
-            self.YStart,
-            self.ThetaStart,
-            self.KappaStart,
-            self.dk,
-            self.length,
+        return self._Parameters
+
+    @property
+    def XStart(self):
+        return self._Parameters[0]
+
+    @property
+    def YStart(self):
+        return self._Parameters[1]
+
+    @property
+    def ThetaStart(self):
+        return self._Parameters[2]
+
+    @property
+    def KappaStart(self):
+        return self._Parameters[3]
+
+    @property
+    def dk(self):
+        return self._Parameters[4]
+
+    @property
+    def length(self):
+        return self._Parameters[5]
+
+    @property
+    def XEnd(self):
+        return self._ClothoidCurve.XEnd()
+
+    @property
+    def YEnd(self):
+        return self._ClothoidCurve.YEnd()
+
+    @property
+    def ThetaEnd(self):
+        return self._ClothoidCurve.ThetaEnd()
+
+    @property
+    def KappaEnd(self):
+        return self._ClothoidCurve.KappaEnd()
+
+    def Evaluate(
+        self, s, quantities=("X", "Y", "Theta", "Kappa"), offset=0, precision=None
+    ):
+        """
+        Evaluates several quantities at once at the arc length(s) s, which may be a float or any array-like.
+        Returns a float64 array of shape (len(quantities),) + shape(s) whose rows follow the order of
+        quantities.
+
+        Any name from X, XD, XDD, XDDD, Y, YD, YDD, YDDD, Theta, ThetaD, ThetaDD and ThetaDDD is accepted, along
+        with Kappa and KappaD, which equal ThetaD and ThetaDD on the clothoid itself.  All requested quantities
+        are computed in a single pass through the C++ layer, and X and Y share their underlying Fresnel integral
+        evaluation.
+
+        A nonzero offset, a float or an array-like broadcasting against s, evaluates the offset curves at that
+        lateral distance, positive to the left, such as the boundaries of a lane, without building a curve for
+        each of them.  X, Y and their derivatives are then those of the point offset from the arc length s,
+        with derivatives taken with respect to s, and Kappa and KappaD are the curvature of the offset curve,
+        Kappa / (1 - offset * Kappa), and its derivative with respect to s.  The Theta quantities are unchanged,
+        as the offset curve is parallel to the clothoid while offset * Kappa < 1.
+
+        precision selects how X and Y are computed: "exact", "fast", or a positive absolute tolerance for the
+        fast mode, while None uses the default of `pyclothoids.precision.SetDefaultPrecision`.  The fast mode
+        expands the clothoid in series around a few exactly evaluated anchor points, and guarantees that X and
+        Y are within the tolerance of their exact values, up to rounding.  It is several times faster on
+        batches of hundreds of points or more, and falls back on the exact mode for smaller batches, where the
+        anchors would cost more than they save.  The other quantities are always exact.
+
+        ::
+
+            X, Y, Theta, Kappa = clothoid.Evaluate(numpy.linspace(0, clothoid.length, 100))
+            lane_edges = clothoid.Evaluate(s, ("X", "Y"), offset=numpy.array([[-3.5], [0], [3.5]]))
+        """
+        if np.ndim(offset):
+            s, offset = np.broadcast_arrays(s, offset)
+        return self._ClothoidCurve._evaluate(
+            s, quantities, offset, Tolerance(precision)
         )
 
-    def SampleXY(self, npts):
+    def SampleXY(self, npts, out=None, offset=0, precision=None):
         """
-        A method to return a vector of X coordinates and Y coordinates generated by evaluating the Clothoid at
-        npts equally spaced points along its length.
+        A method to return the X coordinates and Y coordinates generated by evaluating the Clothoid at npts
+        equally spaced points along its length.  The result is a contiguous float64 numpy array of shape
+        (2, npts) whose rows hold the X and Y coordinates.  Sampling is performed entirely in the C++ layer.
+
+        A preallocated float64 array of shape (2, npts) may be passed as out to avoid an allocation per call,
+        in which case it is filled and returned.  Each point is shifted by offset along the normal, positive to
+        the left, where offset is a float or an array-like with one offset per point, as in `Evaluate`.  The
+        points are approximated to a tolerance when precision selects the fast mode, as in `Evaluate`.
 
         Roughly shorthand for:
 
@@ -159,12 +454,57 @@ class Clothoid(object):
                 sample_points = [self.length * m/(npts-1) for m in range(0,npts)]
                 X = [self.X(i) for i in sample_points]
                 Y = [self.Y(i) for i in sample_points]
-                return [X,Y]
+                return numpy.array([X,Y])
         """
-        return [
-            [j(i * self.length / max(npts - 1, 1)) for i in range(0, npts)]
-            for j in (self.X, self.Y)
-        ]  # TODO: move sampling to c++ layer for loop efficiency?
+        if np.ndim(offset):
+            offset = np.broadcast_to(offset, (npts,))
+        return self._ClothoidCurve._sample_xy(npts, out, offset, Tolerance(precision))
+
+    def SampleAdaptive(self, max_chord_error, max_angle_step=pi / 18):
+        """
+        A method to sample the Clothoid with points placed densely where the magnitude of the curvature is
+        large and sparsely on nearly straight stretches.  Consecutive points are spaced so that the straight
+        chord between them never deviates from the Clothoid by more than max_chord_error and the tangent angle
+        never changes by more than max_angle_step radians.  Both endpoints are always included.  Raises a
+        ValueError when the tolerances would take more than ten million points.
+
+        Returns a float64 numpy array of shape (2, N) laid out like the output of `SampleXY`.
+        """
+        return self._ClothoidCurve._sample_adaptive(max_chord_error, max_angle_step)
+
+    def ToPolyline(self, tol):
+        """
+        Returns the vertices of a polyline that deviates from the Clothoid by at most tol, as a float64 numpy
+        array of shape (2, N) laid out like the output of `SampleXY`.  Vertices are placed as far apart as
+        the chord error bound of `SampleAdaptive` allows, so that long, nearly straight stretches get few of
+        them.  Pass the vertices to `pyclothoids.Polyline` for distance and intersection queries.
+        """
+        return self._ClothoidCurve._to_polyline(tol)
+
+    def BoundingTriangles(self, max_angle=pi / 18, max_size=float("inf"), offset=0):
+        """
+        Returns triangles that together cover every point within offset of the Clothoid, such as the footprint
+        of a vehicle of half width offset following it, for broad-phase collision checks.  The clothoid is split
+        at its inflection point and into pieces that turn by at most max_angle, capped at pi / 2, and are no
+        longer than max_size, and each piece is covered by one triangle.  Returns a float64 numpy array of shape
+        (K, 8) whose rows are x1, y1, x2, y2, x3, y3, s0, s1, where [s0, s1] is the range of arc lengths the
+        triangle covers.
+
+        Unlike the triangles of the underlying C++ library, which follow an offset curve and may miss parts of
+        nearly straight pieces, every triangle contains its piece of the band.  Smaller max_angle and max_size
+        give more and tighter triangles.  A triangle covering a straight piece of length L is about twice as
+        long and 4 offset wide, so keep max_size near a few times offset when tight covers of straight
+        stretches matter.
+        """
+        return self._ClothoidCurve._bounding_triangles(max_angle, max_size, offset)
+
+    def BoundingBox(self, offset=0):
+        """
+        Returns the tuple (xmin, ymin, xmax, ymax) of the smallest axis-aligned box containing every point
+        within offset of the Clothoid, measured along its normals.  The box is exact, as it is computed from the
+        arc lengths at which the tangent is parallel to an axis.
+        """
+        return self._ClothoidCurve._bounding_box(offset)
 
     def Scale(self, sfactor, center=(0, 0)):
         """
@@ -173,30 +513,30 @@ class Clothoid(object):
         """
         if sfactor == 0:
             return self.__class__.StandardParams(0, 0, 0, 0, 0, 0)
-        temp_clothoid = self.__class__(self)
-        temp_clothoid._ClothoidCurve._scale(
+        temp_clothoid = ClothoidCurve(self._ClothoidCurve)
+        temp_clothoid._scale(
             sfactor
         )  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
         if center == "start":
-            return temp_clothoid
-        s = [temp_clothoid.XStart, temp_clothoid.YStart]
+            return self.__class__(temp_clothoid)
+        s = [temp_clothoid.XStart(), temp_clothoid.YStart()]
         c = center
         dxy = [(sfactor - 1) * (i - j) for i, j in zip(s, c)]
-        temp_clothoid._ClothoidCurve._translate(
+        temp_clothoid._translate(
             *dxy
         )  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
-        return temp_clothoid
+        return self.__class__(temp_clothoid)
 
     def Translate(self, xoff, yoff):
         """
         Returns a copy of the calling clothoid subjected to a pure translation transform described by a vector
         (xoff,yoff)
         """
-        temp_clothoid = self.__class__(self)
-        temp_clothoid._ClothoidCurve._translate(
+        temp_clothoid = ClothoidCurve(self._ClothoidCurve)
+        temp_clothoid._translate(
             xoff, yoff
         )  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
-        return temp_clothoid
+        return self.__class__(temp_clothoid)
 
     def Rotate(self, angle, center=(0, 0)):
         """
@@ -204,29 +544,29 @@ class Clothoid(object):
         stationary point at center
         """
         cx, cy = center
-        temp_clothoid = self.__class__(self)
-        temp_clothoid._ClothoidCurve._rotate(
+        temp_clothoid = ClothoidCurve(self._ClothoidCurve)
+        temp_clothoid._rotate(
             angle, cx, cy
         )  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
-        return temp_clothoid
+        return self.__class__(temp_clothoid)
 
     def Reverse(self):
         """
         Returns a copy of the calling clothoid with the direction of the arc length parameter reversed
         """
-        temp_clothoid = self.__class__(self)
-        temp_clothoid._ClothoidCurve._reverse()  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
-        return temp_clothoid
+        temp_clothoid = ClothoidCurve(self._ClothoidCurve)
+        temp_clothoid._reverse()  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
+        return self.__class__(temp_clothoid)
 
     def Trim(self, s_begin, s_end):
         """
         Returns a copy of the subsection of the calling clothoid that lies between s_begin and s_end
         """
-        temp_clothoid = self.__class__(self)
-        temp_clothoid._ClothoidCurve._trim(
+        temp_clothoid = ClothoidCurve(self._ClothoidCurve)
+        temp_clothoid._trim(
             s_begin, s_end
         )  ##DANGER WILL ROBINSON : MUTATING STATE DIRECTLY##
-        return temp_clothoid
+        return self.__class__(temp_clothoid)
 
     def Flip(self, axis="y"):
         """
@@ -287,13 +627,98 @@ class Clothoid(object):
         _, _, ProjectionDistance = self.ProjectPointOntoClothoid(X, Y)
         return ProjectionDistance
 
+    def DistanceTo(self, other, max_distance=float("inf")):
+        """
+        Returns the minimum distance between the calling clothoid and the Clothoid other, found in the C++ layer
+        without sampling either curve, as a tuple (distance, s, other_s) where s and other_s are the arc lengths
+        of the closest points along each clothoid.  The distance is 0 where the clothoids intersect.
+
+        The distance is accurate to about 1e-10 times the total length of the clothoids.  Where it hardly varies
+        along long arcs of both, as between concentric arcs, any of the nearly closest pairs of points may be
+        returned.
+
+        The search stops as soon as the clothoids are known to be farther apart than max_distance, returning
+        (inf, nan, nan), which makes pruning by a clearance threshold much cheaper than measuring the distance.
+        Should the search fail to settle the distance within its budget of about 260000 pairs of arcs, far more
+        than any pair of clothoids tried needs, it returns (nan, nan, nan) rather than an unverified distance.
+        """
+        return self._ClothoidCurve._distance_to(other._ClothoidCurve, max_distance)
+
+    def ProjectPoints(self, xy, num_threads=1, offset=0):
+        """
+        Projects many points onto the clothoid in a single call to the C++ layer.  xy is an array-like of shape
+        (2, ...) whose first axis holds the X and Y coordinates of the points, as returned by `SampleXY`.
+
+        Returns a float64 numpy array of shape (4, ...) whose rows hold the X and Y coordinates of the projected
+        points, the arc lengths of the projected points along the clothoid, and the signed distances between
+        each point and the clothoid.  Distances are positive for points to the left of the clothoid.
+
+        With a nonzero offset, a float or an array-like of shape (...) with one offset per point, each point is
+        projected onto the offset curve at its offset instead, and the rows hold the closest point of the offset
+        curve, its arc length along the clothoid and the signed distance to the offset curve.
+
+        The GIL is released for the duration of the computation and the points are split across num_threads
+        threads.  Pass `num_threads = 0` to use one thread per core.  The projection cache is not used.
+        """
+        if np.ndim(offset):
+            offset = np.broadcast_to(offset, np.shape(xy)[1:])
+        elif offset == 0:
+            return self._ClothoidCurve._project_points(xy, num_threads)
+        return self._ClothoidCurve._project_points_offset(xy, offset, num_threads)
+
+    def ToFrenet(self, xy, theta=None, num_threads=1):
+        """
+        Converts many points to Frenet coordinates along the clothoid in a single call to the C++ layer.  xy is
+        an array-like of shape (2, ...) holding the X and Y coordinates of the points.
+
+        Returns a float64 numpy array of shape (2, ...) whose rows hold the arc length of the closest point of
+        each point and its signed lateral offset, positive to the left of the clothoid.  When headings theta of
+        shape (...) are given, a third row holds the heading error of each pose relative to the tangent of the
+        clothoid, wrapped into [-pi, pi].  Points beyond an end of the clothoid are measured along the tangent
+        line extended past that end, so their arc lengths fall outside [0, length] and `FromFrenet` inverts
+        the conversion exactly.
+
+        The GIL is released and the points are split across num_threads threads as in `ProjectPoints`.
+        """
+        if theta is not None:
+            theta = np.broadcast_to(theta, np.shape(xy)[1:])
+        return self._ClothoidCurve._to_frenet(xy, theta, num_threads)
+
+    def FromFrenet(self, s, d, heading_error=None, num_threads=1):
+        """
+        Converts arc lengths s and signed lateral offsets d, which broadcast against each other, to cartesian
+        coordinates in a single call to the C++ layer.  Returns a float64 numpy array of shape (2, ...) holding
+        the X and Y coordinates, or of shape (3, ...) whose last row holds the headings when heading errors are
+        given.  This is the inverse of `ToFrenet`.
+        """
+        if heading_error is None:
+            s, d = np.broadcast_arrays(s, d)
+        else:
+            s, d, heading_error = np.broadcast_arrays(s, d, heading_error)
+        return self._ClothoidCurve._from_frenet(s, d, heading_error, num_threads)
+
+    def SolveFor(self, quantity, values, num_threads=1):
+        """
+        Finds every arc length in [0, length] at which quantity, one of 'X', 'Y', 'Theta' or 'Kappa', equals
+        values, in a single call to the C++ layer.  Kappa is linear and Theta quadratic in the arc length, so
+        their roots are computed in closed form, and Theta is matched modulo 2 pi, so that every arc length at
+        which the tangent points in the direction values is found.  X and Y are monotonic between the arc
+        lengths at which the tangent is perpendicular to their axis, which are found in closed form as well,
+        so every root is bracketed and refined by safeguarded Newton steps.  Where the quantity equals a value
+        over a whole interval, only the start of the interval is returned.
+
+        values may be a float, in which case a float64 numpy array of the roots in increasing order is
+        returned, or an array-like, in which case a tuple of two arrays with one entry per root is returned:
+        the index of the value in the flattened values and the arc length.  Roots are grouped by value.  The
+        values are split across num_threads threads as in `ProjectPoints`.
+        """
+        index, s = self._ClothoidCurve._solve_for(quantity, values, num_threads)
+        return s if np.ndim(values) == 0 else (index, s)
+
     def _ProjectPointOntoClothoid(self, X, Y):
-        ProjectedX, ProjectedY, ProjectedArclength, ProjectionDistance = (
-            self._ClothoidCurve._project_point_to_clothoid(X, Y)
-        )
-        return ((ProjectedX, ProjectedY), ProjectedArclength, ProjectionDistance)
+        return _ProjectPoint(self._ClothoidCurve, X, Y)
 
-    def IntersectionArcLengths(self, other):
+    def IntersectionArcLengths(self, other, offset=0, other_offset=0, num_threads=1):
         """
         Returns a list of tuples.  Each tuple contains a pair of clothoid arc length parameters near which an
         intersection occurs.  The first parameter is the distance along the calling clothoid (self) at which
@@ -302,18 +727,53 @@ class Clothoid(object):
         Note that due to the numerical methods and iterative approximation methods involved, the floating point
         coordinates of the intersection point on the first clothoid will not exactly coincide with the coordinates
         of the intersection point on the second clothoid.  However we expect this error be extremely small.
+
+        Nonzero offset and other_offset intersect the offset curves of the clothoids at those lateral distances,
+        positive to the left, with arc lengths still measured along the clothoids.  When either is an
+        array-like, they are broadcast against each other and every pair of offsets is intersected, split across
+        num_threads threads, and a tuple of three arrays with one entry per intersection is returned instead:
+        the index of the pair in the flattened offsets and the arc lengths along self and other.
+
+        ::
+
+            lane, s, s_other = centerline.IntersectionArcLengths(crossing, offset=[-3.5, 0, 3.5])
         """
-        return self._ClothoidCurve._intersections(other._ClothoidCurve)
+        if np.ndim(offset) or np.ndim(other_offset):
+            offset, other_offset = np.broadcast_arrays(offset, other_offset)
+            return self._ClothoidCurve._intersect_offsets(
+                other._ClothoidCurve, offset, other_offset, num_threads
+            )
+        if offset == 0 and other_offset == 0:
+            return self._ClothoidCurve._intersections(other._ClothoidCurve)
+        _, s, s_other = self._ClothoidCurve._intersect_offsets(
+            other._ClothoidCurve, offset, other_offset
+        )
+        return list(zip(s.tolist(), s_other.tolist()))
 
-    def IntersectionPoints(self, other):
+    def IntersectionPoints(self, other, offset=0, other_offset=0, num_threads=1):
         """
         Returns a list of tuples.  Each tuple contains the X and Y cartesian coordinates near which the two clothoids
         intersect.  Approximations are computed using the calling clothoid and will likely differ slightly if computed
         using the other clothoid.
+
+        Offsets are handled as in `IntersectionArcLengths`, the points lying on the offset curve of self.  When
+        either offset is an array-like, a tuple of the index of the pair of offsets of each intersection and a
+        float64 array of shape (2, K) holding the X and Y coordinates of the intersections is returned.
         """
+        if np.ndim(offset) or np.ndim(other_offset):
+            index, s, _ = self.IntersectionArcLengths(
+                other, offset, other_offset, num_threads
+            )
+            offset = np.broadcast_arrays(offset, other_offset)[0].ravel()[index]
+            return index, self.Evaluate(s, ("X", "Y"), offset)
+        if offset == 0:
+            return [
+                (self.X(i), self.Y(i))
+                for i, _ in self.IntersectionArcLengths(other, offset, other_offset)
+            ]
         return [
-            (self.X(i), self.Y(i))
-            for i, _ in self._ClothoidCurve._intersections(other._ClothoidCurve)
+            tuple(self.Evaluate(i, ("X", "Y"), offset).tolist())
+            for i, _ in self.IntersectionArcLengths(other, offset, other_offset)
         ]
 
 
@@ -322,7 +782,133 @@ def SolveG2(x0, y0, t0, k0, x1, y1, t1, k1, Dmax=0, dmax=0):
     Returns a tuple of three Clothoids that form a G2 continuous path that interpolates two cartesian
     endpoints, two tangents, and two curvatures.  Exposes two additional parameters for fine tuning
     the properties of the desired solution.
+
+    Solutions are reused from the `SolutionCache` installed with `pyclothoids.cache.SetSolutionCache`, if any.
     """
+    cache = GetSolutionCache()
+    key = (
+        None
+        if cache is None
+        else cache.G2Key(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax)
+    )
+    if key is None:
+        return _SolveG2(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax)[0]
+    frame = (x0, y0, atan2(y1 - y0, x1 - x0), hypot(x1 - x0, y1 - y0))
+    start = perf_counter()
+    solution = cache.Get(key)
+    if solution is not None:
+        clothoids = tuple(Clothoid(_FromFrame(p, *frame)) for p in solution)
+        if instrumentation.ENABLED:
+            _Diagnose(clothoids, "SolveG2", perf_counter() - start, cached=True)
+        return clothoids
+    clothoids, iterations = _SolveG2(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax)
+    if iterations >= 0:
+        cache.Put(key, tuple(_ToFrame(c._Parameters, *frame) for c in clothoids))
+    return clothoids
+
+
+def _SolveG2(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax):
+    # Solves the problem and returns the clothoids with the iteration count, which is negative on failure
     solver = G2solve3arc()
-    solver.build(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax)
-    return tuple(map(Clothoid, (solver.getS0(), solver.getSM(), solver.getS1())))
+    start = perf_counter()
+    iterations = solver.build(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax)
+    clothoids = tuple(map(Clothoid, (solver.getS0(), solver.getSM(), solver.getS1())))
+    if instrumentation.ENABLED:
+        _Diagnose(
+            clothoids,
+            "SolveG2",
+            perf_counter() - start,
+            iterations if iterations >= 0 else None,
+            iterations >= 0,
+        )
+    return clothoids, iterations
+
+
+def _StackRows(*columns):
+    # Broadcasts scalar and array-like columns against each other into a contiguous (N, len(columns)) array
+    columns = np.broadcast_arrays(*(np.asarray(c, dtype=np.float64) for c in columns))
+    return np.ascontiguousarray(np.stack([c.ravel() for c in columns], axis=-1))
+
+
+def G1HermiteBatch(x0, y0, t0, x1, y1, t1, tol=1e-10, num_threads=0):
+    """
+    Solves many G1 Hermite interpolation problems at once.  Each argument may be a float or an array-like, and
+    all of them are broadcast against each other to define N problems with the same meaning as the arguments
+    of `Clothoid.G1Hermite`.  The problems are solved in the C++ layer across num_threads threads with the GIL
+    released, where `num_threads = 0` uses one thread per core.
+
+    Returns a tuple of a float64 array of shape (N, 6) holding the `Parameters` of each solution, NaN where
+    the solver did not converge, and a bool array of shape (N,) flagging convergence.
+    """
+    problems = _StackRows(x0, y0, t0, x1, y1, t1)
+    start = perf_counter()
+    parameters, converged = _build_G1_batch(problems, tol, num_threads)
+    if instrumentation.ENABLED:
+        instrumentation.RecordBatch(
+            "G1HermiteBatch", perf_counter() - start, None, converged
+        )
+    return parameters, converged
+
+
+def ForwardBatch(x0, y0, t0, k0, x1, y1, tol=1e-10, num_threads=0):
+    """
+    Solves many forward problems at once.  The arguments have the same meaning as those of `Clothoid.Forward`
+    and are broadcast like those of `G1HermiteBatch`, which also describes the return value.
+    """
+    problems = _StackRows(x0, y0, t0, k0, x1, y1)
+    start = perf_counter()
+    parameters, converged = _build_forward_batch(problems, tol, num_threads)
+    if instrumentation.ENABLED:
+        instrumentation.RecordBatch(
+            "ForwardBatch", perf_counter() - start, None, converged
+        )
+    return parameters, converged
+
+
+class G2BatchSolution(object):
+    """
+    The packed result of `SolveG2Batch`.  Solutions are stored as plain arrays and Clothoid objects are only
+    created when a solution is indexed.
+
+    * Parameters : float64 array of shape (N, 3, 6) holding the StandardParams of the three arcs of each
+      solution, NaN where the solver failed
+    * Iterations : int array of shape (N,) holding the Newton iteration count of each problem, -1 on failure
+    * Converged : bool array of shape (N,), True where the solver succeeded
+    * TotalLength : float64 array of shape (N,) holding the total arc length of each solution
+
+    Indexing with an integer returns the tuple of three Clothoids that `SolveG2` would return for that
+    problem.
+    """
+
+    def __init__(self, parameters, iterations):
+        self.Parameters = parameters
+        self.Iterations = iterations
+        self.Converged = iterations >= 0
+        self.TotalLength = parameters[:, :, 5].sum(axis=1)
+
+    def __len__(self):
+        return len(self.Parameters)
+
+    def __getitem__(self, index):
+        if not self.Converged[index]:
+            raise ValueError("G2 problem {} did not converge".format(index))
+        return tuple(Clothoid.StandardParams(*row) for row in self.Parameters[index])
+
+
+def SolveG2Batch(x0, y0, t0, k0, x1, y1, t1, k1, Dmax=0, dmax=0, num_threads=0):
+    """
+    Solves many G2 interpolation problems at once.  Each argument may be a float or an array-like, and all of
+    them are broadcast against each other to define N problems with the same meaning as the arguments of
+    `SolveG2`.  The problems are solved in the C++ layer across num_threads threads with the GIL released,
+    where `num_threads = 0` uses one thread per core.
+
+    Returns a `G2BatchSolution`.  Problems for which the solver fails are flagged rather than raising.
+    """
+    problems = _StackRows(x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax)
+    start = perf_counter()
+    parameters, iterations = _solve_g2_batch(problems, num_threads)
+    if instrumentation.ENABLED:
+        instrumentation.RecordBatch(
+            "SolveG2Batch", perf_counter() - start, iterations, iterations >= 0
+        )
+    return G2BatchSolution(parameters, iterations)
@@ -0,0 +1,136 @@
+from ._clothoids_cpp import CurveIndex
+from .array import ClothoidArray
+
+from math import pi, inf
+
+
+class ClothoidIndex(object):
+    """
+    A spatial index over many clothoids for nearest curve, radius and box queries.  Each clothoid is split
+    into short arcs that turn by at most max_angle radians and are at most max_size long, and a bounding
+    volume hierarchy is built over the bounding boxes of the arcs, so a query only computes exact distances to
+    the few arcs near the query point.
+
+    The index is built from a `ClothoidArray` or from any iterable of Clothoids, and curves are identified by
+    their position in it.  Queries release the GIL, and the batch queries split their points across
+    num_threads threads, where `num_threads = 0` uses one thread per core.  Pickling stores the hierarchy
+    itself, so unpickling does not rebuild it.
+    """
+
+    def __init__(self, clothoids, max_angle=pi / 18, max_size=inf, num_threads=0):
+        if not isinstance(clothoids, ClothoidArray):
+            clothoids = ClothoidArray.FromClothoids(clothoids)
+        self._CurveIndex = CurveIndex(
+            clothoids._Columns, max_angle, min(max_size, 1e100), num_threads
+        )
+
+    def __len__(self):
+        return len(self._CurveIndex)
+
+    def __str__(self):
+        return "ClothoidIndex: {} clothoids in {} arcs".format(
+            len(self), self._CurveIndex._num_pieces()
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    def __getstate__(self):
+        return self._CurveIndex._state()
+
+    def __setstate__(self, state):
+        self._CurveIndex = CurveIndex(*state)
+
+    @property
+    def Clothoids(self):
+        """
+        The indexed clothoids
+
+        :getter: Returns a `ClothoidArray` whose positions are the curve ids reported by queries
+        :setter: The indexed clothoids cannot be modified
+        :type: ClothoidArray
+        """
+        return ClothoidArray(*self._CurveIndex._params)
+
+    def Nearest(self, X, Y, k=1, max_distance=inf):
+        """
+        Finds the k clothoids closest to the point (X, Y), ignoring those farther than max_distance.  Returns a
+        tuple of three arrays holding the ids of the clothoids, the arc lengths of their closest points and the
+        distances, ordered by increasing distance.  Fewer than k clothoids are returned when fewer lie within
+        max_distance.
+        """
+        ids, s, distances = self._CurveIndex._nearest([[X], [Y]], k, max_distance, 1)
+        found = ids[0] >= 0
+        return ids[0][found], s[0][found], distances[0][found]
+
+    def NearestBatch(self, xy, k=1, max_distance=inf, num_threads=0):
+        """
+        Runs `Nearest` for every point of an array-like of shape (2, Q).  Returns three arrays of shape (Q, k)
+        holding the ids, arc lengths and distances, where row i describes point i.  Missing neighbours are
+        padded with an id of -1, a NaN arc length and an infinite distance.
+        """
+        return self._CurveIndex._nearest(xy, k, max_distance, num_threads)
+
+    def WithinRadius(self, X, Y, radius):
+        """
+        Finds every clothoid that passes within radius of the point (X, Y).  Returns a tuple of three arrays
+        holding the ids of the clothoids, the arc lengths of their closest points and the distances, ordered by
+        increasing distance.
+        """
+        _, ids, s, distances = self._CurveIndex._within_radius([[X], [Y]], radius, 1)
+        return ids, s, distances
+
+    def WithinRadiusBatch(self, xy, radius, num_threads=0):
+        """
+        Runs `WithinRadius` for every point of an array-like of shape (2, Q).  Returns a tuple of four arrays
+        with one entry per match: the index of the query point, the id of the clothoid, the arc length of its
+        closest point and the distance.  Matches are grouped by query point.
+        """
+        return self._CurveIndex._within_radius(xy, radius, num_threads)
+
+    def WithinBox(self, xmin, ymin, xmax, ymax):
+        """
+        Finds every clothoid that passes through the axis aligned box [xmin, xmax] x [ymin, ymax].  Returns a
+        tuple of two arrays holding the ids of the clothoids, in increasing order, and the smallest arc length
+        at which each of them lies inside the box.
+        """
+        _, ids, s = self._CurveIndex._within_box([[xmin, ymin, xmax, ymax]], 1)
+        return ids, s
+
+    def WithinBoxBatch(self, boxes, num_threads=0):
+        """
+        Runs `WithinBox` for every row (xmin, ymin, xmax, ymax) of an array-like of shape (Q, 4).  Returns a
+        tuple of three arrays with one entry per match: the index of the box, the id of the clothoid and the
+        smallest arc length at which it lies inside the box.  Matches are grouped by box.
+        """
+        return self._CurveIndex._within_box(boxes, num_threads)
+
+    def Intersect(self, other=None, num_threads=0):
+        """
+        Finds the intersections between the clothoids of the calling index and those of another ClothoidIndex,
+        or between distinct clothoids of the calling index when other is None.  See `IntersectSets`.
+        """
+        other = self if other is None else other
+        return self._CurveIndex._intersect(other._CurveIndex, num_threads)
+
+
+def IntersectSets(a, b=None, num_threads=0):
+    """
+    Finds every intersection between a clothoid of the set a and a clothoid of the set b, where each set is a
+    `ClothoidArray`, a `ClothoidIndex` or an iterable of Clothoids.  When b is None, the intersections between
+    distinct clothoids of a are returned instead, each pair once.  Clothoids that share an endpoint, such as
+    consecutive segments of a path, intersect there.
+
+    Pairs of clothoids are pruned by the bounding boxes of their arcs first, so exact intersections are only
+    computed for pairs that pass close to each other.  These run in the C++ layer across num_threads threads
+    with the GIL released, where `num_threads = 0` uses one thread per core.
+
+    Returns a float64 array of shape (R, 4) with one row (i, j, s_i, s_j) per intersection, where i and j are
+    the integer positions of the clothoids in a and b and s_i and s_j are the arc lengths of the intersection
+    along each of them.  Rows are sorted by i, j and s_i.
+    """
+    a = a if isinstance(a, ClothoidIndex) else ClothoidIndex(a, num_threads=num_threads)
+    if b is None:
+        return a.Intersect(num_threads=num_threads)
+    b = b if isinstance(b, ClothoidIndex) else ClothoidIndex(b, num_threads=num_threads)
+    return a.Intersect(b, num_threads)
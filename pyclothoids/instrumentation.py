@@ -0,0 +1,253 @@
+from bisect import bisect_left
+from collections import namedtuple
+from threading import Lock
+
+# Read by the instrumented entry points before doing any bookkeeping, so that disabled instrumentation costs a
+# single attribute lookup per call
+ENABLED = False
+
+# Upper bounds of the buckets of the wall time histograms, in seconds, and of the Newton iteration histograms
+SECONDS_BUCKETS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    1e-2,
+    1e-1,
+    1.0,
+)
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 50, 100)
+
+Diagnostics = namedtuple(
+    "Diagnostics", ["entry_point", "seconds", "iterations", "converged", "cached"]
+)
+Diagnostics.__doc__ = """
+The diagnostics of a single call, available from `Clothoid.Diagnostics` on the clothoids it returned while
+instrumentation was enabled.
+
+* entry_point : the name of the instrumented function, such as 'SolveG2'
+* seconds : the wall time spent in the C++ layer
+* iterations : the Newton iteration count reported by the solver, or None when it reports none
+* converged : False when the solver failed
+* cached : True when the solution came from the `pyclothoids.SolutionCache` without running the solver, in
+  which case seconds is the time of the lookup and iterations is None
+"""
+
+
+class _EntryPoint(object):
+    def __init__(self):
+        self.lock = Lock()
+        self.calls = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.seconds_counts = [0] * (len(SECONDS_BUCKETS) + 1)
+        self.iterations = 0
+        self.iteration_counts = [0] * (len(ITERATION_BUCKETS) + 1)
+        self.outcomes = {}
+
+    def Record(self, seconds, iterations, failures, outcome):
+        bucket = bisect_left(SECONDS_BUCKETS, seconds)
+        with self.lock:
+            self.calls += 1
+            self.failures += failures
+            self.seconds += seconds
+            self.seconds_counts[bucket] += 1
+            if iterations is not None:
+                self.iterations += iterations
+                self.iteration_counts[bisect_left(ITERATION_BUCKETS, iterations)] += 1
+            if outcome is not None:
+                self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def RecordBatch(self, seconds, iterations, failures):
+        bucket = bisect_left(SECONDS_BUCKETS, seconds)
+        counts = [0] * len(self.iteration_counts)
+        for count in iterations:
+            counts[bisect_left(ITERATION_BUCKETS, count)] += 1
+        with self.lock:
+            self.calls += 1
+            self.failures += failures
+            self.seconds += seconds
+            self.seconds_counts[bucket] += 1
+            self.iterations += sum(iterations)
+            self.iteration_counts = [
+                a + b for a, b in zip(self.iteration_counts, counts)
+            ]
+
+    def Snapshot(self):
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "seconds": _Histogram(
+                    SECONDS_BUCKETS, self.seconds_counts, self.seconds
+                ),
+                "iterations": _Histogram(
+                    ITERATION_BUCKETS, self.iteration_counts, self.iterations
+                ),
+                "outcomes": dict(self.outcomes),
+            }
+
+
+def _Histogram(bounds, counts, total):
+    cumulative, buckets = 0, {}
+    for bound, count in zip(bounds + (float("inf"),), counts):
+        cumulative += count
+        buckets[bound] = cumulative
+    return {"count": cumulative, "sum": total, "buckets": buckets}
+
+
+_EntryPoints = {}
+_EntryPointsLock = Lock()
+
+
+def _Get(entry_point):
+    stats = _EntryPoints.get(entry_point)
+    if stats is None:
+        with _EntryPointsLock:
+            stats = _EntryPoints.setdefault(entry_point, _EntryPoint())
+    return stats
+
+
+def Enable():
+    """
+    Starts recording the instrumented entry points: SolveG2, SolveG2Batch, the G1Hermite and Forward
+    constructors of Clothoid, G1HermiteBatch, ForwardBatch and the point projections of Clothoid that miss the
+    projection cache.  Calls of SolveG2 and G1Hermite answered by the solution cache are recorded with the
+    cache_hit outcome and no iteration count.
+    """
+    global ENABLED
+    ENABLED = True
+
+
+def Disable():
+    """
+    Stops recording.  The statistics recorded so far are kept until `Reset` is called.
+    """
+    global ENABLED
+    ENABLED = False
+
+
+def IsEnabled():
+    """
+    Returns True while instrumentation is enabled
+    """
+    return ENABLED
+
+
+def Reset():
+    """
+    Discards every recorded statistic
+    """
+    with _EntryPointsLock:
+        _EntryPoints.clear()
+
+
+def Record(entry_point, seconds, iterations=None, converged=True, outcome=None):
+    """
+    Records a call of entry_point that took seconds of wall time.  iterations is the Newton iteration count of
+    the call, if any.  outcome is an optional label, such as the kind of a projection, counted separately for
+    each value.
+    """
+    _Get(entry_point).Record(seconds, iterations, not converged, outcome)
+
+
+def RecordBatch(entry_point, seconds, iterations, converged):
+    """
+    Records a batched call of entry_point that took seconds of wall time, where iterations and converged hold
+    the iteration count and the success of each problem of the batch.  iterations is None for solvers that
+    report no iteration count.  Each failed problem counts as a failure.
+    """
+    _Get(entry_point).RecordBatch(
+        seconds,
+        (
+            []
+            if iterations is None
+            else [int(count) for count, ok in zip(iterations, converged) if ok]
+        ),
+        len(converged) - int(sum(converged)),
+    )
+
+
+def Snapshot():
+    """
+    Returns the recorded statistics as a dict keyed by entry point.  Each value is a dict with the number of
+    calls, the number of failures, histograms of the wall time in seconds and of the Newton iteration counts,
+    and the counts of each outcome.  Histograms are dicts with a count, a sum and cumulative bucket counts
+    keyed by the upper bound of each bucket, as in the Prometheus exposition format.
+
+    ::
+
+        {'SolveG2': {'calls': 2, 'failures': 0, 'seconds': {'count': 2, 'sum': 4.1e-05, 'buckets': {...}},
+                     'iterations': {'count': 2, 'sum': 9, 'buckets': {...}}, 'outcomes': {}}}
+    """
+    with _EntryPointsLock:
+        entry_points = dict(_EntryPoints)
+    return {name: stats.Snapshot() for name, stats in sorted(entry_points.items())}
+
+
+def _Bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def PrometheusText(prefix="pyclothoids"):
+    """
+    Returns the recorded statistics in the Prometheus text exposition format, with every metric name starting
+    with prefix and labeled by entry point
+    """
+    snapshot = Snapshot()
+    lines = []
+
+    def Header(name, kind, description):
+        lines.append("# HELP {}_{} {}".format(prefix, name, description))
+        lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+
+    Header("calls_total", "counter", "Calls of each instrumented entry point")
+    for name, stats in snapshot.items():
+        lines.append(
+            '{}_calls_total{{entry_point="{}"}} {}'.format(prefix, name, stats["calls"])
+        )
+    Header("failures_total", "counter", "Problems that a solver failed to solve")
+    for name, stats in snapshot.items():
+        lines.append(
+            '{}_failures_total{{entry_point="{}"}} {}'.format(
+                prefix, name, stats["failures"]
+            )
+        )
+    Header("outcomes_total", "counter", "Outcomes of each instrumented entry point")
+    for name, stats in snapshot.items():
+        for outcome, count in sorted(stats["outcomes"].items()):
+            lines.append(
+                '{}_outcomes_total{{entry_point="{}",outcome="{}"}} {}'.format(
+                    prefix, name, outcome, count
+                )
+            )
+    for metric, key, description in (
+        ("call_duration_seconds", "seconds", "Wall time of each instrumented call"),
+        ("newton_iterations", "iterations", "Newton iterations of each solved problem"),
+    ):
+        Header(metric, "histogram", description)
+        for name, stats in snapshot.items():
+            histogram = stats[key]
+            for bound, count in histogram["buckets"].items():
+                lines.append(
+                    '{}_{}_bucket{{entry_point="{}",le="{}"}} {}'.format(
+                        prefix, metric, name, _Bound(bound), count
+                    )
+                )
+            lines.append(
+                '{}_{}_sum{{entry_point="{}"}} {}'.format(
+                    prefix, metric, name, histogram["sum"]
+                )
+            )
+            lines.append(
+                '{}_{}_count{{entry_point="{}"}} {}'.format(
+                    prefix, metric, name, histogram["count"]
+                )
+            )
+    return "\n".join(lines) + "\n"
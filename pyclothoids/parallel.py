@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+
+
+def _RunChunk(func, chunk):
+    return [func(*args) for args in chunk]
+
+
+def map(func, *iterables, num_threads=0, chunksize=None):
+    """
+    Applies func to the items of iterables like the builtin map, with the calls fanned out over a pool of
+    num_threads threads, where `num_threads = 0` uses one thread per core.  Returns a list of the results in
+    the order of the inputs.  The first exception raised by a call is re-raised.
+
+    The methods and functions of pyclothoids release the GIL while they compute, so the calls run on all cores
+    at once.  Calls are grouped in chunks of chunksize to amortize the cost of dispatching cheap calls such as
+    single point projections.  By default each thread receives about four chunks.
+
+    ::
+
+        solutions = pyclothoids.parallel.map(SolveG2, x0, y0, t0, k0, x1, y1, t1, k1)
+
+    Objects may be shared between the calls as long as no call modifies them, for example by appending to a
+    ClothoidPath.
+    """
+    if num_threads < 1:
+        num_threads = cpu_count() or 1
+    items = list(zip(*iterables))
+    if chunksize is None:
+        chunksize = max(1, -(-len(items) // (4 * num_threads)))
+    chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+    if num_threads == 1 or len(chunks) <= 1:
+        return _RunChunk(func, items)
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = executor.map(_RunChunk, [func] * len(chunks), chunks)
+        return [result for chunk in results for result in chunk]
@@ -0,0 +1,241 @@
+from ._clothoids_cpp import ClothoidList
+from .clothoid import Clothoid, CLOTHOID_FUNCTION_WINDOW
+from .precision import Tolerance
+
+from math import pi
+
+import numpy as np
+
+PATH_PROPERTY_WINDOW = frozenset(
+    (
+        "length",
+        "ThetaStart",
+        "ThetaEnd",
+        "XStart",
+        "XEnd",
+        "YStart",
+        "YEnd",
+        "KappaStart",
+        "KappaEnd",
+    )
+)
+
+
+class ClothoidPath(object):
+    """
+    An object representing a sequence of Clothoids joined end to end and parameterized by a single global arc
+    length.  Evaluating the path at a global arc length locates the segment holding it by binary search, and
+    closest point queries are accelerated by an AABB tree over the whole path, so queries on a full route are
+    single calls to the C++ layer.
+
+    Unlike Clothoid, a ClothoidPath can be extended in place with `Append` and `PushBackG1`.  The evaluation
+    functions X, Y, Theta and their derivatives accept global arc lengths, either as floats or array-likes.
+    Pickling and unpickling is supported.
+    """
+
+    def __init__(self, clothoids=()):
+        self._ClothoidList = ClothoidList()
+        self._indexed = False
+        for clothoid in clothoids:
+            self.Append(clothoid)
+
+    def __getattr__(self, name):
+        if name in CLOTHOID_FUNCTION_WINDOW or name in PATH_PROPERTY_WINDOW:
+            if not len(self):
+                raise IndexError("ClothoidPath is empty")
+            if name in PATH_PROPERTY_WINDOW:
+                # mimic property getter syntax
+                return getattr(self._ClothoidList, name)()
+            return getattr(self._ClothoidList, name)
+        raise AttributeError(
+            "'{}' object has no attribute '{}'".format(type(self).__name__, name)
+        )
+
+    def __len__(self):
+        return self._ClothoidList.numSegment()
+
+    def __getitem__(self, index):
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("ClothoidPath index out of range")
+        return Clothoid(self._ClothoidList.get(index))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __str__(self):
+        return "ClothoidPath: {} segments, length {}".format(
+            len(self), self.length if len(self) else 0.0
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    def __getstate__(self):
+        return tuple(clothoid.Parameters for clothoid in self)
+
+    def __setstate__(self, state):
+        self.__init__(Clothoid.StandardParams(*parameters) for parameters in state)
+
+    def _Modify(self):
+        # The AABB tree of the C++ list is built lazily by the first closest point query and is not invalidated
+        # by appending segments, so start over from a fresh copy once it exists.
+        if self._indexed:
+            self._ClothoidList = ClothoidList(self._ClothoidList)
+            self._indexed = False
+        return self._ClothoidList
+
+    def _Indexed(self):
+        if not len(self):
+            raise IndexError("ClothoidPath is empty")
+        self._indexed = True
+        return self._ClothoidList
+
+    def Append(self, clothoid):
+        """
+        Appends a copy of a Clothoid to the end of the path.  The Clothoid is not moved, so it should start where
+        the path currently ends for the path to be continuous.
+        """
+        self._Modify().push_back(clothoid._ClothoidCurve)
+
+    def PushBackG1(self, x1, y1, t1):
+        """
+        Appends the Clothoid that solves the G1 Hermite interpolation problem between the end of the path and
+        the point (x1, y1) with tangent angle t1, keeping the path G1 continuous.
+        """
+        if not len(self):
+            raise IndexError("PushBackG1 requires a non-empty ClothoidPath")
+        self._Modify().push_back_G1(x1, y1, t1)
+
+    @property
+    def SegmentArcLengths(self):
+        """
+        The global arc lengths at which each segment starts, followed by the total length of the path
+
+        :getter: Returns a float64 numpy array with one more entry than there are segments
+        :setter: Segment arc lengths cannot be modified
+        :type: numpy.ndarray
+        """
+        return self._ClothoidList._segment_stations()
+
+    def SegmentIndex(self, s):
+        """
+        Returns the index of the segment that holds the global arc length s, found by binary search.  Accepts a
+        float or an array-like and returns an int or an integer array of the same shape.  Arc lengths outside
+        of the path map to the first or last segment.
+        """
+        return self._ClothoidList._find_segment(s)
+
+    def Evaluate(
+        self, s, quantities=("X", "Y", "Theta", "Kappa"), offset=0, precision=None
+    ):
+        """
+        Evaluates several quantities at once at the global arc length(s) s, on the offset curve at offset when
+        it is nonzero, with X and Y computed at the given precision.  See `Clothoid.Evaluate`.
+        """
+        if np.ndim(offset):
+            s, offset = np.broadcast_arrays(s, offset)
+        return self._ClothoidList._evaluate(s, quantities, offset, Tolerance(precision))
+
+    def SampleXY(self, npts, out=None, offset=0, precision=None):
+        """
+        Returns a float64 numpy array of shape (2, npts) holding the X and Y coordinates of npts points equally
+        spaced along the whole path, shifted by offset to the left and computed at the given precision.  A
+        preallocated array may be passed as out.  See `Clothoid.SampleXY`.
+        """
+        if np.ndim(offset):
+            offset = np.broadcast_to(offset, (npts,))
+        return self._ClothoidList._sample_xy(npts, out, offset, Tolerance(precision))
+
+    def ToPolyline(self, tol):
+        """
+        Returns the (2, N) vertices of a polyline that deviates from the path by at most tol.  The end of each
+        segment is a vertex.  See `Clothoid.ToPolyline`.
+        """
+        return self._ClothoidList._to_polyline(tol)
+
+    def BoundingTriangles(self, max_angle=pi / 18, max_size=float("inf"), offset=0):
+        """
+        Returns the (K, 8) triangles covering every point within offset of the path, segment after segment,
+        with s0 and s1 given as global arc lengths.  See `Clothoid.BoundingTriangles`.
+        """
+        return self._ClothoidList._bounding_triangles(max_angle, max_size, offset)
+
+    def BoundingBox(self, offset=0):
+        """
+        Returns the tuple (xmin, ymin, xmax, ymax) of the smallest axis-aligned box containing every point
+        within offset of the path.  See `Clothoid.BoundingBox`.
+        """
+        return self._ClothoidList._bounding_box(offset)
+
+    def ProjectPointOntoPath(self, X, Y):
+        """
+        Calculates the minimum-distance projection of a given point onto the path.  Returns a tuple containing
+        the closest point coordinates, the global arc length of the closest point, and the distance between the
+        given point and the projected point.
+        """
+        ProjectedX, ProjectedY, ProjectedArclength, ProjectionDistance = (
+            self._Indexed()._project_point(X, Y)
+        )
+        return ((ProjectedX, ProjectedY), ProjectedArclength, ProjectionDistance)
+
+    def ClosestPoint(self, X, Y):
+        """
+        Returns a tuple containing the cartesian coordinates of the point on the path which is closest to the
+        point defined by the X and Y input arguments.
+        """
+        ProjectedPoint, _, _ = self.ProjectPointOntoPath(X, Y)
+        return ProjectedPoint
+
+    def ClosestPointArcLength(self, X, Y):
+        """
+        Returns the global arc length of the point on the path which is closest to the point defined by the X
+        and Y input arguments.
+        """
+        _, ProjectedArclength, _ = self.ProjectPointOntoPath(X, Y)
+        return ProjectedArclength
+
+    def Distance(self, X, Y):
+        """
+        Returns the minimum distance between a given point and the path.
+        """
+        _, _, ProjectionDistance = self.ProjectPointOntoPath(X, Y)
+        return ProjectionDistance
+
+    def SolveFor(self, quantity, values, num_threads=1):
+        """
+        Finds every global arc length at which quantity, one of 'X', 'Y', 'Theta' or 'Kappa', equals values.
+        See `Clothoid.SolveFor`.  A root at the junction of two segments is reported once.
+        """
+        index, s = self._ClothoidList._solve_for(quantity, values, num_threads)
+        return s if np.ndim(values) == 0 else (index, s)
+
+    def ProjectPoints(self, xy, num_threads=1):
+        """
+        Projects many points onto the path in a single call to the C++ layer.  Returns a float64 numpy array of
+        shape (4, ...) holding the projected X and Y coordinates, global arc lengths and signed distances.  See
+        `Clothoid.ProjectPoints`.
+        """
+        return self._Indexed()._project_points(xy, num_threads)
+
+    def ToFrenet(self, xy, theta=None, num_threads=1):
+        """
+        Converts many points to Frenet coordinates along the path: global arc lengths, signed lateral offsets
+        and, when headings theta are given, heading errors.  See `Clothoid.ToFrenet`.
+        """
+        if theta is not None:
+            theta = np.broadcast_to(theta, np.shape(xy)[1:])
+        return self._Indexed()._to_frenet(xy, theta, num_threads)
+
+    def FromFrenet(self, s, d, heading_error=None, num_threads=1):
+        """
+        Converts global arc lengths and signed lateral offsets back to cartesian coordinates, and heading
+        errors to headings.  See `Clothoid.FromFrenet`.
+        """
+        if heading_error is None:
+            s, d = np.broadcast_arrays(s, d)
+        else:
+            s, d, heading_error = np.broadcast_arrays(s, d, heading_error)
+        return self._ClothoidList._from_frenet(s, d, heading_error, num_threads)
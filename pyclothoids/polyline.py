@@ -0,0 +1,105 @@
+from ._clothoids_cpp import PolyLine
+from .clothoid import Clothoid
+
+
+class Polyline(object):
+    """
+    A polygonal chain through a sequence of vertices, as produced by `Clothoid.ToPolyline`.  Arc lengths along
+    a Polyline are measured from its first vertex.  Polylines are a cheap stand-in for clothoids in broad
+    checks: two polylines are intersected through AABB trees over their edges, while queries against a
+    Clothoid are exact.  Pickling is supported.
+    """
+
+    def __init__(self, xy):
+        """
+        Creates a Polyline from an array-like of shape (2, N) whose rows hold the X and Y coordinates of at
+        least two vertices
+        """
+        self._PolyLine = PolyLine(xy)
+
+    @classmethod
+    def FromCurve(cls, curve, tol):
+        """
+        Returns the Polyline that follows a Clothoid or ClothoidPath within tol.  See `Clothoid.ToPolyline`.
+        """
+        return cls(curve.ToPolyline(tol))
+
+    def __len__(self):
+        return self._PolyLine.numPoints()
+
+    def __str__(self):
+        return "Polyline: {} vertices, length {}".format(len(self), self.length)
+
+    def __repr__(self):
+        return str(self)
+
+    def __getstate__(self):
+        return self.Vertices
+
+    def __setstate__(self, state):
+        self._PolyLine = PolyLine(state)
+
+    @property
+    def Vertices(self):
+        """
+        The vertices of the polyline
+
+        :getter: Returns a float64 numpy array of shape (2, N) holding the X and Y coordinates of the vertices
+        :setter: Vertices cannot be modified
+        :type: numpy.ndarray
+        """
+        return self._PolyLine._vertices()
+
+    @property
+    def length(self):
+        return self._PolyLine.length()
+
+    def ProjectPointOntoPolyline(self, X, Y):
+        """
+        Calculates the minimum-distance projection of a given point onto the polyline.  Returns a tuple
+        containing the closest point coordinates, the arc length of the closest point, and the distance between
+        the given point and the projected point.
+        """
+        ProjectedX, ProjectedY, ProjectedArclength, ProjectionDistance = (
+            self._PolyLine._project_point(X, Y)
+        )
+        return ((ProjectedX, ProjectedY), ProjectedArclength, ProjectionDistance)
+
+    def Distance(self, X, Y):
+        """
+        Returns the minimum distance between a given point and the polyline.
+        """
+        _, _, ProjectionDistance = self.ProjectPointOntoPolyline(X, Y)
+        return ProjectionDistance
+
+    def DistanceTo(self, clothoid):
+        """
+        Returns a tuple holding the minimum distance between the polyline and a Clothoid, the arc length of the
+        closest point along the polyline and the arc length of the closest point along the clothoid.  The
+        distance is exact: it is checked at every vertex, at the ends of the clothoid and at every point where
+        the clothoid runs parallel to an edge, which are found in closed form, and is zero where they
+        intersect.
+        """
+        return self._PolyLine._distance_to_clothoid(clothoid._ClothoidCurve)
+
+    def IntersectionArcLengths(self, other):
+        """
+        Returns a list of tuples, one for each intersection of the polyline with other, a Polyline or a
+        Clothoid, ordered along the polyline.  Each tuple holds the arc length of the intersection along the
+        polyline followed by the arc length along other.  Overlapping parallel edges of two polylines do not
+        count as intersecting.
+
+        Intersections with a Clothoid are found by testing each edge against the arcs of the clothoid whose
+        bounding boxes it overlaps, and solving for the arc lengths at which the clothoid crosses the line of
+        the edge.
+        """
+        if isinstance(other, Clothoid):
+            return self._PolyLine._intersect_clothoid(other._ClothoidCurve)
+        return self._PolyLine._intersect(other._PolyLine)
+
+    def Collides(self, other):
+        """
+        Returns True when the polyline intersects another Polyline.  Faster than `IntersectionArcLengths`, as
+        it stops at the first intersection.
+        """
+        return bool(self._PolyLine._intersect(other._PolyLine, True))
@@ -0,0 +1,55 @@
+from math import isfinite
+from numbers import Real
+
+# The absolute tolerance of precision="fast", in the length unit of the clothoids
+FAST_TOLERANCE = 1e-6
+
+_DefaultPrecision = "exact"
+
+
+def Tolerance(precision=None):
+    """
+    Returns the absolute tolerance selected by precision, or 0 for the exact mode.  precision is "exact",
+    "fast" for a tolerance of `FAST_TOLERANCE`, a positive finite float giving the tolerance of the fast
+    mode directly, or None for the default set by `SetDefaultPrecision`.
+    """
+    if precision is None:
+        precision = _DefaultPrecision
+    if isinstance(precision, str):
+        if precision == "exact":
+            return 0.0
+        if precision == "fast":
+            return FAST_TOLERANCE
+    elif (
+        isinstance(precision, Real)
+        and not isinstance(precision, bool)
+        and precision > 0
+        and isfinite(precision)
+    ):
+        return float(precision)
+    raise ValueError(
+        "precision must be 'exact', 'fast' or a positive tolerance, not {!r}".format(
+            precision
+        )
+    )
+
+
+def SetDefaultPrecision(precision):
+    """
+    Sets the precision used by the batched evaluation and sampling methods called without one, "exact" until
+    changed.  Accepts the values described in `Tolerance`.
+
+    ::
+
+        pyclothoids.precision.SetDefaultPrecision(1e-3)  # millimeters are enough to draw roads in meters
+    """
+    global _DefaultPrecision
+    Tolerance(precision)
+    _DefaultPrecision = "exact" if precision is None else precision
+
+
+def GetDefaultPrecision():
+    """
+    Returns the precision used by the batched evaluation and sampling methods called without one
+    """
+    return _DefaultPrecision
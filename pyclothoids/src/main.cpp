@@ -5,46 +5,2789 @@ Author: Phillip Dix
 #ifdef _WIN32
 #include <pybind11\pybind11.h>
 #include <pybind11\stl.h>
+#include <pybind11\numpy.h>
 #else
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 #endif
 
 #include <G2lib.hh>
 #include <Clothoid.hh>
 #include <ClothoidList.hh>
+#include <PolyLine.hh>
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstdint>
+#include <exception>
+#include <functional>
+#include <limits>
+#include <memory>
+#include <mutex>
+#include <queue>
+#include <string>
+#include <thread>
+#include <tuple>
+#include <unordered_map>
+#include <vector>
 
 namespace py = pybind11;
 
+typedef py::array_t<G2lib::real_type, py::array::c_style | py::array::forcecast> RealArray;
+
+// Converts any array-like (ndarray, buffer, list, ...) into a contiguous float64 array
+static RealArray as_real_array(py::handle values, const char* name) {
+    RealArray result = RealArray::ensure(values);
+    if (!result) {
+        throw py::type_error(std::string(name) + " must be a float or an array-like of floats");
+    }
+    return result;
+}
+
+// Allocates an uninitialized float64 array with the given leading dimensions followed by the shape of `like`
+static RealArray empty_like(const RealArray& like, std::vector<py::ssize_t> leading = {}) {
+    leading.insert(leading.end(), like.shape(), like.shape() + like.ndim());
+    return RealArray(leading);
+}
+
+static bool is_array_like(py::handle values) {
+    return py::isinstance<py::array>(values) || (py::isinstance<py::sequence>(values) && !py::isinstance<py::str>(values));
+}
+
+// Evaluates a curve function on a single float, or elementwise over an array-like in one loop without the GIL
+template <typename Curve, G2lib::real_type (Curve::*F)(G2lib::real_type) const>
+static py::object vectorize(const Curve& self, py::object s) {
+    if (!is_array_like(s)) {
+        return py::float_((self.*F)(s.cast<G2lib::real_type>()));
+    }
+    RealArray s_array = as_real_array(s, "s");
+    RealArray result = empty_like(s_array);
+    const G2lib::real_type* in = s_array.data();
+    G2lib::real_type* out = result.mutable_data();
+    py::ssize_t n = s_array.size();
+    {
+        py::gil_scoped_release release;
+        for (py::ssize_t i = 0; i < n; ++i) {
+            out[i] = (self.*F)(in[i]);
+        }
+    }
+    return std::move(result);
+}
+
+enum Channel {
+    CHANNEL_X, CHANNEL_XD, CHANNEL_XDD, CHANNEL_XDDD,
+    CHANNEL_Y, CHANNEL_YD, CHANNEL_YDD, CHANNEL_YDDD,
+    CHANNEL_THETA, CHANNEL_THETAD, CHANNEL_THETADD, CHANNEL_THETADDD,
+    CHANNEL_KAPPA, CHANNEL_KAPPAD,
+};
+
+static Channel parse_channel(const std::string& name) {
+    static const char* names[] = {
+        "X", "XD", "XDD", "XDDD",
+        "Y", "YD", "YDD", "YDDD",
+        "Theta", "ThetaD", "ThetaDD", "ThetaDDD",
+    };
+    for (int i = 0; i < 12; ++i) {
+        if (name == names[i]) return static_cast<Channel>(i);
+    }
+    // curvature and its derivative equal the tangent angle derivatives on the curve itself, but not on its
+    // offset curves
+    if (name == "Kappa") return CHANNEL_KAPPA;
+    if (name == "KappaD") return CHANNEL_KAPPAD;
+    throw py::value_error("Unknown quantity '" + name + "'");
+}
+
+static std::vector<Channel> parse_channels(const std::vector<std::string>& quantities) {
+    std::vector<Channel> channels;
+    for (const std::string& q : quantities) channels.push_back(parse_channel(q));
+    return channels;
+}
+
+static G2lib::ClothoidData curve_data(const G2lib::ClothoidCurve& curve) {
+    G2lib::ClothoidData data;
+    data.x0 = curve.xBegin();
+    data.y0 = curve.yBegin();
+    data.theta0 = curve.thetaBegin();
+    data.kappa0 = curve.kappaBegin();
+    data.dk = curve.dkappa();
+    return data;
+}
+
+struct Segment {
+    G2lib::ClothoidData data;
+    G2lib::real_type s_begin, length;
+};
+
+static std::vector<Segment> curve_segments(const G2lib::ClothoidCurve& self) {
+    return {Segment{curve_data(self), 0, self.length()}};
+}
+
+static std::vector<Segment> curve_segments(const G2lib::ClothoidList& self) {
+    std::vector<Segment> segments;
+    G2lib::real_type s_begin = 0;
+    for (G2lib::int_type i = 0; i < self.numSegment(); ++i) {
+        const G2lib::ClothoidCurve& curve = self.get(i);
+        segments.push_back(Segment{curve_data(curve), s_begin, curve.length()});
+        s_begin += curve.length();
+    }
+    return segments;
+}
+
+// The fast precision mode approximates the points of a clothoid to an absolute tolerance with local series.
+// Each segment is split into pieces of length 2r centered on anchors evaluated exactly, and the point at arc
+// length c + u, with c an anchor and |u| <= r, is
+//     P(c) + e^(i theta(c)) * sum_k g_k u^(k+1) / (k+1),   where e^(i (kappa(c) u + dk u^2 / 2)) = sum_k g_k u^k
+// and (k+1) g_(k+1) = i (kappa(c) g_k + dk g_(k-1)) follows from differentiating the exponential.  The modulus of
+// g_k is at most the coefficient b_k of exp(A u + B u^2 / 2) with A = max |kappa| and B = |dk|, so the series
+// truncated after degree m is off by at most sum_(k>m) b_k r^(k+1) / (k+1), which fast_truncation_bound returns.
+static const int FAST_MAX_DEGREE = 16;
+
+static G2lib::real_type fast_truncation_bound(G2lib::real_type A, G2lib::real_type B, G2lib::real_type r, int degree) {
+    // b_k r^k, from (k+1) b_(k+1) = A b_k + B b_(k-1), summed until the terms are negligible
+    G2lib::real_type a = A * r, b = B * r * r, previous = 0, current = 1, tail = 0;
+    for (int k = 0; k < 1000; ++k) {
+        if (k > degree) {
+            G2lib::real_type term = current / (k + 1);
+            tail += term;
+            if (k > a + b && term <= 1e-17 * tail) break;
+        }
+        G2lib::real_type next = (a * current + b * previous) / (k + 1);
+        previous = current;
+        current = next;
+    }
+    return r * tail;
+}
+
+class FastPositions {
+public:
+    // Plans the pieces of every segment, and evaluates their anchors unless there would be more than
+    // max_anchors of them, in which case valid() is false and the exact evaluation is cheaper
+    FastPositions(const std::vector<Segment>& segments, G2lib::real_type tol, py::ssize_t max_anchors) : anchors_(0) {
+        for (const Segment& segment : segments) {
+            Piece piece;
+            piece.data = segment.data;
+            piece.s_begin = segment.s_begin;
+            piece.length = segment.length;
+            if (!plan(piece, tol, max_anchors - anchors_)) return;
+            anchors_ += piece.count;
+            pieces_.push_back(piece);
+        }
+        for (Piece& piece : pieces_) {
+            piece.offset = coefficients_.size();
+            for (py::ssize_t i = 0; i < piece.count; ++i) {
+                expand(piece, (2 * i + 1) * piece.radius);
+            }
+        }
+    }
+
+    bool valid() const { return !pieces_.empty() && !coefficients_.empty(); }
+
+    // Approximates the point at arc length s, or returns false when s is outside of the curve, where the
+    // series do not hold
+    bool eval(G2lib::real_type s, G2lib::real_type& x, G2lib::real_type& y) const {
+        size_t j = 0;
+        if (pieces_.size() > 1) {
+            auto after = std::upper_bound(pieces_.begin() + 1, pieces_.end(), s,
+                                          [](G2lib::real_type v, const Piece& p) { return v < p.s_begin; });
+            j = static_cast<size_t>(after - pieces_.begin()) - 1;
+        }
+        const Piece& piece = pieces_[j];
+        G2lib::real_type local = s - piece.s_begin;
+        if (!(local >= 0 && local <= piece.length)) return false;
+        py::ssize_t i = piece.count == 1 ? 0 : std::min<py::ssize_t>(static_cast<py::ssize_t>(local / (2 * piece.radius)), piece.count - 1);
+        G2lib::real_type u = local - (2 * i + 1) * piece.radius;
+        const G2lib::real_type* c = coefficients_.data() + piece.offset + i * (2 * piece.degree + 4);
+        G2lib::real_type sx = c[2 * piece.degree + 2], sy = c[2 * piece.degree + 3];
+        for (int k = piece.degree - 1; k >= 0; --k) {
+            sx = sx * u + c[2 * k + 2];
+            sy = sy * u + c[2 * k + 3];
+        }
+        x = c[0] + u * sx;
+        y = c[1] + u * sy;
+        return true;
+    }
+
+private:
+    struct Piece {
+        G2lib::ClothoidData data;
+        G2lib::real_type s_begin, length, radius;
+        int degree;
+        py::ssize_t count;
+        size_t offset;
+    };
+
+    // Chooses the half length and the degree of the pieces of a segment.  The half length starts where the
+    // exponent A r + B r^2 / 2 reaches 2, so that the series converge quickly, and is halved until a degree of
+    // at most FAST_MAX_DEGREE meets the tolerance.  Returns false once the segment needs more than max_anchors
+    // pieces.
+    static bool plan(Piece& piece, G2lib::real_type tol, py::ssize_t max_anchors) {
+        const G2lib::ClothoidData& cd = piece.data;
+        G2lib::real_type A = std::max(std::abs(cd.kappa0), std::abs(cd.theta_D(piece.length))), B = std::abs(cd.dk);
+        G2lib::real_type r = piece.length / 2;
+        if (A * r + B * r * r / 2 > 2) {
+            r = B > 0 ? 4 / (A + std::sqrt(A * A + 4 * B)) : 2 / A;
+        }
+        piece.count = 1;
+        piece.radius = r;
+        piece.degree = 0;
+        if (!(piece.length > 0)) return max_anchors >= 1;
+        for (;;) {
+            G2lib::real_type count = std::ceil(piece.length / (2 * r));
+            if (!(count <= max_anchors)) return false;
+            piece.count = std::max<py::ssize_t>(1, static_cast<py::ssize_t>(count));
+            piece.radius = piece.length / (2 * piece.count);
+            for (piece.degree = 0; piece.degree <= FAST_MAX_DEGREE; ++piece.degree) {
+                if (fast_truncation_bound(A, B, piece.radius, piece.degree) <= tol) return true;
+            }
+            r = piece.radius / 2;
+        }
+    }
+
+    // Appends the point at arc length c of the segment and the coefficients e^(i theta(c)) g_k / (k+1)
+    void expand(const Piece& piece, G2lib::real_type c) {
+        const G2lib::ClothoidData& cd = piece.data;
+        G2lib::real_type x, y, kappa = cd.theta_D(c), theta = cd.theta(c);
+        cd.eval(c, x, y);
+        coefficients_.push_back(x);
+        coefficients_.push_back(y);
+        // g_k = re + i im, starting from g_(-1) = 0 and g_0 = 1
+        G2lib::real_type re0 = 0, im0 = 0, re = 1, im = 0, cs = std::cos(theta), sn = std::sin(theta);
+        for (int k = 0; k <= piece.degree; ++k) {
+            coefficients_.push_back((cs * re - sn * im) / (k + 1));
+            coefficients_.push_back((sn * re + cs * im) / (k + 1));
+            // (k+1) g_(k+1) = i (kappa g_k + dk g_(k-1))
+            G2lib::real_type re1 = -(kappa * im + cd.dk * im0) / (k + 1);
+            G2lib::real_type im1 = (kappa * re + cd.dk * re0) / (k + 1);
+            re0 = re;
+            im0 = im;
+            re = re1;
+            im = im1;
+        }
+    }
+
+    std::vector<Piece> pieces_;
+    std::vector<G2lib::real_type> coefficients_;
+    py::ssize_t anchors_;
+};
+
+// Builds the fast approximation of a curve for n evaluations of its points, or returns null when the
+// tolerance is zero, which selects the exact mode, or when the exact mode would be cheaper
+template <typename Curve>
+static std::unique_ptr<FastPositions> fast_positions(const Curve& self, G2lib::real_type tol, py::ssize_t n) {
+    if (!(tol > 0)) return nullptr;
+    std::unique_ptr<FastPositions> fast(new FastPositions(curve_segments(self), tol, n / 2));
+    if (!fast->valid()) return nullptr;
+    return fast;
+}
+
+// Writes each requested quantity of the curve at arc length s to out[0], out[stride], out[2 * stride], ...
+// X and Y (and their derivatives) share a single Fresnel evaluation when both are requested.  A nonzero offset
+// evaluates the offset curve at that lateral distance, positive to the left, at the same arc length: X, Y and
+// their derivatives with respect to s are those of the offset point, Kappa and KappaD are the curvature of the
+// offset curve and its derivative with respect to s, and the Theta channels are unchanged.  When fast is given,
+// X and Y themselves are approximated by it, while their derivatives stay exact.
+template <typename Curve>
+static void evaluate_point(
+    const Curve& self, G2lib::real_type s, G2lib::real_type offset, const std::vector<Channel>& channels,
+    G2lib::real_type* out, py::ssize_t stride, const FastPositions* fast = nullptr
+) {
+    G2lib::real_type xy[4][2];
+    bool done[4] = {false, false, false, false};
+    for (size_t q = 0; q < channels.size(); ++q) {
+        G2lib::real_type value = 0;
+        int c = channels[q];
+        if (c < CHANNEL_THETA) {
+            int order = c % 4;
+            if (!done[order]) {
+                if (order == 0 && fast && fast->eval(s, xy[0][0], xy[0][1])) {
+                    if (offset != 0) {
+                        G2lib::real_type theta = self.theta(s);
+                        xy[0][0] -= offset * std::sin(theta);
+                        xy[0][1] += offset * std::cos(theta);
+                    }
+                } else if (offset == 0) {
+                    switch (order) {
+                    case 0: self.eval(s, xy[0][0], xy[0][1]); break;
+                    case 1: self.eval_D(s, xy[1][0], xy[1][1]); break;
+                    case 2: self.eval_DD(s, xy[2][0], xy[2][1]); break;
+                    default: self.eval_DDD(s, xy[3][0], xy[3][1]); break;
+                    }
+                } else {
+                    switch (order) {
+                    case 0: self.eval_ISO(s, offset, xy[0][0], xy[0][1]); break;
+                    case 1: self.eval_ISO_D(s, offset, xy[1][0], xy[1][1]); break;
+                    case 2: self.eval_ISO_DD(s, offset, xy[2][0], xy[2][1]); break;
+                    default: self.eval_ISO_DDD(s, offset, xy[3][0], xy[3][1]); break;
+                    }
+                }
+                done[order] = true;
+            }
+            value = xy[order][c / 4];
+        } else {
+            switch (c) {
+            case CHANNEL_THETA: value = self.theta(s); break;
+            case CHANNEL_THETAD: value = self.theta_D(s); break;
+            case CHANNEL_THETADD: value = self.theta_DD(s); break;
+            case CHANNEL_THETADDD: value = self.theta_DDD(s); break;
+            case CHANNEL_KAPPA: {
+                G2lib::real_type kappa = self.theta_D(s);
+                value = offset == 0 ? kappa : kappa / (1 - offset * kappa);
+                break;
+            }
+            default: {
+                G2lib::real_type scale = offset == 0 ? 1 : 1 - offset * self.theta_D(s);
+                value = self.theta_DD(s) / (scale * scale);
+                break;
+            }
+            }
+        }
+        out[q * stride] = value;
+    }
+}
+
+// Lateral offsets given as a float shared by every point or as an array-like with one offset per point
+class Offsets {
+public:
+    Offsets(py::object offset, py::ssize_t n) : constant_(0), values_(nullptr) {
+        if (offset.is_none()) return;
+        if (!is_array_like(offset)) {
+            constant_ = offset.cast<G2lib::real_type>();
+            return;
+        }
+        array_ = as_real_array(offset, "offset");
+        if (array_.size() != n) {
+            throw py::value_error("offset must be a float or hold one offset per point");
+        }
+        values_ = array_.data();
+    }
+
+    G2lib::real_type operator[](py::ssize_t i) const { return values_ ? values_[i] : constant_; }
+
+    bool zero() const { return !values_ && constant_ == 0; }
+
+private:
+    G2lib::real_type constant_;
+    RealArray array_;
+    const G2lib::real_type* values_;
+};
+
+// Whether any of the channels is X or Y itself, the quantities that the fast precision mode approximates
+static bool needs_positions(const std::vector<Channel>& channels) {
+    return std::any_of(channels.begin(), channels.end(), [](Channel c) { return c == CHANNEL_X || c == CHANNEL_Y; });
+}
+
+// Evaluates several quantities at every arc length in one pass, on the offset curves given by offset.  A
+// positive tolerance selects the fast precision mode.
+template <typename Curve>
+static RealArray evaluate(
+    const Curve& self, py::object s, const std::vector<std::string>& quantities, py::object offset,
+    G2lib::real_type tolerance
+) {
+    std::vector<Channel> channels = parse_channels(quantities);
+    RealArray s_array = as_real_array(s, "s");
+    py::ssize_t n = s_array.size();
+    Offsets offsets(offset, n);
+    RealArray result = empty_like(s_array, {static_cast<py::ssize_t>(channels.size())});
+    const G2lib::real_type* in = s_array.data();
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        std::unique_ptr<FastPositions> fast;
+        if (needs_positions(channels)) fast = fast_positions(self, tolerance, n);
+        for (py::ssize_t i = 0; i < n; ++i) {
+            evaluate_point(self, in[i], offsets[i], channels, out + i, n, fast.get());
+        }
+    }
+    return result;
+}
+
+// The library builds the AABB trees of curves lazily, from inside const query methods, so two threads querying
+// the same curve for the first time would race on the tree.  Every entry point that releases the GIL builds the
+// tree it needs under a mutex of the curve first, after which the queries only read it.  All callers use the
+// default tree parameters with a zero offset, so a tree is never rebuilt once it exists.  The mutex is picked
+// from a fixed pool by the address of the curve, so calls on the same curve share one while calls on different
+// curves seldom wait on each other.
+static const std::size_t AABB_MUTEXES = 64;
+static std::mutex aabb_mutexes[AABB_MUTEXES];
+
+template <typename Curve>
+static void ensure_aabb_tree(const Curve& curve) {
+    std::uintptr_t address = reinterpret_cast<std::uintptr_t>(&curve) / sizeof(Curve);
+    std::lock_guard<std::mutex> lock(aabb_mutexes[address % AABB_MUTEXES]);
+    curve.build_AABBtree_ISO(0);
+}
+
+// Runs body(begin, end) over [0, n) split into contiguous chunks on up to num_threads threads, where a value
+// below 1 means one thread per hardware core.  The first exception raised by any chunk is rethrown.
+// Call without holding the GIL.
+template <typename Body>
+static void parallel_for(py::ssize_t n, int num_threads, Body body) {
+    if (num_threads < 1) {
+        num_threads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+    }
+    py::ssize_t nchunks = std::min<py::ssize_t>(num_threads, n);
+    if (nchunks <= 1) {
+        body(py::ssize_t(0), n);
+        return;
+    }
+    std::exception_ptr error;
+    std::mutex error_mutex;
+    auto run = [&](py::ssize_t chunk) {
+        try {
+            body(n * chunk / nchunks, n * (chunk + 1) / nchunks);
+        } catch (...) {
+            std::lock_guard<std::mutex> lock(error_mutex);
+            if (!error) error = std::current_exception();
+        }
+    };
+    std::vector<std::thread> workers;
+    for (py::ssize_t chunk = 1; chunk < nchunks; ++chunk) {
+        workers.emplace_back(run, chunk);
+    }
+    run(0);
+    for (std::thread& worker : workers) {
+        worker.join();
+    }
+    if (error) std::rethrow_exception(error);
+}
+
+// Returns a pointer to the data of a caller supplied output array after checking that it can hold `shape`
+static G2lib::real_type* checked_output(py::handle out, const std::vector<py::ssize_t>& shape) {
+    if (!py::isinstance<py::array_t<G2lib::real_type>>(out)) {
+        throw py::type_error("out must be a float64 numpy array");
+    }
+    py::array array = py::reinterpret_borrow<py::array>(out);
+    bool same_shape = array.ndim() == static_cast<py::ssize_t>(shape.size());
+    for (size_t i = 0; same_shape && i < shape.size(); ++i) {
+        same_shape = array.shape(i) == shape[i];
+    }
+    if (!same_shape) {
+        throw py::value_error("out does not have the expected shape");
+    }
+    if (!(array.flags() & py::array::c_style) || !array.writeable()) {
+        throw py::value_error("out must be a writeable C-contiguous array");
+    }
+    return static_cast<G2lib::real_type*>(array.mutable_data());
+}
+
+// Evaluates the curve at each of the n arc lengths in s, writing the X row then the Y row of a (2, n) block
+template <typename Curve>
+static void eval_xy(const Curve& self, const G2lib::real_type* s, py::ssize_t n, G2lib::real_type* out) {
+    for (py::ssize_t i = 0; i < n; ++i) {
+        self.eval(s[i], out[i], out[n + i]);
+    }
+}
+
+template <typename Curve>
+static py::object sample_xy(const Curve& self, py::ssize_t npts, py::object out, py::object offset, G2lib::real_type tolerance) {
+    if (npts < 0) {
+        throw py::value_error("npts must be non-negative");
+    }
+    Offsets offsets(offset, npts);
+    std::vector<py::ssize_t> shape = {2, npts};
+    G2lib::real_type* data;
+    if (out.is_none()) {
+        RealArray result(shape);
+        data = result.mutable_data();
+        out = std::move(result);
+    } else {
+        data = checked_output(out, shape);
+    }
+    {
+        py::gil_scoped_release release;
+        G2lib::real_type L = self.length();
+        G2lib::real_type step = L / std::max<py::ssize_t>(npts - 1, 1);
+        std::vector<G2lib::real_type> s(static_cast<size_t>(npts));
+        for (py::ssize_t i = 0; i < npts; ++i) {
+            s[i] = i * step;
+        }
+        if (npts > 1) s[npts - 1] = L;
+        std::unique_ptr<FastPositions> fast = fast_positions(self, tolerance, npts);
+        if (fast) {
+            for (py::ssize_t i = 0; i < npts; ++i) {
+                if (!fast->eval(s[i], data[i], data[npts + i])) {
+                    self.eval(s[i], data[i], data[npts + i]);
+                }
+                if (offsets[i] != 0) {
+                    G2lib::real_type theta = self.theta(s[i]);
+                    data[i] -= offsets[i] * std::sin(theta);
+                    data[npts + i] += offsets[i] * std::cos(theta);
+                }
+            }
+        } else if (offsets.zero()) {
+            eval_xy(self, s.data(), npts, data);
+        } else {
+            for (py::ssize_t i = 0; i < npts; ++i) {
+                self.eval_ISO(s[i], offsets[i], data[i], data[npts + i]);
+            }
+        }
+    }
+    return out;
+}
+
+// Arc lengths spaced so that neither the chord error nor the tangent angle change between neighbours exceeds
+// its bound.  Curvature is linear in s, so |kappa| over a step is bounded by its values at the step ends, and
+// the deviation between an arc of length ds and its chord is at most kappa_max * ds^2 / 8.
+// The most stations adaptive sampling places along one curve or list of curves, 160 MB of sampled points
+static const G2lib::real_type max_adaptive_stations = 1e7;
+
+// Estimates the number of stations adaptive_stations places along the curve, from the integrals of sqrt(|kappa|)
+// and |kappa| over its length, which the steps bounding the chord error and the angle step follow
+static G2lib::real_type adaptive_station_count(
+    const G2lib::ClothoidCurve& self, G2lib::real_type max_chord_error, G2lib::real_type max_angle_step) {
+    G2lib::real_type L = self.length(), k0 = self.kappaBegin(), dk = self.dkappa(), k1 = k0 + dk * L;
+    G2lib::real_type root, turn;
+    if (dk == 0) {
+        root = L * std::sqrt(std::abs(k0));
+        turn = L * std::abs(k0);
+    } else {
+        // antiderivatives of sqrt(|k|) and |k| over k, valid across a change of sign
+        auto sqrt_integral = [](G2lib::real_type k) { return std::copysign(2 * std::pow(std::abs(k), 1.5) / 3, k); };
+        root = (sqrt_integral(k1) - sqrt_integral(k0)) / dk;
+        turn = (k1 * std::abs(k1) - k0 * std::abs(k0)) / (2 * dk);
+    }
+    return 2 + root / std::sqrt(8 * max_chord_error) + turn / max_angle_step;
+}
+
+static void check_station_count(G2lib::real_type count) {
+    if (count > max_adaptive_stations) {
+        throw py::value_error(
+            "the tolerance requires about " + std::to_string(static_cast<long long>(count)) +
+            " points, more than the limit of " + std::to_string(static_cast<long long>(max_adaptive_stations))
+        );
+    }
+}
+
+static std::vector<G2lib::real_type> adaptive_stations(
+    const G2lib::ClothoidCurve& self, G2lib::real_type max_chord_error, G2lib::real_type max_angle_step) {
+    G2lib::real_type L = self.length();
+    // every step advances the arc length by at least this much, which keeps the loop finite where steps would
+    // fall below the resolution of doubles
+    G2lib::real_type min_step = 16 * std::numeric_limits<G2lib::real_type>::epsilon() * L;
+    std::vector<G2lib::real_type> s(1, 0.0);
+    G2lib::real_type si = 0;
+    while (si < L) {
+        if (s.size() > 2 * max_adaptive_stations) {
+            throw py::value_error("adaptive sampling did not reach the end of the curve");
+        }
+        G2lib::real_type ds = L - si;
+        G2lib::real_type kappa = std::abs(self.theta_D(si));
+        for (int pass = 0; pass < 2; ++pass) {
+            kappa = std::max(kappa, std::abs(self.theta_D(si + ds)));
+            if (kappa > 0) {
+                ds = std::min(ds, std::sqrt(8 * max_chord_error / kappa));
+                ds = std::min(ds, max_angle_step / kappa);
+            }
+        }
+        ds = std::max(ds, min_step);
+        // the last station lands exactly on the end of the curve
+        si = (L - (si + ds) <= ds * 1e-9) ? L : si + ds;
+        s.push_back(si);
+    }
+    return s;
+}
+
+static RealArray sample_adaptive(const G2lib::ClothoidCurve& self, G2lib::real_type max_chord_error, G2lib::real_type max_angle_step) {
+    if (!(max_chord_error > 0) || !(max_angle_step > 0)) {
+        throw py::value_error("max_chord_error and max_angle_step must be positive");
+    }
+    check_station_count(adaptive_station_count(self, max_chord_error, max_angle_step));
+    std::vector<G2lib::real_type> s;
+    {
+        py::gil_scoped_release release;
+        s = adaptive_stations(self, max_chord_error, max_angle_step);
+    }
+    py::ssize_t n = static_cast<py::ssize_t>(s.size());
+    RealArray result(std::vector<py::ssize_t>{2, n});
+    G2lib::real_type* data = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        eval_xy(self, s.data(), n, data);
+    }
+    return result;
+}
+
+// Projects every (X, Y) pair of a (2, ...) array onto the curve.  Returns a (4, ...) array holding the
+// projected x, projected y, arc length and signed distance (positive to the left of the curve) of each point.
+template <typename Curve>
+static RealArray project_points(const Curve& self, py::object xy, int num_threads) {
+    RealArray points = as_real_array(xy, "xy");
+    if (points.ndim() < 1 || points.shape(0) != 2) {
+        throw py::value_error("xy must have shape (2, ...)");
+    }
+    std::vector<py::ssize_t> shape(points.shape(), points.shape() + points.ndim());
+    shape[0] = 4;
+    RealArray result(shape);
+    py::ssize_t n = points.size() / 2;
+    const G2lib::real_type* qx = points.data();
+    const G2lib::real_type* qy = qx + n;
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        ensure_aabb_tree(self);
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                G2lib::real_type t;
+                self.closestPoint_ISO(qx[i], qy[i], 0.0, out[i], out[n + i], out[2 * n + i], t, out[3 * n + i]);
+                out[3 * n + i] = std::copysign(out[3 * n + i], t);
+            }
+        });
+    }
+    return result;
+}
+
+// Converts every (X, Y) pair of a (2, ...) array to Frenet coordinates along the curve.  Returns a (2, ...)
+// array holding the arc length and signed lateral offset (positive to the left of the curve) of each point, or
+// a (3, ...) array whose last row is the heading error when headings of the same shape as the points are given.
+// A point whose closest point is an end of the curve is measured along the tangent line extended past that end,
+// so its arc length falls outside [0, L] and from_frenet maps it back exactly.
+template <typename Curve>
+static RealArray to_frenet(const Curve& self, py::object xy, py::object theta, int num_threads) {
+    RealArray points = as_real_array(xy, "xy");
+    if (points.ndim() < 1 || points.shape(0) != 2) {
+        throw py::value_error("xy must have shape (2, ...)");
+    }
+    py::ssize_t n = points.size() / 2;
+    RealArray headings;
+    if (!theta.is_none()) {
+        headings = as_real_array(theta, "theta");
+        if (headings.size() != n) {
+            throw py::value_error("theta must hold one heading per point");
+        }
+    }
+    std::vector<py::ssize_t> shape(points.shape(), points.shape() + points.ndim());
+    shape[0] = theta.is_none() ? 2 : 3;
+    RealArray result(shape);
+    const G2lib::real_type* qx = points.data();
+    const G2lib::real_type* qy = qx + n;
+    const G2lib::real_type* qt = theta.is_none() ? nullptr : headings.data();
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        ensure_aabb_tree(self);
+        G2lib::real_type length = self.length();
+        G2lib::real_type x0, y0, x1, y1;
+        self.eval(0, x0, y0);
+        self.eval(length, x1, y1);
+        G2lib::real_type t0 = self.theta(0), t1 = self.theta(length);
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                G2lib::real_type x, y, s, t, dst, heading;
+                self.closestPoint_ISO(qx[i], qy[i], 0.0, x, y, s, t, dst);
+                G2lib::real_type along0 = (qx[i] - x0) * std::cos(t0) + (qy[i] - y0) * std::sin(t0);
+                G2lib::real_type along1 = (qx[i] - x1) * std::cos(t1) + (qy[i] - y1) * std::sin(t1);
+                if (s <= 0 && along0 < 0) {
+                    s = along0;
+                    dst = (qy[i] - y0) * std::cos(t0) - (qx[i] - x0) * std::sin(t0);
+                    heading = t0;
+                } else if (s >= length && along1 > 0) {
+                    s = length + along1;
+                    dst = (qy[i] - y1) * std::cos(t1) - (qx[i] - x1) * std::sin(t1);
+                    heading = t1;
+                } else {
+                    dst = std::copysign(dst, t);
+                    heading = qt ? self.theta(s) : 0;
+                }
+                out[i] = s;
+                out[n + i] = dst;
+                if (qt) {
+                    out[2 * n + i] = std::remainder(qt[i] - heading, 2 * G2lib::m_pi);
+                }
+            }
+        });
+    }
+    return result;
+}
+
+// Converts arc lengths and signed lateral offsets of the same shape back to a (2, ...) array of X and Y
+// coordinates, or to a (3, ...) array whose last row is the heading when heading errors are given.  Arc
+// lengths outside [0, L] are placed on the tangent line extended past the nearest end, inverting to_frenet.
+template <typename Curve>
+static RealArray from_frenet(const Curve& self, py::object s, py::object d, py::object heading_error, int num_threads) {
+    RealArray stations = as_real_array(s, "s");
+    RealArray offsets = as_real_array(d, "d");
+    py::ssize_t n = stations.size();
+    if (offsets.size() != n) {
+        throw py::value_error("s and d must have the same size");
+    }
+    RealArray errors;
+    if (!heading_error.is_none()) {
+        errors = as_real_array(heading_error, "heading_error");
+        if (errors.size() != n) {
+            throw py::value_error("heading_error must have the same size as s");
+        }
+    }
+    RealArray result = empty_like(stations, {heading_error.is_none() ? 2 : 3});
+    const G2lib::real_type* qs = stations.data();
+    const G2lib::real_type* qd = offsets.data();
+    const G2lib::real_type* qe = heading_error.is_none() ? nullptr : errors.data();
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        G2lib::real_type length = self.length();
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                G2lib::real_type station = std::min(std::max(qs[i], G2lib::real_type(0)), length);
+                G2lib::real_type x, y, heading = self.theta(station);
+                self.eval(station, x, y);
+                G2lib::real_type c = std::cos(heading), sn = std::sin(heading), beyond = qs[i] - station;
+                out[i] = x + beyond * c - qd[i] * sn;
+                out[n + i] = y + beyond * sn + qd[i] * c;
+                if (qe) {
+                    out[2 * n + i] = heading + qe[i];
+                }
+            }
+        });
+    }
+    return result;
+}
+
+// Appends the arc lengths in [s_begin, s_end] at which the tangent angle of cd equals target + m * period for
+// any integer m, in increasing order.  The angle is a quadratic in s, so each m contributes at most two roots.
+static void angle_roots(
+    const G2lib::ClothoidData& cd, G2lib::real_type s_begin, G2lib::real_type s_end, G2lib::real_type target,
+    G2lib::real_type period, std::vector<G2lib::real_type>& out
+) {
+    G2lib::real_type a = cd.dk / 2, b = cd.kappa0, tol = 1e-12 * (1 + std::abs(s_end));
+    G2lib::real_type lo = std::min(cd.theta(s_begin), cd.theta(s_end)), hi = std::max(cd.theta(s_begin), cd.theta(s_end));
+    if (a != 0 && -b / (2 * a) > s_begin && -b / (2 * a) < s_end) {
+        lo = std::min(lo, cd.theta(-b / (2 * a)));
+        hi = std::max(hi, cd.theta(-b / (2 * a)));
+    }
+    size_t first = out.size();
+    for (G2lib::real_type m = std::ceil((lo - target) / period - 1e-12); m <= std::floor((hi - target) / period + 1e-12); ++m) {
+        G2lib::real_type c = cd.theta0 - (target + m * period);
+        G2lib::real_type roots[2];
+        int count = 0;
+        if (a == 0 && b == 0) {
+            // A constant angle: the start of the interval stands for all of it
+            if (std::abs(c) <= 1e-12) roots[count++] = s_begin;
+        } else if (std::abs(a) * std::max(std::abs(s_begin), std::abs(s_end)) <= 1e-14 * std::abs(b)) {
+            roots[count++] = -c / b;
+        } else {
+            G2lib::real_type disc = b * b - 4 * a * c;
+            if (disc < 0) {
+                if (disc < -1e-12 * b * b) continue;
+                disc = 0;
+            }
+            // The numerically stable form of the quadratic formula
+            G2lib::real_type q = -(b + std::copysign(std::sqrt(disc), b)) / 2;
+            roots[count++] = q / a;
+            if (q != 0) roots[count++] = c / q;
+        }
+        for (int k = 0; k < count; ++k) {
+            if (roots[k] >= s_begin - tol && roots[k] <= s_end + tol) {
+                out.push_back(std::min(std::max(roots[k], s_begin), s_end));
+            }
+        }
+    }
+    std::sort(out.begin() + first, out.end());
+}
+
+// Appends the arc lengths in [s_begin, s_end] at which nx * X + ny * Y of cd equals target, where (nx, ny) is a
+// unit vector, so that the points lie on a line.  The projection onto (nx, ny) is monotonic between the arc
+// lengths at which the tangent is perpendicular to (nx, ny), which are found analytically, so each root is
+// bracketed and found by Newton steps safeguarded by bisection.
+static void line_roots(
+    const G2lib::ClothoidData& cd, G2lib::real_type s_begin, G2lib::real_type s_end, G2lib::real_type nx,
+    G2lib::real_type ny, G2lib::real_type target, std::vector<G2lib::real_type>& out
+) {
+    auto f = [&](G2lib::real_type s) {
+        G2lib::real_type x, y;
+        cd.eval(s, x, y);
+        return nx * x + ny * y - target;
+    };
+    auto df = [&](G2lib::real_type s) { return nx * std::cos(cd.theta(s)) + ny * std::sin(cd.theta(s)); };
+    std::vector<G2lib::real_type> breaks{s_begin};
+    angle_roots(cd, s_begin, s_end, std::atan2(ny, nx) + G2lib::m_pi_2, G2lib::m_pi, breaks);
+    breaks.push_back(s_end);
+    G2lib::real_type scale = 1 + std::abs(s_end), tol = 1e-12 * (scale + std::abs(target));
+    G2lib::real_type fa = f(s_begin);
+    if (std::abs(fa) <= tol) out.push_back(s_begin);
+    for (size_t i = 0; i + 1 < breaks.size(); ++i) {
+        G2lib::real_type a = breaks[i], b = breaks[i + 1], fb = f(b);
+        if (b > a && std::abs(fa) > tol && std::abs(fb) > tol && (fa < 0) != (fb < 0)) {
+            G2lib::real_type lo = a, hi = b, s = (a + b) / 2, flo = fa;
+            for (int iter = 0; iter < 100; ++iter) {
+                G2lib::real_type fs = f(s);
+                if ((fs < 0) == (flo < 0)) {
+                    lo = s;
+                    flo = fs;
+                } else {
+                    hi = s;
+                }
+                G2lib::real_type d = df(s), next = d != 0 ? s - fs / d : lo;
+                if (!(next > lo && next < hi)) next = (lo + hi) / 2;
+                if (std::abs(next - s) <= 1e-13 * scale || hi - lo <= 1e-13 * scale) {
+                    s = next;
+                    break;
+                }
+                s = next;
+            }
+            out.push_back(s);
+        }
+        // A projection that is zero at both ends of a monotonic piece is constant over it
+        if (std::abs(fb) <= tol && std::abs(fa) > tol) out.push_back(b);
+        fa = fb;
+    }
+}
+
+typedef std::array<G2lib::real_type, 8> TriangleRow;
+
+// Appends a triangle that contains every point within w of cd between the arc lengths u and v, over which the
+// curvature keeps its sign and the tangent turns by at most a right angle, so that the arc lies inside the
+// triangle formed by its chord and its end tangents.  In a frame whose x axis runs along the chord, with the
+// arc below it, each side of the result is a line {q : n . q <= h(n)} whose offset h(n) bounds n . q over that
+// triangle plus w.  The sides are at least as steep as the end tangents, and steep enough that a band around
+// a nearly straight arc does not stretch the triangle far past the ends of the chord.
+static void band_triangle(
+    const G2lib::ClothoidData& cd, G2lib::real_type u, G2lib::real_type v, G2lib::real_type w, G2lib::real_type s_begin,
+    std::vector<TriangleRow>& out
+) {
+    G2lib::real_type x0, y0, x1, y1;
+    cd.eval(u, x0, y0);
+    cd.eval(v, x1, y1);
+    G2lib::real_type t0 = cd.theta(u), t1 = cd.theta(v), turn = t1 - t0;
+    G2lib::real_type chord = std::hypot(x1 - x0, y1 - y0);
+    G2lib::real_type ex = chord > 0 ? (x1 - x0) / chord : std::cos(t0), ey = chord > 0 ? (y1 - y0) / chord : std::sin(t0);
+    G2lib::real_type side = turn >= 0 ? 1 : -1;
+    // The frame: x along the chord, y away from the arc
+    auto local = [&](G2lib::real_type px, G2lib::real_type py, G2lib::real_type& lx, G2lib::real_type& ly) {
+        lx = (px - x0) * ex + (py - y0) * ey;
+        ly = side * ((py - y0) * ex - (px - x0) * ey);
+    };
+    G2lib::real_type cx = chord / 2, cy = 0;
+    G2lib::real_type det = std::cos(t0) * std::sin(t1) - std::sin(t0) * std::cos(t1);
+    if (std::abs(turn) > 1e-12 && det != 0) {
+        G2lib::real_type a = ((x1 - x0) * std::sin(t1) - (y1 - y0) * std::cos(t1)) / det;
+        local(x0 + a * std::cos(t0), y0 + a * std::sin(t0), cx, cy);
+    }
+    G2lib::real_type steep = std::atan2(4 * w, chord);
+    G2lib::real_type a0 = std::max({std::abs(std::atan2(side * (std::sin(t0) * ex - std::cos(t0) * ey), std::cos(t0) * ex + std::sin(t0) * ey)), steep, G2lib::real_type(1e-9)});
+    G2lib::real_type a1 = std::max({std::abs(std::atan2(side * (std::sin(t1) * ex - std::cos(t1) * ey), std::cos(t1) * ex + std::sin(t1) * ey)), steep, G2lib::real_type(1e-9)});
+    a0 = std::min(a0, G2lib::m_pi_2);
+    a1 = std::min(a1, G2lib::m_pi_2);
+    G2lib::real_type n[3][2] = {{0, 1}, {-std::sin(a0), -std::cos(a0)}, {std::sin(a1), -std::cos(a1)}};
+    G2lib::real_type h[3];
+    for (int k = 0; k < 3; ++k) {
+        h[k] = std::max({G2lib::real_type(0), n[k][0] * chord, n[k][0] * cx + n[k][1] * cy}) + w;
+    }
+    TriangleRow row;
+    const int corners[3][2] = {{0, 1}, {1, 2}, {2, 0}};
+    for (int k = 0; k < 3; ++k) {
+        const G2lib::real_type* p = n[corners[k][0]];
+        const G2lib::real_type* q = n[corners[k][1]];
+        G2lib::real_type d = p[0] * q[1] - p[1] * q[0];
+        G2lib::real_type lx = (h[corners[k][0]] * q[1] - p[1] * h[corners[k][1]]) / d;
+        G2lib::real_type ly = (p[0] * h[corners[k][1]] - h[corners[k][0]] * q[0]) / d;
+        row[2 * k] = x0 + lx * ex - side * ly * ey;
+        row[2 * k + 1] = y0 + lx * ey + side * ly * ex;
+    }
+    row[6] = s_begin + u;
+    row[7] = s_begin + v;
+    out.push_back(row);
+}
+
+// Appends triangles covering the band of half width w around cd over [0, length].  The curve is split at its
+// inflection point, then into arcs that turn by at most max_angle, which is capped at a right angle, and
+// finally into arcs no longer than max_size.
+static void band_triangles(
+    const G2lib::ClothoidData& cd, G2lib::real_type length, G2lib::real_type max_angle, G2lib::real_type max_size,
+    G2lib::real_type w, G2lib::real_type s_begin, std::vector<TriangleRow>& out
+) {
+    max_angle = std::min(max_angle, G2lib::m_pi_2);
+    std::vector<G2lib::real_type> breaks{0};
+    G2lib::real_type inflection = cd.dk != 0 ? -cd.kappa0 / cd.dk : -1;
+    if (inflection > 0 && inflection < length) breaks.push_back(inflection);
+    breaks.push_back(length);
+    std::vector<G2lib::real_type> stations;
+    for (size_t i = 0; i + 1 < breaks.size(); ++i) {
+        G2lib::real_type a = breaks[i], b = breaks[i + 1], turn = cd.theta(b) - cd.theta(a);
+        G2lib::real_type pieces = std::max(G2lib::real_type(1), std::ceil(std::abs(turn) / max_angle - 1e-12));
+        stations.assign(1, a);
+        for (G2lib::real_type k = 1; k < pieces; ++k) {
+            // The angle is monotonic between a and b, so each intermediate angle is reached once
+            angle_roots(cd, a, b, cd.theta(a) + k * turn / pieces, 4 * std::abs(turn) + 1, stations);
+        }
+        stations.push_back(b);
+        std::sort(stations.begin(), stations.end());
+        for (size_t j = 0; j + 1 < stations.size(); ++j) {
+            G2lib::real_type u = stations[j], v = stations[j + 1];
+            if (!(v > u)) continue;
+            G2lib::real_type parts = std::max(G2lib::real_type(1), std::ceil((v - u) / max_size - 1e-12));
+            for (G2lib::real_type k = 0; k < parts; ++k) {
+                band_triangle(cd, u + (v - u) * k / parts, k + 1 < parts ? u + (v - u) * (k + 1) / parts : v, w, s_begin, out);
+            }
+        }
+    }
+}
+
+// Grows box (xmin, ymin, xmax, ymax) to contain every point within w of cd over [0, length], measured along
+// the normals.  A point at a fixed arc length moves linearly with the lateral offset, so the extremes lie on the
+// offset curves at -w and w, where they are found at the ends, where the tangent is parallel to an axis, or
+// where the offset curve has a cusp, at a curvature of 1 / w.
+static void band_box(const G2lib::ClothoidData& cd, G2lib::real_type length, G2lib::real_type w, G2lib::real_type* box) {
+    std::vector<G2lib::real_type> stations{0, length};
+    angle_roots(cd, 0, length, 0, G2lib::m_pi_2, stations);
+    if (w > 0 && cd.dk != 0) {
+        for (G2lib::real_type kappa : {1 / w, -1 / w}) {
+            G2lib::real_type s = (kappa - cd.kappa0) / cd.dk;
+            if (s > 0 && s < length) stations.push_back(s);
+        }
+    }
+    for (G2lib::real_type s : stations) {
+        for (G2lib::real_type t : {-w, w}) {
+            G2lib::real_type x, y;
+            cd.eval_ISO(s, t, x, y);
+            box[0] = std::min(box[0], x);
+            box[1] = std::min(box[1], y);
+            box[2] = std::max(box[2], x);
+            box[3] = std::max(box[3], y);
+        }
+    }
+}
+
+static void check_cover(G2lib::real_type max_angle, G2lib::real_type max_size, G2lib::real_type offset) {
+    if (!(max_angle > 0) || !(max_size > 0)) {
+        throw py::value_error("max_angle and max_size must be positive");
+    }
+    if (!(offset >= 0)) {
+        throw py::value_error("offset must be non-negative");
+    }
+}
+
+static RealArray triangle_rows(const std::vector<TriangleRow>& rows) {
+    RealArray result(std::vector<py::ssize_t>{static_cast<py::ssize_t>(rows.size()), 8});
+    G2lib::real_type* out = result.mutable_data();
+    for (const TriangleRow& row : rows) out = std::copy(row.begin(), row.end(), out);
+    return result;
+}
+
+// Triangles covering the band of half width offset around the curve, as rows x1, y1, x2, y2, x3, y3, s0, s1
+// where [s0, s1] is the range of arc lengths each triangle covers
+template <typename Curve>
+static RealArray bounding_triangles(const Curve& self, G2lib::real_type max_angle, G2lib::real_type max_size, G2lib::real_type offset) {
+    check_cover(max_angle, max_size, offset);
+    std::vector<Segment> segments = curve_segments(self);
+    std::vector<TriangleRow> rows;
+    {
+        py::gil_scoped_release release;
+        for (const Segment& segment : segments) {
+            band_triangles(segment.data, segment.length, max_angle, max_size, offset, segment.s_begin, rows);
+        }
+    }
+    return triangle_rows(rows);
+}
+
+template <typename Curve>
+static std::tuple<G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type> bounding_box(const Curve& self, G2lib::real_type offset) {
+    check_cover(1, 1, offset);
+    G2lib::real_type inf = std::numeric_limits<G2lib::real_type>::infinity(), box[4] = {inf, inf, -inf, -inf};
+    for (const Segment& segment : curve_segments(self)) {
+        band_box(segment.data, segment.length, offset, box);
+    }
+    return std::make_tuple(box[0], box[1], box[2], box[3]);
+}
+
+// Finds every arc length at which a quantity of the curve equals each of the values.  Theta is matched modulo
+// 2 pi and Kappa, which is linear in s, is solved directly.  Returns a tuple of the index of the value in the
+// flattened values and the arc length of each root, grouped by value with increasing arc lengths.  Where the
+// quantity equals a value over a whole interval, only the start of the interval is returned.
+template <typename Curve>
+static py::tuple solve_for(const Curve& self, const std::string& quantity, py::object values, int num_threads) {
+    int kind;
+    if (quantity == "X") kind = 0;
+    else if (quantity == "Y") kind = 1;
+    else if (quantity == "Theta") kind = 2;
+    else if (quantity == "Kappa") kind = 3;
+    else throw py::value_error("quantity must be one of 'X', 'Y', 'Theta' or 'Kappa', not '" + quantity + "'");
+    RealArray targets = as_real_array(values, "values");
+    py::ssize_t n = targets.size();
+    const G2lib::real_type* v = targets.data();
+    std::vector<Segment> segments = curve_segments(self);
+    std::vector<std::vector<G2lib::real_type>> roots(n);
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            std::vector<G2lib::real_type> local;
+            for (py::ssize_t i = begin; i < end; ++i) {
+                for (const Segment& segment : segments) {
+                    const G2lib::ClothoidData& cd = segment.data;
+                    local.clear();
+                    if (kind < 2) {
+                        line_roots(cd, 0, segment.length, kind == 0, kind == 1, v[i], local);
+                    } else if (kind == 2) {
+                        angle_roots(cd, 0, segment.length, v[i], 2 * G2lib::m_pi, local);
+                    } else if (cd.dk != 0) {
+                        G2lib::real_type s = (v[i] - cd.kappa0) / cd.dk, tol = 1e-12 * (1 + segment.length);
+                        if (s >= -tol && s <= segment.length + tol) {
+                            local.push_back(std::min(std::max(s, G2lib::real_type(0)), segment.length));
+                        }
+                    } else if (cd.kappa0 == v[i]) {
+                        local.push_back(0);
+                    }
+                    for (G2lib::real_type s : local) {
+                        s += segment.s_begin;
+                        // A root at a junction is found on both sides of it
+                        if (roots[i].empty() || s - roots[i].back() > 1e-12 * (1 + segment.s_begin + segment.length)) {
+                            roots[i].push_back(s);
+                        }
+                    }
+                }
+            }
+        });
+    }
+    py::ssize_t total = 0;
+    for (const std::vector<G2lib::real_type>& r : roots) total += static_cast<py::ssize_t>(r.size());
+    py::array_t<py::ssize_t> index(total);
+    RealArray s(total);
+    py::ssize_t* out_index = index.mutable_data();
+    G2lib::real_type* out_s = s.mutable_data();
+    for (py::ssize_t i = 0; i < n; ++i) {
+        for (G2lib::real_type root : roots[i]) {
+            *out_index++ = i;
+            *out_s++ = root;
+        }
+    }
+    return py::make_tuple(index, s);
+}
+
+// Appends the vertices of a polyline that follows the curve within max_chord_error, at the adaptive stations
+// used by sample_adaptive.  Steps never turn by more than a right angle, for which the chord error bound of
+// adaptive_stations holds.  The first vertex is skipped when skip_first is set, to join consecutive segments.
+static void append_polyline(
+    const G2lib::ClothoidCurve& curve, G2lib::real_type max_chord_error, bool skip_first,
+    std::vector<G2lib::real_type>& x, std::vector<G2lib::real_type>& y
+) {
+    std::vector<G2lib::real_type> s = adaptive_stations(curve, max_chord_error, G2lib::m_pi_2);
+    for (size_t i = skip_first ? 1 : 0; i < s.size(); ++i) {
+        G2lib::real_type xi, yi;
+        curve.eval(s[i], xi, yi);
+        x.push_back(xi);
+        y.push_back(yi);
+    }
+}
+
+static RealArray stack_xy(const std::vector<G2lib::real_type>& x, const std::vector<G2lib::real_type>& y) {
+    py::ssize_t n = static_cast<py::ssize_t>(x.size());
+    RealArray result(std::vector<py::ssize_t>{2, n});
+    std::copy(x.begin(), x.end(), result.mutable_data());
+    std::copy(y.begin(), y.end(), result.mutable_data() + n);
+    return result;
+}
+
+static void check_tolerance(G2lib::real_type tol) {
+    if (!(tol > 0)) {
+        throw py::value_error("tol must be positive");
+    }
+}
+
+// Returns the (2, N) vertices of a polyline that deviates from the curve by at most tol
+static RealArray to_polyline(const G2lib::ClothoidCurve& self, G2lib::real_type tol) {
+    check_tolerance(tol);
+    check_station_count(adaptive_station_count(self, tol, G2lib::m_pi_2));
+    std::vector<G2lib::real_type> x, y;
+    {
+        py::gil_scoped_release release;
+        append_polyline(self, tol, false, x, y);
+    }
+    return stack_xy(x, y);
+}
+
+static RealArray list_to_polyline(const G2lib::ClothoidList& self, G2lib::real_type tol) {
+    check_tolerance(tol);
+    G2lib::real_type count = 0;
+    for (G2lib::int_type i = 0; i < self.numSegment(); ++i) {
+        count += adaptive_station_count(self.get(i), tol, G2lib::m_pi_2);
+    }
+    check_station_count(count);
+    std::vector<G2lib::real_type> x, y;
+    {
+        py::gil_scoped_release release;
+        for (G2lib::int_type i = 0; i < self.numSegment(); ++i) {
+            append_polyline(self.get(i), tol, i > 0, x, y);
+        }
+    }
+    return stack_xy(x, y);
+}
+
+static G2lib::PolyLine make_polyline(py::object xy) {
+    RealArray points = as_real_array(xy, "xy");
+    if (points.ndim() != 2 || points.shape(0) != 2 || points.shape(1) < 2) {
+        throw py::value_error("xy must have shape (2, N) with N >= 2");
+    }
+    G2lib::PolyLine polyline;
+    polyline.build(points.data(), points.data() + points.shape(1), static_cast<G2lib::int_type>(points.shape(1)));
+    return polyline;
+}
+
+static RealArray polyline_vertices(const G2lib::PolyLine& self) {
+    std::vector<G2lib::real_type> x(self.numPoints()), y(self.numPoints());
+    self.polygon(x.data(), y.data());
+    return stack_xy(x, y);
+}
+
+// The edges of a polyline as start points, unit directions, lengths and arc lengths of the start points
+struct Edges {
+    std::vector<G2lib::real_type> x, y, ux, uy, length, s;
+
+    explicit Edges(const G2lib::PolyLine& polyline) : x(polyline.numPoints()), y(polyline.numPoints()) {
+        polyline.polygon(x.data(), y.data());
+        G2lib::real_type station = 0;
+        for (size_t k = 0; k + 1 < x.size(); ++k) {
+            G2lib::real_type dx = x[k + 1] - x[k], dy = y[k + 1] - y[k], d = std::hypot(dx, dy);
+            ux.push_back(d > 0 ? dx / d : 1);
+            uy.push_back(d > 0 ? dy / d : 0);
+            length.push_back(d);
+            s.push_back(station);
+            station += d;
+        }
+    }
+
+    // Closest point of the polyline to (qx, qy).  PolyLine::closestPoint_ISO is not used, since the distances
+    // it reports for points beside an edge are wrong.
+    void project(G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type& px, G2lib::real_type& py, G2lib::real_type& ps, G2lib::real_type& dst) const {
+        // every output stays NaN when no edge is closer than infinity, as for a NaN query
+        px = py = ps = dst = std::numeric_limits<G2lib::real_type>::quiet_NaN();
+        G2lib::real_type best = std::numeric_limits<G2lib::real_type>::infinity();
+        for (size_t k = 0; k < length.size(); ++k) {
+            G2lib::real_type along = std::min(std::max((qx - x[k]) * ux[k] + (qy - y[k]) * uy[k], G2lib::real_type(0)), length[k]);
+            G2lib::real_type cx = x[k] + along * ux[k], cy = y[k] + along * uy[k], d = std::hypot(qx - cx, qy - cy);
+            if (d < best) {
+                dst = best = d;
+                px = cx;
+                py = cy;
+                ps = s[k] + along;
+            }
+        }
+    }
+
+    void build_tree(G2lib::AABBtree& tree) const {
+        std::vector<G2lib::AABBtree::PtrBBox> boxes;
+        for (size_t k = 0; k < length.size(); ++k) {
+            boxes.push_back(std::make_shared<G2lib::BBox const>(
+                std::min(x[k], x[k + 1]), std::min(y[k], y[k + 1]), std::max(x[k], x[k + 1]), std::max(y[k], y[k + 1]), 0,
+                static_cast<G2lib::int_type>(k)
+            ));
+        }
+        tree.build(boxes);
+    }
+};
+
+typedef std::vector<std::pair<G2lib::real_type, G2lib::real_type>> ArcLengthPairs;
+
+// Removes the pairs that repeat the previous pair up to tol, such as a crossing through a vertex, which is
+// found on both edges that meet there
+static void unique_pairs(ArcLengthPairs& pairs, G2lib::real_type tol) {
+    std::sort(pairs.begin(), pairs.end());
+    pairs.erase(
+        std::unique(pairs.begin(), pairs.end(), [tol](const std::pair<G2lib::real_type, G2lib::real_type>& a, const std::pair<G2lib::real_type, G2lib::real_type>& b) {
+            return std::abs(a.first - b.first) <= tol && std::abs(a.second - b.second) <= tol;
+        }),
+        pairs.end()
+    );
+}
+
+// Intersections between two polylines as pairs of arc lengths along each, ordered along the first.  Pairs of
+// edges whose boxes overlap are found with AABB trees and intersected exactly.  PolyLine::intersect is not
+// used, since it reports spurious intersections between long runs of short edges.  Overlapping parallel
+// edges do not count as intersecting.
+static ArcLengthPairs polyline_intersect(const G2lib::PolyLine& self, const G2lib::PolyLine& other, bool first_only) {
+    ArcLengthPairs result;
+    {
+        py::gil_scoped_release release;
+        Edges a(self), b(other);
+        G2lib::AABBtree tree_a, tree_b;
+        a.build_tree(tree_a);
+        b.build_tree(tree_b);
+        G2lib::AABBtree::VecPairPtrBBox candidates;
+        tree_a.intersect(tree_b, candidates);
+        G2lib::real_type tol = 1e-12;
+        for (const G2lib::AABBtree::PairPtrBBox& candidate : candidates) {
+            size_t i = static_cast<size_t>(candidate.first->Ipos()), j = static_cast<size_t>(candidate.second->Ipos());
+            G2lib::real_type rx = a.ux[i] * a.length[i], ry = a.uy[i] * a.length[i];
+            G2lib::real_type wx = b.ux[j] * b.length[j], wy = b.uy[j] * b.length[j];
+            G2lib::real_type denom = rx * wy - ry * wx;
+            if (std::abs(denom) <= tol * a.length[i] * b.length[j]) continue;
+            G2lib::real_type qx = b.x[j] - a.x[i], qy = b.y[j] - a.y[i];
+            G2lib::real_type t = (qx * wy - qy * wx) / denom, u = (qx * ry - qy * rx) / denom;
+            if (t >= -tol && t <= 1 + tol && u >= -tol && u <= 1 + tol) {
+                t = std::min(std::max(t, G2lib::real_type(0)), G2lib::real_type(1));
+                u = std::min(std::max(u, G2lib::real_type(0)), G2lib::real_type(1));
+                result.emplace_back(a.s[i] + t * a.length[i], b.s[j] + u * b.length[j]);
+                if (first_only) break;
+            }
+        }
+        unique_pairs(result, 1e-10 * (1 + self.length() + other.length()));
+    }
+    return result;
+}
+
+// Intersections between a polyline and a clothoid as pairs of arc lengths along each, ordered along the
+// polyline.  Each edge is only tested against the arcs of the clothoid whose bounding boxes it overlaps, and
+// the clothoid crosses the line of an edge where a projection of it vanishes, which line_roots solves.
+static ArcLengthPairs polyline_intersect_clothoid(
+    const G2lib::PolyLine& self, const G2lib::ClothoidCurve& curve
+) {
+    ArcLengthPairs result;
+    {
+        py::gil_scoped_release release;
+        Edges edges(self);
+        G2lib::ClothoidCurve fresh(curve.xBegin(), curve.yBegin(), curve.thetaBegin(), curve.kappaBegin(), curve.dkappa(), curve.length());
+        std::vector<G2lib::Triangle2D> triangles;
+        fresh.bbTriangles_ISO(0, triangles, G2lib::m_pi / 18, 1e100);
+        G2lib::ClothoidData cd = curve_data(curve);
+        G2lib::real_type tol = 1e-10 * (1 + curve.length());
+        std::vector<G2lib::real_type> roots;
+        for (size_t k = 0; k < edges.length.size(); ++k) {
+            G2lib::real_type ex0 = std::min(edges.x[k], edges.x[k + 1]), ex1 = std::max(edges.x[k], edges.x[k + 1]);
+            G2lib::real_type ey0 = std::min(edges.y[k], edges.y[k + 1]), ey1 = std::max(edges.y[k], edges.y[k + 1]);
+            roots.clear();
+            for (const G2lib::Triangle2D& t : triangles) {
+                G2lib::real_type bx0, by0, bx1, by1;
+                t.bbox(bx0, by0, bx1, by1);
+                if (bx0 > ex1 || bx1 < ex0 || by0 > ey1 || by1 < ey0) continue;
+                // The normal of the edge, so that the projection of the clothoid on it is constant along the edge
+                G2lib::real_type nx = -edges.uy[k], ny = edges.ux[k];
+                line_roots(cd, t.S0(), t.S1(), nx, ny, nx * edges.x[k] + ny * edges.y[k], roots);
+            }
+            std::sort(roots.begin(), roots.end());
+            G2lib::real_type last = -std::numeric_limits<G2lib::real_type>::infinity();
+            for (G2lib::real_type s : roots) {
+                // A root on the boundary of two arcs is found twice
+                if (s - last <= tol) continue;
+                last = s;
+                G2lib::real_type x, y;
+                cd.eval(s, x, y);
+                G2lib::real_type along = (x - edges.x[k]) * edges.ux[k] + (y - edges.y[k]) * edges.uy[k];
+                if (along >= -tol && along <= edges.length[k] + tol) {
+                    result.emplace_back(edges.s[k] + std::min(std::max(along, G2lib::real_type(0)), edges.length[k]), s);
+                }
+            }
+        }
+        unique_pairs(result, tol);
+    }
+    return result;
+}
+
+// Minimum distance between a polyline and a clothoid, with the arc lengths of the closest points along each.
+// The distance between two curves is smallest where they intersect, at an end or vertex of one of them, or
+// between interior points at which their tangents are parallel, so every candidate is checked: the vertices
+// projected onto the clothoid, the ends of the clothoid projected onto the polyline, and the points of the
+// clothoid whose tangent is parallel to an edge, found in closed form by angle_roots.
+static std::tuple<G2lib::real_type, G2lib::real_type, G2lib::real_type> polyline_distance_to_clothoid(
+    const G2lib::PolyLine& self, const G2lib::ClothoidCurve& curve
+) {
+    ArcLengthPairs crossings = polyline_intersect_clothoid(self, curve);
+    if (!crossings.empty()) {
+        return std::make_tuple(G2lib::real_type(0), crossings[0].first, crossings[0].second);
+    }
+    py::gil_scoped_release release;
+    ensure_aabb_tree(curve);
+    Edges edges(self);
+    G2lib::ClothoidData cd = curve_data(curve);
+    G2lib::real_type best = std::numeric_limits<G2lib::real_type>::infinity(), best_p = 0, best_c = 0;
+    auto consider = [&](G2lib::real_type d, G2lib::real_type s_p, G2lib::real_type s_c) {
+        if (d < best) {
+            best = d;
+            best_p = s_p;
+            best_c = s_c;
+        }
+    };
+    for (size_t k = 0; k < edges.x.size(); ++k) {
+        G2lib::real_type x, y, s, t, d;
+        curve.closestPoint_ISO(edges.x[k], edges.y[k], 0.0, x, y, s, t, d);
+        consider(d, k < edges.s.size() ? edges.s[k] : self.length(), s);
+    }
+    for (G2lib::real_type s_c : {G2lib::real_type(0), curve.length()}) {
+        G2lib::real_type qx, qy, x, y, s, d;
+        cd.eval(s_c, qx, qy);
+        edges.project(qx, qy, x, y, s, d);
+        consider(d, s, s_c);
+    }
+    std::vector<G2lib::real_type> parallel;
+    for (size_t k = 0; k < edges.length.size(); ++k) {
+        parallel.clear();
+        angle_roots(cd, 0, curve.length(), std::atan2(edges.uy[k], edges.ux[k]), G2lib::m_pi, parallel);
+        for (G2lib::real_type s_c : parallel) {
+            G2lib::real_type x, y;
+            cd.eval(s_c, x, y);
+            G2lib::real_type along = (x - edges.x[k]) * edges.ux[k] + (y - edges.y[k]) * edges.uy[k];
+            if (along > 0 && along < edges.length[k]) {
+                consider(std::abs((y - edges.y[k]) * edges.ux[k] - (x - edges.x[k]) * edges.uy[k]), edges.s[k] + along, s_c);
+            }
+        }
+    }
+    return std::make_tuple(best, best_p, best_c);
+}
+
+// Index of the segment holding each arc length, found by binary search over the segment start stations
+static py::object find_segment(const G2lib::ClothoidList& self, py::object s) {
+    if (self.numSegment() == 0) {
+        throw py::index_error("The clothoid list is empty");
+    }
+    if (!is_array_like(s)) {
+        return py::int_(self.findAtS(s.cast<G2lib::real_type>()));
+    }
+    RealArray s_array = as_real_array(s, "s");
+    py::array_t<G2lib::int_type> result(std::vector<py::ssize_t>(s_array.shape(), s_array.shape() + s_array.ndim()));
+    const G2lib::real_type* in = s_array.data();
+    G2lib::int_type* out = result.mutable_data();
+    py::ssize_t n = s_array.size();
+    {
+        py::gil_scoped_release release;
+        for (py::ssize_t i = 0; i < n; ++i) {
+            out[i] = self.findAtS(in[i]);
+        }
+    }
+    return std::move(result);
+}
+
+// Arc lengths at which each segment starts, followed by the total length
+static RealArray segment_stations(const G2lib::ClothoidList& self) {
+    G2lib::int_type n = self.numSegment();
+    RealArray result(std::vector<py::ssize_t>{n + 1});
+    G2lib::real_type* out = result.mutable_data();
+    out[0] = 0;
+    for (G2lib::int_type i = 0; i < n; ++i) {
+        out[i + 1] = out[i] + self.get(i).length();
+    }
+    return result;
+}
+
+// Checks that rows is a 2d array with ncols columns and returns it as a contiguous float64 array
+static RealArray as_rows(py::handle rows, py::ssize_t ncols, const char* name) {
+    RealArray result = as_real_array(rows, name);
+    if (result.ndim() != 2 || result.shape(1) != ncols) {
+        throw py::value_error(std::string(name) + " must have shape (N, " + std::to_string(ncols) + ")");
+    }
+    return result;
+}
+
+// Writes the six StandardParams of a curve: x0, y0, t0, k0, dk, L
+static void store_parameters(const G2lib::ClothoidCurve& c, G2lib::real_type* out) {
+    out[0] = c.xBegin();
+    out[1] = c.yBegin();
+    out[2] = c.thetaBegin();
+    out[3] = c.kappaBegin();
+    out[4] = c.dkappa();
+    out[5] = c.length();
+}
+
+// Solves one G2 problem per row of (x0, y0, t0, k0, x1, y1, t1, k1, Dmax, dmax).  Returns the (N, 3, 6)
+// parameters of the three arcs and the Newton iteration count of each problem, which is -1 (with NaN
+// parameters) when the solver fails.
+static py::tuple solve_g2_batch(py::object problems, int num_threads) {
+    RealArray rows = as_rows(problems, 10, "problems");
+    py::ssize_t n = rows.shape(0);
+    RealArray parameters(std::vector<py::ssize_t>{n, 3, 6});
+    py::array_t<int> iterations(std::vector<py::ssize_t>{n});
+    const G2lib::real_type* in = rows.data();
+    G2lib::real_type* out = parameters.mutable_data();
+    int* iters = iterations.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            G2lib::G2solve3arc solver;
+            for (py::ssize_t i = begin; i < end; ++i) {
+                const G2lib::real_type* p = in + 10 * i;
+                G2lib::real_type* q = out + 18 * i;
+                iters[i] = solver.build(p[0], p[1], p[2], p[3], p[4], p[5], p[6], p[7], p[8], p[9]);
+                if (iters[i] < 0) {
+                    std::fill(q, q + 18, std::numeric_limits<G2lib::real_type>::quiet_NaN());
+                    continue;
+                }
+                store_parameters(solver.getS0(), q);
+                store_parameters(solver.getSM(), q + 6);
+                store_parameters(solver.getS1(), q + 12);
+            }
+        });
+    }
+    return py::make_tuple(parameters, iterations);
+}
+
+// Builds one curve per row of problems with build(curve, row), which returns whether it converged.  Returns
+// the (N, 6) StandardParams of the curves, NaN where the build failed, and the (N,) convergence flags.
+template <typename Build>
+static py::tuple build_batch(py::object problems, py::ssize_t ncols, int num_threads, Build build) {
+    RealArray rows = as_rows(problems, ncols, "problems");
+    py::ssize_t n = rows.shape(0);
+    RealArray parameters(std::vector<py::ssize_t>{n, 6});
+    py::array_t<bool> converged(std::vector<py::ssize_t>{n});
+    const G2lib::real_type* in = rows.data();
+    G2lib::real_type* out = parameters.mutable_data();
+    bool* ok = converged.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            G2lib::ClothoidCurve curve;
+            for (py::ssize_t i = begin; i < end; ++i) {
+                try {
+                    ok[i] = build(curve, in + ncols * i);
+                } catch (const std::exception&) {
+                    // the Newton iterations of build_G1 raise when they do not converge
+                    ok[i] = false;
+                }
+                if (ok[i]) {
+                    store_parameters(curve, out + 6 * i);
+                } else {
+                    std::fill(out + 6 * i, out + 6 * (i + 1), std::numeric_limits<G2lib::real_type>::quiet_NaN());
+                }
+            }
+        });
+    }
+    return py::make_tuple(parameters, converged);
+}
+
+static py::tuple build_G1_batch(py::object problems, G2lib::real_type tol, int num_threads) {
+    return build_batch(problems, 6, num_threads, [tol](G2lib::ClothoidCurve& c, const G2lib::real_type* p) {
+        c.build_G1(p[0], p[1], p[2], p[3], p[4], p[5], tol);
+        return c.length() > 0;
+    });
+}
+
+static py::tuple build_forward_batch(py::object problems, G2lib::real_type tol, int num_threads) {
+    return build_batch(problems, 6, num_threads, [tol](G2lib::ClothoidCurve& c, const G2lib::real_type* p) {
+        return c.build_forward(p[0], p[1], p[2], p[3], p[4], p[5], tol);
+    });
+}
+
+// Checks that params is a (6, N) table whose rows hold the StandardParams x0, y0, t0, k0, dk, L of N curves
+static RealArray as_columns(py::handle params) {
+    RealArray result = as_real_array(params, "params");
+    if (result.ndim() != 2 || result.shape(0) != 6) {
+        throw py::value_error("params must have shape (6, N)");
+    }
+    return result;
+}
+
+static G2lib::ClothoidData column_data(const G2lib::real_type* table, py::ssize_t n, py::ssize_t i) {
+    G2lib::ClothoidData data;
+    data.x0 = table[i];
+    data.y0 = table[n + i];
+    data.theta0 = table[2 * n + i];
+    data.kappa0 = table[3 * n + i];
+    data.dk = table[4 * n + i];
+    return data;
+}
+
+// Converts curve i of a (6, N) parameter table to a polyline for every i.  Returns a tuple of the (2, V)
+// vertices of all polylines one after the other and the N + 1 offsets of the first vertex of each polyline.
+static py::tuple polyline_columns(py::object params, G2lib::real_type tol, int num_threads) {
+    check_tolerance(tol);
+    RealArray table = as_columns(params);
+    py::ssize_t n = table.shape(1);
+    const G2lib::real_type* p = table.data();
+    G2lib::real_type count = 0;
+    for (py::ssize_t i = 0; i < n; ++i) {
+        G2lib::ClothoidCurve curve(p[i], p[n + i], p[2 * n + i], p[3 * n + i], p[4 * n + i], p[5 * n + i]);
+        count = std::max(count, adaptive_station_count(curve, tol, G2lib::m_pi_2));
+    }
+    check_station_count(count);
+    std::vector<std::vector<G2lib::real_type>> xs(n), ys(n);
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                G2lib::ClothoidCurve curve(p[i], p[n + i], p[2 * n + i], p[3 * n + i], p[4 * n + i], p[5 * n + i]);
+                append_polyline(curve, tol, false, xs[i], ys[i]);
+            }
+        });
+    }
+    py::array_t<py::ssize_t> offsets(n + 1);
+    py::ssize_t* o = offsets.mutable_data();
+    o[0] = 0;
+    for (py::ssize_t i = 0; i < n; ++i) o[i + 1] = o[i] + static_cast<py::ssize_t>(xs[i].size());
+    RealArray vertices(std::vector<py::ssize_t>{2, o[n]});
+    G2lib::real_type* v = vertices.mutable_data();
+    for (py::ssize_t i = 0; i < n; ++i) {
+        std::copy(xs[i].begin(), xs[i].end(), v + o[i]);
+        std::copy(ys[i].begin(), ys[i].end(), v + o[n] + o[i]);
+    }
+    return py::make_tuple(vertices, offsets);
+}
+
+// Runs bounding_triangles for curve i of a (6, N) parameter table for every i.  Returns a tuple of the (T, 8)
+// triangles of all curves one after the other and the N + 1 offsets of the first triangle of each curve.
+static py::tuple bounding_triangles_columns(
+    py::object params, G2lib::real_type max_angle, G2lib::real_type max_size, G2lib::real_type offset, int num_threads
+) {
+    check_cover(max_angle, max_size, offset);
+    RealArray table = as_columns(params);
+    py::ssize_t n = table.shape(1);
+    const G2lib::real_type* p = table.data();
+    std::vector<std::vector<TriangleRow>> rows(n);
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                band_triangles(column_data(p, n, i), p[5 * n + i], max_angle, max_size, offset, 0, rows[i]);
+            }
+        });
+    }
+    py::array_t<py::ssize_t> offsets(n + 1);
+    py::ssize_t* o = offsets.mutable_data();
+    o[0] = 0;
+    for (py::ssize_t i = 0; i < n; ++i) o[i + 1] = o[i] + static_cast<py::ssize_t>(rows[i].size());
+    RealArray result(std::vector<py::ssize_t>{o[n], 8});
+    G2lib::real_type* out = result.mutable_data();
+    for (const std::vector<TriangleRow>& curve_rows : rows) {
+        for (const TriangleRow& row : curve_rows) out = std::copy(row.begin(), row.end(), out);
+    }
+    return py::make_tuple(result, offsets);
+}
+
+// Runs bounding_box for curve i of a (6, N) parameter table for every i.  Returns an (N, 4) array of rows
+// xmin, ymin, xmax, ymax.
+static RealArray bounding_box_columns(py::object params, G2lib::real_type offset, int num_threads) {
+    check_cover(1, 1, offset);
+    RealArray table = as_columns(params);
+    py::ssize_t n = table.shape(1);
+    const G2lib::real_type* p = table.data();
+    RealArray result(std::vector<py::ssize_t>{n, 4});
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            G2lib::real_type inf = std::numeric_limits<G2lib::real_type>::infinity();
+            for (py::ssize_t i = begin; i < end; ++i) {
+                G2lib::real_type* box = out + 4 * i;
+                box[0] = box[1] = inf;
+                box[2] = box[3] = -inf;
+                band_box(column_data(p, n, i), p[5 * n + i], offset, box);
+            }
+        });
+    }
+    return result;
+}
+
+// Evaluates curve i of a (6, N) parameter table at the arc lengths s[i, ...].  Returns an array of shape
+// (len(quantities), N, ...).  A positive tolerance selects the fast precision mode.
+static RealArray evaluate_columns(
+    py::object params, py::object s, const std::vector<std::string>& quantities, int num_threads,
+    G2lib::real_type tolerance
+) {
+    std::vector<Channel> channels = parse_channels(quantities);
+    RealArray table = as_columns(params);
+    py::ssize_t n = table.shape(1);
+    RealArray s_array = as_real_array(s, "s");
+    if (s_array.ndim() < 1 || s_array.shape(0) != n) {
+        throw py::value_error("s must have shape (N, ...) where N is the number of curves");
+    }
+    py::ssize_t size = s_array.size();
+    py::ssize_t per_curve = n ? size / n : 0;
+    RealArray result = empty_like(s_array, {static_cast<py::ssize_t>(channels.size())});
+    const G2lib::real_type* p = table.data();
+    const G2lib::real_type* in = s_array.data();
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                G2lib::ClothoidData data = column_data(p, n, i);
+                std::unique_ptr<FastPositions> fast;
+                if (tolerance > 0 && needs_positions(channels) && per_curve > 1) {
+                    fast.reset(new FastPositions({Segment{data, 0, p[5 * n + i]}}, tolerance, per_curve / 2));
+                    if (!fast->valid()) fast.reset();
+                }
+                for (py::ssize_t j = i * per_curve; j < (i + 1) * per_curve; ++j) {
+                    evaluate_point(data, in[j], 0, channels, out + j, size, fast.get());
+                }
+            }
+        });
+    }
+    return result;
+}
+
+// Projects point i of a (2, N) array onto curve i of a (6, N) parameter table.  Returns a (4, N) array laid
+// out like the result of project_points.
+static RealArray project_columns(py::object params, py::object xy, int num_threads) {
+    RealArray table = as_columns(params);
+    py::ssize_t n = table.shape(1);
+    RealArray points = as_real_array(xy, "xy");
+    if (points.ndim() != 2 || points.shape(0) != 2 || points.shape(1) != n) {
+        throw py::value_error("xy must have shape (2, N) where N is the number of curves");
+    }
+    RealArray result(std::vector<py::ssize_t>{4, n});
+    const G2lib::real_type* p = table.data();
+    const G2lib::real_type* qx = points.data();
+    const G2lib::real_type* qy = qx + n;
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                // a fresh curve per point: rebuilding a curve does not discard the triangles of its old tree
+                G2lib::ClothoidCurve curve(p[i], p[n + i], p[2 * n + i], p[3 * n + i], p[4 * n + i], p[5 * n + i]);
+                G2lib::real_type t;
+                curve.closestPoint_ISO(qx[i], qy[i], 0.0, out[i], out[n + i], out[2 * n + i], t, out[3 * n + i]);
+                out[3 * n + i] = std::copysign(out[3 * n + i], t);
+            }
+        });
+    }
+    return result;
+}
+
+// Distance from a point to an axis aligned box given as (xmin, ymin, xmax, ymax), zero inside the box
+static G2lib::real_type box_distance(const G2lib::real_type* box, G2lib::real_type x, G2lib::real_type y) {
+    G2lib::real_type dx = std::max(std::max(box[0] - x, x - box[2]), G2lib::real_type(0));
+    G2lib::real_type dy = std::max(std::max(box[1] - y, y - box[3]), G2lib::real_type(0));
+    return std::hypot(dx, dy);
+}
+
+static bool boxes_overlap(const G2lib::real_type* a, const G2lib::real_type* b) {
+    return a[0] <= b[2] && b[0] <= a[2] && a[1] <= b[3] && b[1] <= a[3];
+}
+
+// Closest point to (qx, qy) on the arc [s_begin, s_end] of a clothoid, where the arc turns by a small angle.
+// Uses the osculating circle iteration of ClothoidCurve::closestPoint_internal_ISO, which is private, and
+// then compares the result with both ends of the arc.
+static void closest_point_in_range(
+    const G2lib::ClothoidData& cd, G2lib::real_type s_begin, G2lib::real_type s_end,
+    G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type& s, G2lib::real_type& dst
+) {
+    G2lib::real_type x, y;
+    s = (s_begin + s_end) / 2;
+    int nout = 0;
+    for (int iter = 0; iter < 20; ++iter) {
+        cd.eval(s, x, y);
+        G2lib::real_type ds = G2lib::projectPointOnCircle(x, y, cd.theta(s), cd.kappa(s), qx, qy);
+        s += ds;
+        if (s <= s_begin || s >= s_end) {
+            s = std::min(std::max(s, s_begin), s_end);
+            if (++nout > 3) break;
+        } else if (std::abs(ds) <= 1e-12 * (1 + std::abs(s))) {
+            break;
+        }
+    }
+    cd.eval(s, x, y);
+    dst = std::hypot(qx - x, qy - y);
+    for (G2lib::real_type end : {s_begin, s_end}) {
+        cd.eval(end, x, y);
+        G2lib::real_type d = std::hypot(qx - x, qy - y);
+        if (d < dst) {
+            dst = d;
+            s = end;
+        }
+    }
+}
 
+// Closest point to (qx, qy) on the offset curve at offset of the arc [s_begin, s_end] of a clothoid.  The
+// normals of the offset curve are those of the clothoid, so the distance is stationary at the roots of
+// g(s) = (q - P(s)) . T(s), the feet of the point on the clothoid, and at the cusps of the offset curve, where
+// offset * kappa = 1.  Short of the cusps g has a single root near the offset curve, which closest_point_in_range
+// finds.  Arcs reaching a cusp may hold several roots, which are bracketed on a grid and bisected.
+static void closest_offset_point_in_range(
+    const G2lib::ClothoidData& cd, G2lib::real_type s_begin, G2lib::real_type s_end, G2lib::real_type offset,
+    G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type& s, G2lib::real_type& dst
+) {
+    const int grid = 32;
+    G2lib::real_type candidates[grid + 3];
+    int n = 0;
+    candidates[n++] = s_begin;
+    candidates[n++] = s_end;
+    if (offset * cd.kappa(s_begin) < 1 && offset * cd.kappa(s_end) < 1) {
+        closest_point_in_range(cd, s_begin, s_end, qx, qy, candidates[n++], dst);
+    } else {
+        if (cd.dk != 0) {
+            G2lib::real_type cusp = (1 / offset - cd.kappa0) / cd.dk;
+            if (cusp > s_begin && cusp < s_end) candidates[n++] = cusp;
+        }
+        auto g = [&](G2lib::real_type si) {
+            G2lib::real_type x, y, theta = cd.theta(si);
+            cd.eval(si, x, y);
+            return (qx - x) * std::cos(theta) + (qy - y) * std::sin(theta);
+        };
+        G2lib::real_type a = s_begin, ga = g(a);
+        for (int k = 1; k <= grid; ++k) {
+            G2lib::real_type b = k < grid ? s_begin + (s_end - s_begin) * k / grid : s_end, gb = g(b);
+            if ((ga < 0) != (gb < 0)) {
+                G2lib::real_type lo = a, hi = b, glo = ga;
+                for (int iter = 0; iter < 60 && hi - lo > 1e-13 * (1 + std::abs(hi)); ++iter) {
+                    G2lib::real_type mid = (lo + hi) / 2, gmid = g(mid);
+                    if ((gmid < 0) == (glo < 0)) {
+                        lo = mid;
+                        glo = gmid;
+                    } else {
+                        hi = mid;
+                    }
+                }
+                candidates[n++] = (lo + hi) / 2;
+            }
+            a = b;
+            ga = gb;
+        }
+    }
+    s = std::numeric_limits<G2lib::real_type>::quiet_NaN();
+    dst = std::numeric_limits<G2lib::real_type>::infinity();
+    for (int k = 0; k < n; ++k) {
+        G2lib::real_type x, y;
+        cd.eval_ISO(candidates[k], offset, x, y);
+        G2lib::real_type d = std::hypot(qx - x, qy - y);
+        if (d < dst) {
+            dst = d;
+            s = candidates[k];
+        }
+    }
+}
+
+// The arcs of a clothoid covered by each of the triangles of band_triangles for the half width w, with the
+// triangles and their bounding boxes
+struct BandPieces {
+    std::vector<TriangleRow> triangles;
+    std::vector<G2lib::real_type> boxes;
+
+    BandPieces(const G2lib::ClothoidData& cd, G2lib::real_type length, G2lib::real_type w) {
+        band_triangles(cd, length, G2lib::m_pi / 18, std::numeric_limits<G2lib::real_type>::infinity(), w, 0, triangles);
+        for (const TriangleRow& row : triangles) {
+            boxes.push_back(std::min({row[0], row[2], row[4]}));
+            boxes.push_back(std::min({row[1], row[3], row[5]}));
+            boxes.push_back(std::max({row[0], row[2], row[4]}));
+            boxes.push_back(std::max({row[1], row[3], row[5]}));
+        }
+    }
+
+    size_t size() const { return triangles.size(); }
+    G2lib::real_type s_begin(size_t k) const { return triangles[k][6]; }
+    G2lib::real_type s_end(size_t k) const { return triangles[k][7]; }
+    const G2lib::real_type* box(size_t k) const { return &boxes[4 * k]; }
+
+    // Distance from (x, y) to triangle k, zero inside it
+    G2lib::real_type distance(size_t k, G2lib::real_type x, G2lib::real_type y) const {
+        const TriangleRow& t = triangles[k];
+        G2lib::real_type best = std::numeric_limits<G2lib::real_type>::infinity(), area = 0;
+        bool inside = true;
+        for (int e = 0; e < 3; ++e) {
+            G2lib::real_type ax = t[2 * e], ay = t[2 * e + 1], bx = t[(2 * e + 2) % 6], by = t[(2 * e + 3) % 6];
+            G2lib::real_type ex = bx - ax, ey = by - ay, len2 = ex * ex + ey * ey;
+            G2lib::real_type u = len2 > 0 ? std::min(std::max(((x - ax) * ex + (y - ay) * ey) / len2, G2lib::real_type(0)), G2lib::real_type(1)) : 0;
+            best = std::min(best, std::hypot(x - ax - u * ex, y - ay - u * ey));
+            G2lib::real_type cross = ex * (y - ay) - ey * (x - ax);
+            if (e == 0) area = cross;
+            else if ((cross < 0) != (area < 0) && cross != 0) inside = false;
+        }
+        return inside ? 0 : best;
+    }
+};
+
+// Closest point to (qx, qy) on the offset curve of cd at offset.  The pieces cover the clothoid itself, so
+// the distance from the point to the triangle of a piece, less the magnitude of the offset, bounds the
+// distance to that piece of the offset curve from below, and pieces are refined in order of their bounds until
+// the bound exceeds the best distance found.  Returns the arc length and the signed distance, positive to the
+// left of the offset curve, and writes the closest point to x and y.  Every output is NaN when no closest
+// point is found, as for a NaN query.
+static void closest_offset_point(
+    const G2lib::ClothoidData& cd, const BandPieces& pieces, G2lib::real_type offset, G2lib::real_type qx,
+    G2lib::real_type qy, G2lib::real_type& x, G2lib::real_type& y, G2lib::real_type& s, G2lib::real_type& dst,
+    std::vector<std::pair<G2lib::real_type, size_t>>& order
+) {
+    x = y = s = dst = std::numeric_limits<G2lib::real_type>::quiet_NaN();
+    // NaN bounds cannot be sorted
+    if (std::isnan(qx) || std::isnan(qy) || std::isnan(offset)) return;
+    order.clear();
+    for (size_t k = 0; k < pieces.size(); ++k) {
+        order.emplace_back(pieces.distance(k, qx, qy) - std::abs(offset), k);
+    }
+    std::sort(order.begin(), order.end());
+    G2lib::real_type best = std::numeric_limits<G2lib::real_type>::infinity();
+    for (const std::pair<G2lib::real_type, size_t>& candidate : order) {
+        if (candidate.first >= best) break;
+        G2lib::real_type si, di;
+        closest_offset_point_in_range(cd, pieces.s_begin(candidate.second), pieces.s_end(candidate.second), offset, qx, qy, si, di);
+        if (di < best) {
+            best = di;
+            s = si;
+        }
+    }
+    if (std::isnan(s)) return;
+    dst = best;
+    cd.eval_ISO(s, offset, x, y);
+    G2lib::real_type theta = cd.theta(s);
+    dst = std::copysign(dst, (qy - y) * std::cos(theta) - (qx - x) * std::sin(theta));
+}
+
+// Projects every (X, Y) pair of a (2, ...) array onto the offset curve of the clothoid at the offset of the
+// point, laid out like the output of project_points
+static RealArray project_points_offset(const G2lib::ClothoidCurve& self, py::object xy, py::object offset, int num_threads) {
+    RealArray points = as_real_array(xy, "xy");
+    if (points.ndim() < 1 || points.shape(0) != 2) {
+        throw py::value_error("xy must have shape (2, ...)");
+    }
+    py::ssize_t n = points.size() / 2;
+    Offsets offsets(offset, n);
+    std::vector<py::ssize_t> shape(points.shape(), points.shape() + points.ndim());
+    shape[0] = 4;
+    RealArray result(shape);
+    const G2lib::real_type* qx = points.data();
+    const G2lib::real_type* qy = qx + n;
+    G2lib::real_type* out = result.mutable_data();
+    G2lib::ClothoidData cd = curve_data(self);
+    {
+        py::gil_scoped_release release;
+        BandPieces pieces(cd, self.length(), 0);
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            std::vector<std::pair<G2lib::real_type, size_t>> order;
+            for (py::ssize_t i = begin; i < end; ++i) {
+                closest_offset_point(cd, pieces, offsets[i], qx[i], qy[i], out[i], out[n + i], out[2 * n + i], out[3 * n + i], order);
+            }
+        });
+    }
+    return result;
+}
+
+// Intersections of the offset curves of two clothoids at offsets a and b, as pairs of arc lengths ordered along
+// the first.  Pairs of pieces of band_triangles whose boxes overlap are solved by the Newton iteration of
+// ClothoidCurve::aabb_intersect_ISO, as ClothoidCurve::intersect_ISO does for its own triangles.  Those
+// triangles are not used, since the AABB tree of a curve holds the triangles of a single offset and rebuilding
+// it is neither thread safe nor cheap.
+static void offset_intersections(
+    const G2lib::ClothoidData& cd1, G2lib::real_type length1, G2lib::real_type a,
+    const G2lib::ClothoidData& cd2, G2lib::real_type length2, G2lib::real_type b, ArcLengthPairs& result
+) {
+    BandPieces p1(cd1, length1, std::abs(a)), p2(cd2, length2, std::abs(b));
+    G2lib::real_type tol = 1e-10 * (1 + length1 + length2);
+    for (size_t i = 0; i < p1.size(); ++i) {
+        for (size_t j = 0; j < p2.size(); ++j) {
+            if (!boxes_overlap(p1.box(i), p2.box(j))) continue;
+            G2lib::real_type lo1 = p1.s_begin(i) - tol, hi1 = p1.s_end(i) + tol;
+            G2lib::real_type lo2 = p2.s_begin(j) - tol, hi2 = p2.s_end(j) + tol;
+            G2lib::real_type s1 = (lo1 + hi1) / 2, s2 = (lo2 + hi2) / 2;
+            bool converged = false;
+            int nout = 0;
+            for (int iter = 0; iter < 20 && !converged; ++iter) {
+                G2lib::real_type x1, y1, dx1, dy1, x2, y2, dx2, dy2;
+                cd1.eval_ISO(s1, a, x1, y1);
+                cd1.eval_ISO_D(s1, a, dx1, dy1);
+                cd2.eval_ISO(s2, b, x2, y2);
+                cd2.eval_ISO_D(s2, b, dx2, dy2);
+                G2lib::real_type det = dx2 * dy1 - dx1 * dy2, px = x2 - x1, py = y2 - y1;
+                s1 += (py * dx2 - px * dy2) / det;
+                s2 += (dx1 * py - dy1 * px) / det;
+                if (!std::isfinite(s1) || !std::isfinite(s2)) break;
+                bool out = s1 < lo1 || s1 > hi1 || s2 < lo2 || s2 > hi2;
+                s1 = std::min(std::max(s1, lo1), hi1);
+                s2 = std::min(std::max(s2, lo2), hi2);
+                if (out) {
+                    if (++nout > 3) break;
+                } else {
+                    converged = std::abs(px) <= 1e-10 && std::abs(py) <= 1e-10;
+                }
+            }
+            if (converged) {
+                result.emplace_back(
+                    std::min(std::max(s1, p1.s_begin(i)), p1.s_end(i)), std::min(std::max(s2, p2.s_begin(j)), p2.s_end(j))
+                );
+            }
+        }
+    }
+    unique_pairs(result, 1e-8 * (1 + length1 + length2));
+}
+
+// Runs offset_intersections for each pair of offsets of two arrays of the same size.  Returns a tuple of the
+// index of the pair in the flattened offsets and the arc lengths along each curve of every intersection.
+static py::tuple intersect_offsets(
+    const G2lib::ClothoidCurve& self, const G2lib::ClothoidCurve& other, py::object offset, py::object other_offset,
+    int num_threads
+) {
+    RealArray a = as_real_array(offset, "offset"), b = as_real_array(other_offset, "other_offset");
+    py::ssize_t n = a.size();
+    if (b.size() != n) {
+        throw py::value_error("offset and other_offset must have the same size");
+    }
+    const G2lib::real_type* pa = a.data();
+    const G2lib::real_type* pb = b.data();
+    G2lib::ClothoidData cd1 = curve_data(self), cd2 = curve_data(other);
+    G2lib::real_type length1 = self.length(), length2 = other.length();
+    std::vector<ArcLengthPairs> hits(n);
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                offset_intersections(cd1, length1, pa[i], cd2, length2, pb[i], hits[i]);
+            }
+        });
+    }
+    py::ssize_t total = 0;
+    for (const ArcLengthPairs& h : hits) total += static_cast<py::ssize_t>(h.size());
+    py::array_t<py::ssize_t> index(total);
+    RealArray s1(total), s2(total);
+    py::ssize_t* out_index = index.mutable_data();
+    G2lib::real_type* out1 = s1.mutable_data();
+    G2lib::real_type* out2 = s2.mutable_data();
+    for (py::ssize_t i = 0; i < n; ++i) {
+        for (const std::pair<G2lib::real_type, G2lib::real_type>& hit : hits[i]) {
+            *out_index++ = i;
+            *out1++ = hit.first;
+            *out2++ = hit.second;
+        }
+    }
+    return py::make_tuple(index, s1, s2);
+}
+
+// Arc [a, b] of a clothoid enclosed by the segment through the point (x, y) at its middle arc length along the
+// unit tangent (tx, ty) there, for offsets u in [-h, h] with h = (b - a) / 2, widened by r.  The tangent turns
+// by at most kmax |u| over u, so the arc strays at most kmax u^2 / 2 from the segment, and never more than 2 |u|.
+// The arc is also enclosed by the osculating circle at its middle, of center (cx, cy) and curvature k, widened
+// by rc: the tangent turns away from the circle by dk u^2 / 2, so the arc strays at most |dk| h^3 / 6 from it.
+struct ArcEnclosure {
+    G2lib::real_type a, b, x, y, tx, ty, r, cx, cy, k, rc;
+};
+
+static ArcEnclosure enclose_arc(const G2lib::ClothoidData& cd, G2lib::real_type a, G2lib::real_type b) {
+    ArcEnclosure e;
+    e.a = a;
+    e.b = b;
+    G2lib::real_type h = (b - a) / 2, theta;
+    cd.eval(a + h, e.x, e.y);
+    theta = cd.theta(a + h);
+    e.tx = std::cos(theta);
+    e.ty = std::sin(theta);
+    G2lib::real_type kmax = std::max(std::abs(cd.kappa0 + cd.dk * a), std::abs(cd.kappa0 + cd.dk * b));
+    e.r = std::min(kmax * h * h / 2, 2 * h);
+    e.k = cd.kappa0 + cd.dk * (a + h);
+    e.cx = e.x - e.ty / e.k;
+    e.cy = e.y + e.tx / e.k;
+    e.rc = std::abs(cd.dk) * h * h * h / 6;
+    return e;
+}
+
+// Distance between the osculating circles of two enclosures, less the widths of the enclosures and the
+// rounding errors of the centers, or -inf for nearly straight arcs whose circles are out of reach of doubles
+static G2lib::real_type circle_bound(const ArcEnclosure& p, const ArcEnclosure& q) {
+    G2lib::real_type r1 = 1 / std::abs(p.k), r2 = 1 / std::abs(q.k), d = std::hypot(p.cx - q.cx, p.cy - q.cy);
+    if (!std::isfinite(r1 + r2 + d)) return -std::numeric_limits<G2lib::real_type>::infinity();
+    G2lib::real_type gap = std::max(d - r1 - r2, std::abs(r1 - r2) - d);
+    return gap - p.rc - q.rc - 8 * std::numeric_limits<G2lib::real_type>::epsilon() * (d + r1 + r2);
+}
+
+// Distance between the segments of two enclosures, with the offsets u and v of the closest points of the
+// segments from their middles.  The clamped minimization of Ericson, Real-Time Collision Detection, 5.1.9.
+static G2lib::real_type segment_distance(
+    const ArcEnclosure& p, const ArcEnclosure& q, G2lib::real_type& u, G2lib::real_type& v
+) {
+    G2lib::real_type h1 = (p.b - p.a) / 2, h2 = (q.b - q.a) / 2;
+    G2lib::real_type d1x = 2 * h1 * p.tx, d1y = 2 * h1 * p.ty, d2x = 2 * h2 * q.tx, d2y = 2 * h2 * q.ty;
+    G2lib::real_type rx = (p.x - h1 * p.tx) - (q.x - h2 * q.tx), ry = (p.y - h1 * p.ty) - (q.y - h2 * q.ty);
+    G2lib::real_type a = d1x * d1x + d1y * d1y, e = d2x * d2x + d2y * d2y, f = d2x * rx + d2y * ry;
+    auto clamp01 = [](G2lib::real_type t) { return std::min(std::max(t, G2lib::real_type(0)), G2lib::real_type(1)); };
+    G2lib::real_type s = 0, t = 0;
+    if (a <= 0 && e <= 0) {
+    } else if (a <= 0) {
+        t = clamp01(f / e);
+    } else {
+        G2lib::real_type c = d1x * rx + d1y * ry;
+        if (e <= 0) {
+            s = clamp01(-c / a);
+        } else {
+            G2lib::real_type b = d1x * d2x + d1y * d2y, denom = a * e - b * b;
+            s = denom > 0 ? clamp01((b * f - c * e) / denom) : 0;
+            t = (b * s + f) / e;
+            if (t < 0) {
+                t = 0;
+                s = clamp01(-c / a);
+            } else if (t > 1) {
+                t = 1;
+                s = clamp01((b - c) / a);
+            }
+        }
+    }
+    u = h1 * (2 * s - 1);
+    v = h2 * (2 * t - 1);
+    return std::hypot(rx + d1x * s - d2x * t, ry + d1y * s - d2y * t);
+}
+
+// Minimum distance between the clothoids cd1 on [0, length1] and cd2 on [0, length2] and the arc lengths s1 and
+// s2 at which it is reached.  Branch and bound over pairs of arcs, splitting the arc that strays the most from
+// its enclosing segment, until no pair can come closer than the best pair of points found by more than tol.
+// The result is then polished by Newton iterations on the conditions that the line between the closest points
+// is normal to both curves.  Stops early with a distance of inf and NaN arc lengths once the distance is known
+// to exceed max_distance, and gives NaN for all three when the search exhausts its budget of pairs.
+static void clothoid_distance(
+    const G2lib::ClothoidData& cd1, G2lib::real_type length1, const G2lib::ClothoidData& cd2,
+    G2lib::real_type length2, G2lib::real_type max_distance, G2lib::real_type& dst, G2lib::real_type& s1,
+    G2lib::real_type& s2
+) {
+    // the osculating circles settle pairs of arcs at a constant distance, such as concentric arcs, at once, and
+    // no pair of clothoids tried needs more than about 1e4 pairs, so the budget only bounds the memory used
+    const int max_pairs = 1 << 18;
+    G2lib::real_type tol = 1e-10 * (1 + length1 + length2);
+    dst = std::numeric_limits<G2lib::real_type>::infinity();
+    auto try_points = [&](G2lib::real_type a, G2lib::real_type b) {
+        G2lib::real_type x1, y1, x2, y2;
+        cd1.eval(a, x1, y1);
+        cd2.eval(b, x2, y2);
+        G2lib::real_type d = std::hypot(x1 - x2, y1 - y2);
+        if (d < dst) {
+            dst = d;
+            s1 = a;
+            s2 = b;
+        }
+        return d;
+    };
+    struct Pair {
+        ArcEnclosure p, q;
+        G2lib::real_type lb, u, v;
+        bool operator<(const Pair& other) const { return lb > other.lb; }
+    };
+    auto bound_pair = [&](const ArcEnclosure& p, const ArcEnclosure& q) {
+        Pair pair{p, q, 0, 0, 0};
+        pair.lb = std::max(segment_distance(p, q, pair.u, pair.v) - p.r - q.r, circle_bound(p, q));
+        // distances are never negative, so once the curves are found to meet the other crossings are left alone
+        pair.lb = std::max(pair.lb, G2lib::real_type(0));
+        return pair;
+    };
+    try_points(0, 0);
+    try_points(0, length2);
+    try_points(length1, 0);
+    try_points(length1, length2);
+    std::priority_queue<Pair> queue;
+    queue.push(bound_pair(enclose_arc(cd1, 0, length1), enclose_arc(cd2, 0, length2)));
+    for (int popped = 0; !queue.empty(); ++popped) {
+        Pair pair = queue.top();
+        queue.pop();
+        if (pair.lb >= std::min(dst - tol, max_distance)) break;
+        if (popped == max_pairs) {
+            dst = s1 = s2 = std::numeric_limits<G2lib::real_type>::quiet_NaN();
+            return;
+        }
+        const ArcEnclosure &p = pair.p, &q = pair.q;
+        if (try_points((p.a + p.b) / 2 + pair.u, (q.a + q.b) / 2 + pair.v) - pair.lb <= tol) continue;
+        G2lib::real_type bound = std::min(dst - tol, max_distance);
+        if (p.r >= q.r) {
+            G2lib::real_type m = (p.a + p.b) / 2;
+            for (const ArcEnclosure& half : {enclose_arc(cd1, p.a, m), enclose_arc(cd1, m, p.b)}) {
+                Pair child = bound_pair(half, q);
+                if (child.lb < bound) queue.push(child);
+            }
+        } else {
+            G2lib::real_type m = (q.a + q.b) / 2;
+            for (const ArcEnclosure& half : {enclose_arc(cd2, q.a, m), enclose_arc(cd2, m, q.b)}) {
+                Pair child = bound_pair(p, half);
+                if (child.lb < bound) queue.push(child);
+            }
+        }
+    }
+    if (dst > max_distance) {
+        dst = std::numeric_limits<G2lib::real_type>::infinity();
+        s1 = s2 = std::numeric_limits<G2lib::real_type>::quiet_NaN();
+        return;
+    }
+    // Newton on g1 = (P1 - P2) . T1 = 0 and g2 = (P1 - P2) . T2 = 0, kept only while it brings the points closer.
+    // Where the closest point is the end of one curve, only the step along the other curve gets closer.
+    auto try_step = [&](G2lib::real_type a, G2lib::real_type b) {
+        G2lib::real_type before = dst;
+        a = std::min(std::max(a, G2lib::real_type(0)), length1);
+        b = std::min(std::max(b, G2lib::real_type(0)), length2);
+        try_points(a, b);
+        return dst < before;
+    };
+    for (int iteration = 0; iteration < 8 && dst > 0; ++iteration) {
+        G2lib::real_type x1, y1, x2, y2, t1 = cd1.theta(s1), t2 = cd2.theta(s2);
+        cd1.eval(s1, x1, y1);
+        cd2.eval(s2, x2, y2);
+        G2lib::real_type dx = x1 - x2, dy = y1 - y2, c1 = std::cos(t1), n1 = std::sin(t1), c2 = std::cos(t2),
+                         n2 = std::sin(t2);
+        G2lib::real_type g1 = dx * c1 + dy * n1, g2 = dx * c2 + dy * n2, dot = c1 * c2 + n1 * n2;
+        G2lib::real_type j11 = 1 + (cd1.kappa0 + cd1.dk * s1) * (dy * c1 - dx * n1);
+        G2lib::real_type j22 = (cd2.kappa0 + cd2.dk * s2) * (dy * c2 - dx * n2) - 1;
+        G2lib::real_type det = j11 * j22 + dot * dot;
+        G2lib::real_type a = s1, b = s2;
+        if (std::abs(det) > 1e-12 && try_step(a - (j22 * g1 + dot * g2) / det, b - (j11 * g2 - dot * g1) / det)) {
+            continue;
+        }
+        if (j11 != 0 && try_step(a - g1 / j11, b)) continue;
+        if (j22 != 0 && try_step(a, b - g2 / j22)) continue;
+        break;
+    }
+}
+
+static py::tuple distance_to(
+    const G2lib::ClothoidCurve& self, const G2lib::ClothoidCurve& other, G2lib::real_type max_distance
+) {
+    G2lib::ClothoidData cd1 = curve_data(self), cd2 = curve_data(other);
+    G2lib::real_type length1 = self.length(), length2 = other.length(), dst, s1, s2;
+    {
+        py::gil_scoped_release release;
+        clothoid_distance(cd1, length1, cd2, length2, max_distance, dst, s1, s2);
+    }
+    return py::make_tuple(dst, s1, s2);
+}
+
+// Runs clothoid_distance between curve i of two (6, N) parameter tables for every i.  Either table may hold a
+// single curve, paired with every curve of the other.  Returns a (3, N) array of the distances and the arc
+// lengths along the curves of each table, filled in as described for clothoid_distance.
+static RealArray distance_columns(
+    py::object params, py::object other_params, G2lib::real_type max_distance, int num_threads
+) {
+    RealArray table1 = as_columns(params), table2 = as_columns(other_params);
+    py::ssize_t n1 = table1.shape(1), n2 = table2.shape(1);
+    if (n1 != n2 && n1 != 1 && n2 != 1) {
+        throw py::value_error("params and other_params must hold the same number of curves, or one curve");
+    }
+    py::ssize_t n = n1 == 1 ? n2 : n1;
+    RealArray result(std::vector<py::ssize_t>{3, n});
+    const G2lib::real_type* p1 = table1.data();
+    const G2lib::real_type* p2 = table2.data();
+    G2lib::real_type* out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) {
+                py::ssize_t i1 = n1 == 1 ? 0 : i, i2 = n2 == 1 ? 0 : i;
+                clothoid_distance(
+                    column_data(p1, n1, i1), p1[5 * n1 + i1], column_data(p2, n2, i2), p2[5 * n2 + i2],
+                    max_distance, out[i], out[n + i], out[2 * n + i]
+                );
+            }
+        });
+    }
+    return result;
+}
+
+// Smallest arc length in [a, b] at which the clothoid lies inside box, up to tol.  Bisects the arc using the
+// bound that every point of an arc lies within half its length of the point at its middle arc length.
+static bool first_inside(
+    const G2lib::ClothoidData& cd, G2lib::real_type a, G2lib::real_type b, const G2lib::real_type* box,
+    G2lib::real_type tol, G2lib::real_type& s
+) {
+    G2lib::real_type x, y;
+    cd.eval(a, x, y);
+    if (box_distance(box, x, y) == 0) {
+        s = a;
+        return true;
+    }
+    G2lib::real_type m = (a + b) / 2;
+    cd.eval(m, x, y);
+    if (box_distance(box, x, y) > (b - a) / 2) return false;
+    if (b - a <= tol) {
+        s = m;
+        return true;
+    }
+    return first_inside(cd, a, m, box, tol, s) || first_inside(cd, m, b, box, tol, s);
+}
+
+// A bounding volume hierarchy over many clothoids.  Each clothoid is split into the short arcs ("pieces")
+// covered by the triangles of bbTriangles_ISO, and a binary tree is built over the bounding boxes of the
+// pieces by median splits.  Everything is stored in flat arrays so that the index pickles without rebuilding.
+class CurveIndex {
+public:
+    struct Piece {
+        G2lib::int_type curve;
+        G2lib::real_type s_begin, s_end;
+        G2lib::real_type box[4];
+    };
+    struct Node {
+        G2lib::real_type box[4];
+        G2lib::int_type begin, end;  // range of pieces below the node
+        G2lib::int_type second;      // index of the second child, the first child follows the node, -1 for leaves
+    };
+    struct Hit {
+        G2lib::int_type curve;
+        G2lib::real_type s, distance;
+    };
+    static const G2lib::int_type LEAF_SIZE = 8;
+
+    CurveIndex(py::object params, G2lib::real_type max_angle, G2lib::real_type max_size, int num_threads) {
+        RealArray table = as_columns(params);
+        set_curves(table);
+        py::ssize_t n = table.shape(1);
+        const G2lib::real_type* p = table.data();
+        std::vector<std::vector<Piece>> per_curve(n);
+        {
+            py::gil_scoped_release release;
+            parallel_for(n, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+                std::vector<G2lib::Triangle2D> triangles;
+                for (py::ssize_t i = begin; i < end; ++i) {
+                    G2lib::ClothoidCurve curve(p[i], p[n + i], p[2 * n + i], p[3 * n + i], p[4 * n + i], p[5 * n + i]);
+                    triangles.clear();
+                    curve.bbTriangles_ISO(0, triangles, max_angle, max_size);
+                    for (const G2lib::Triangle2D& t : triangles) {
+                        Piece piece;
+                        piece.curve = i;
+                        piece.s_begin = t.S0();
+                        piece.s_end = t.S1();
+                        t.bbox(piece.box[0], piece.box[1], piece.box[2], piece.box[3]);
+                        per_curve[i].push_back(piece);
+                    }
+                }
+            });
+            for (const std::vector<Piece>& curve_pieces : per_curve) {
+                pieces.insert(pieces.end(), curve_pieces.begin(), curve_pieces.end());
+            }
+            if (!pieces.empty()) build_node(0, static_cast<G2lib::int_type>(pieces.size()));
+        }
+    }
+
+    // Restores an index from the arrays returned by state()
+    CurveIndex(py::object params, py::object piece_rows, py::object node_rows) {
+        set_curves(as_columns(params));
+        RealArray piece_array = as_rows(piece_rows, 7, "pieces");
+        RealArray node_array = as_rows(node_rows, 7, "nodes");
+        const G2lib::real_type* p = piece_array.data();
+        for (py::ssize_t i = 0; i < piece_array.shape(0); ++i, p += 7) {
+            Piece piece = {static_cast<G2lib::int_type>(p[0]), p[1], p[2], {p[3], p[4], p[5], p[6]}};
+            pieces.push_back(piece);
+        }
+        p = node_array.data();
+        for (py::ssize_t i = 0; i < node_array.shape(0); ++i, p += 7) {
+            Node node = {{p[0], p[1], p[2], p[3]}, static_cast<G2lib::int_type>(p[4]), static_cast<G2lib::int_type>(p[5]), static_cast<G2lib::int_type>(p[6])};
+            nodes.push_back(node);
+        }
+    }
+
+    py::tuple state() const {
+        RealArray piece_rows(std::vector<py::ssize_t>{static_cast<py::ssize_t>(pieces.size()), 7});
+        G2lib::real_type* p = piece_rows.mutable_data();
+        for (const Piece& piece : pieces) {
+            G2lib::real_type row[7] = {G2lib::real_type(piece.curve), piece.s_begin, piece.s_end, piece.box[0], piece.box[1], piece.box[2], piece.box[3]};
+            p = std::copy(row, row + 7, p);
+        }
+        RealArray node_rows(std::vector<py::ssize_t>{static_cast<py::ssize_t>(nodes.size()), 7});
+        p = node_rows.mutable_data();
+        for (const Node& node : nodes) {
+            G2lib::real_type row[7] = {node.box[0], node.box[1], node.box[2], node.box[3], G2lib::real_type(node.begin), G2lib::real_type(node.end), G2lib::real_type(node.second)};
+            p = std::copy(row, row + 7, p);
+        }
+        return py::make_tuple(params, piece_rows, node_rows);
+    }
+
+    py::ssize_t size() const { return static_cast<py::ssize_t>(curves.size()); }
+    py::ssize_t num_pieces() const { return static_cast<py::ssize_t>(pieces.size()); }
+
+    // The k curves closest to (qx, qy) that lie within max_distance, closest first.  Runs a best-first search
+    // whose queue holds nodes and pieces keyed by the distance to their boxes, and exact distances of pieces,
+    // so that a curve is reported when its exact distance is the smallest key in the queue.
+    void nearest(G2lib::real_type qx, G2lib::real_type qy, py::ssize_t k, G2lib::real_type max_distance, std::vector<Hit>& hits) const {
+        enum { NODE, PIECE, EXACT };
+        struct Entry {
+            G2lib::real_type key;
+            int kind;
+            G2lib::int_type index;
+            G2lib::real_type s;
+            bool operator>(const Entry& other) const { return key > other.key; }
+        };
+        hits.clear();
+        if (nodes.empty() || k < 1) return;
+        std::priority_queue<Entry, std::vector<Entry>, std::greater<Entry>> queue;
+        std::vector<G2lib::int_type> reported;
+        queue.push(Entry{box_distance(nodes[0].box, qx, qy), NODE, 0, 0});
+        while (!queue.empty() && static_cast<py::ssize_t>(hits.size()) < k) {
+            Entry entry = queue.top();
+            queue.pop();
+            if (entry.key > max_distance) break;
+            if (entry.kind == EXACT) {
+                if (std::find(reported.begin(), reported.end(), entry.index) == reported.end()) {
+                    reported.push_back(entry.index);
+                    hits.push_back(Hit{entry.index, entry.s, entry.key});
+                }
+            } else if (entry.kind == PIECE) {
+                const Piece& piece = pieces[entry.index];
+                G2lib::real_type s, dst;
+                closest_point_in_range(curves[piece.curve], piece.s_begin, piece.s_end, qx, qy, s, dst);
+                queue.push(Entry{dst, EXACT, piece.curve, s});
+            } else {
+                const Node& node = nodes[entry.index];
+                if (node.second < 0) {
+                    for (G2lib::int_type i = node.begin; i < node.end; ++i) {
+                        queue.push(Entry{box_distance(pieces[i].box, qx, qy), PIECE, i, 0});
+                    }
+                } else {
+                    for (G2lib::int_type child : {entry.index + 1, node.second}) {
+                        queue.push(Entry{box_distance(nodes[child].box, qx, qy), NODE, child, 0});
+                    }
+                }
+            }
+        }
+    }
+
+    // All curves within radius of (qx, qy), closest first
+    void within_radius(G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type radius, std::vector<Hit>& hits) const {
+        std::unordered_map<G2lib::int_type, size_t> found;
+        hits.clear();
+        visit([&](const Node& node) { return box_distance(node.box, qx, qy) <= radius; }, [&](const Piece& piece) {
+            if (box_distance(piece.box, qx, qy) > radius) return;
+            G2lib::real_type s, dst;
+            closest_point_in_range(curves[piece.curve], piece.s_begin, piece.s_end, qx, qy, s, dst);
+            if (dst > radius) return;
+            auto it = found.find(piece.curve);
+            if (it == found.end()) {
+                found[piece.curve] = hits.size();
+                hits.push_back(Hit{piece.curve, s, dst});
+            } else if (dst < hits[it->second].distance) {
+                hits[it->second] = Hit{piece.curve, s, dst};
+            }
+        });
+        std::sort(hits.begin(), hits.end(), [](const Hit& a, const Hit& b) { return a.distance < b.distance; });
+    }
+
+    // All curves that pass through box, by increasing curve index, with the first arc length inside the box
+    void within_box(const G2lib::real_type* box, std::vector<Hit>& hits) const {
+        std::unordered_map<G2lib::int_type, size_t> found;
+        hits.clear();
+        visit([&](const Node& node) { return boxes_overlap(node.box, box); }, [&](const Piece& piece) {
+            G2lib::real_type s;
+            if (!boxes_overlap(piece.box, box)) return;
+            auto it = found.find(piece.curve);
+            // pieces of a curve are stored in order, so a later piece can only enter the box further along
+            if (it != found.end() && hits[it->second].s <= piece.s_begin) return;
+            G2lib::real_type tol = 1e-9 * (1 + std::abs(piece.s_end - piece.s_begin));
+            if (!first_inside(curves[piece.curve], piece.s_begin, piece.s_end, box, tol, s)) return;
+            if (it == found.end()) {
+                found[piece.curve] = hits.size();
+                hits.push_back(Hit{piece.curve, s, 0});
+            } else {
+                hits[it->second].s = std::min(hits[it->second].s, s);
+            }
+        });
+        std::sort(hits.begin(), hits.end(), [](const Hit& a, const Hit& b) { return a.curve < b.curve; });
+    }
+
+    // Pairs of curves (i, j), i from this index and j from other, whose pieces have overlapping bounding boxes,
+    // sorted and without duplicates.  When other is this index only pairs with i < j are kept.
+    void candidate_pairs(const CurveIndex& other, std::vector<std::pair<G2lib::int_type, G2lib::int_type>>& pairs) const {
+        bool same = this == &other;
+        pairs.clear();
+        if (nodes.empty() || other.nodes.empty()) return;
+        std::vector<std::pair<G2lib::int_type, G2lib::int_type>> stack(1, std::make_pair(G2lib::int_type(0), G2lib::int_type(0)));
+        while (!stack.empty()) {
+            G2lib::int_type a = stack.back().first, b = stack.back().second;
+            stack.pop_back();
+            const Node& na = nodes[a];
+            const Node& nb = other.nodes[b];
+            if (!boxes_overlap(na.box, nb.box)) continue;
+            if (na.second < 0 && nb.second < 0) {
+                for (G2lib::int_type i = na.begin; i < na.end; ++i) {
+                    for (G2lib::int_type j = nb.begin; j < nb.end; ++j) {
+                        const Piece& pa = pieces[i];
+                        const Piece& pb = other.pieces[j];
+                        if ((!same || pa.curve < pb.curve) && boxes_overlap(pa.box, pb.box)) {
+                            pairs.push_back(std::make_pair(pa.curve, pb.curve));
+                        }
+                    }
+                }
+            } else if (nb.second < 0 || (na.second >= 0 && na.end - na.begin >= nb.end - nb.begin)) {
+                // descend into the larger of the two nodes
+                stack.push_back(std::make_pair(a + 1, b));
+                stack.push_back(std::make_pair(na.second, b));
+            } else {
+                stack.push_back(std::make_pair(a, b + 1));
+                stack.push_back(std::make_pair(a, nb.second));
+            }
+        }
+        std::sort(pairs.begin(), pairs.end());
+        pairs.erase(std::unique(pairs.begin(), pairs.end()), pairs.end());
+    }
+
+    G2lib::ClothoidCurve curve(G2lib::int_type i) const {
+        py::ssize_t n = params.shape(1);
+        const G2lib::real_type* p = params.data();
+        return G2lib::ClothoidCurve(p[i], p[n + i], p[2 * n + i], p[3 * n + i], p[4 * n + i], p[5 * n + i]);
+    }
+
+    RealArray params;
+
+private:
+    std::vector<G2lib::ClothoidData> curves;
+    std::vector<Piece> pieces;
+    std::vector<Node> nodes;
+
+    void set_curves(RealArray table) {
+        params = table;
+        py::ssize_t n = table.shape(1);
+        for (py::ssize_t i = 0; i < n; ++i) {
+            curves.push_back(column_data(table.data(), n, i));
+        }
+    }
+
+    G2lib::int_type build_node(G2lib::int_type begin, G2lib::int_type end) {
+        G2lib::int_type index = static_cast<G2lib::int_type>(nodes.size());
+        Node node = {{pieces[begin].box[0], pieces[begin].box[1], pieces[begin].box[2], pieces[begin].box[3]}, begin, end, -1};
+        G2lib::real_type centers[4] = {std::numeric_limits<G2lib::real_type>::infinity(), std::numeric_limits<G2lib::real_type>::infinity(), -std::numeric_limits<G2lib::real_type>::infinity(), -std::numeric_limits<G2lib::real_type>::infinity()};
+        for (G2lib::int_type i = begin; i < end; ++i) {
+            const G2lib::real_type* b = pieces[i].box;
+            for (int j = 0; j < 2; ++j) {
+                node.box[j] = std::min(node.box[j], b[j]);
+                node.box[j + 2] = std::max(node.box[j + 2], b[j + 2]);
+                centers[j] = std::min(centers[j], b[j] + b[j + 2]);
+                centers[j + 2] = std::max(centers[j + 2], b[j] + b[j + 2]);
+            }
+        }
+        nodes.push_back(node);
+        if (end - begin <= LEAF_SIZE) return index;
+        // split at the median of the box centers along the axis where they spread the most
+        int axis = centers[2] - centers[0] >= centers[3] - centers[1] ? 0 : 1;
+        G2lib::int_type middle = begin + (end - begin) / 2;
+        std::nth_element(pieces.begin() + begin, pieces.begin() + middle, pieces.begin() + end, [axis](const Piece& a, const Piece& b) {
+            return a.box[axis] + a.box[axis + 2] < b.box[axis] + b.box[axis + 2];
+        });
+        build_node(begin, middle);
+        G2lib::int_type second = build_node(middle, end);
+        nodes[index].second = second;
+        return index;
+    }
+
+    // Calls leaf(piece) on the pieces of every node for which enter(node) holds, along with all its ancestors
+    template <typename Enter, typename Leaf>
+    void visit(Enter enter, Leaf leaf) const {
+        if (nodes.empty()) return;
+        std::vector<G2lib::int_type> stack(1, 0);
+        while (!stack.empty()) {
+            G2lib::int_type index = stack.back();
+            stack.pop_back();
+            const Node& node = nodes[index];
+            if (!enter(node)) continue;
+            if (node.second < 0) {
+                for (G2lib::int_type i = node.begin; i < node.end; ++i) leaf(pieces[i]);
+            } else {
+                stack.push_back(node.second);
+                stack.push_back(index + 1);
+            }
+        }
+    }
+};
+
+// Runs query(point, hits) for each point of a (2, Q) array across threads and returns the hits as flat rows
+template <typename Query>
+static std::vector<std::vector<CurveIndex::Hit>> query_points(RealArray points, int num_threads, Query query) {
+    py::ssize_t q = points.shape(1);
+    const G2lib::real_type* qx = points.data();
+    std::vector<std::vector<CurveIndex::Hit>> hits(q);
+    py::gil_scoped_release release;
+    parallel_for(q, num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+        for (py::ssize_t i = begin; i < end; ++i) query(qx[i], qx[q + i], i, hits[i]);
+    });
+    return hits;
+}
+
+static RealArray as_points(py::object xy) {
+    RealArray points = as_real_array(xy, "xy");
+    if (points.ndim() != 2 || points.shape(0) != 2) {
+        throw py::value_error("xy must have shape (2, Q)");
+    }
+    return points;
+}
+
+// Packs per query hits into the arrays (query, curve, s, distance) of matching rows
+static py::tuple hit_rows(const std::vector<std::vector<CurveIndex::Hit>>& hits) {
+    py::ssize_t total = 0;
+    for (const auto& h : hits) total += static_cast<py::ssize_t>(h.size());
+    py::array_t<G2lib::int_type> query(std::vector<py::ssize_t>{total}), curve(std::vector<py::ssize_t>{total});
+    RealArray s(std::vector<py::ssize_t>{total}), distance(std::vector<py::ssize_t>{total});
+    py::ssize_t row = 0;
+    for (size_t i = 0; i < hits.size(); ++i) {
+        for (const CurveIndex::Hit& hit : hits[i]) {
+            query.mutable_data()[row] = static_cast<G2lib::int_type>(i);
+            curve.mutable_data()[row] = hit.curve;
+            s.mutable_data()[row] = hit.s;
+            distance.mutable_data()[row] = hit.distance;
+            ++row;
+        }
+    }
+    return py::make_tuple(query, curve, s, distance);
+}
+
+static py::tuple index_nearest(const CurveIndex& self, py::object xy, py::ssize_t k, G2lib::real_type max_distance, int num_threads) {
+    RealArray points = as_points(xy);
+    py::ssize_t q = points.shape(1);
+    auto hits = query_points(points, num_threads, [&](G2lib::real_type x, G2lib::real_type y, py::ssize_t, std::vector<CurveIndex::Hit>& out) {
+        self.nearest(x, y, k, max_distance, out);
+    });
+    py::array_t<G2lib::int_type> curve(std::vector<py::ssize_t>{q, k});
+    RealArray s(std::vector<py::ssize_t>{q, k}), distance(std::vector<py::ssize_t>{q, k});
+    for (py::ssize_t i = 0; i < q; ++i) {
+        for (py::ssize_t j = 0; j < k; ++j) {
+            bool found = j < static_cast<py::ssize_t>(hits[i].size());
+            curve.mutable_data()[i * k + j] = found ? hits[i][j].curve : -1;
+            s.mutable_data()[i * k + j] = found ? hits[i][j].s : std::numeric_limits<G2lib::real_type>::quiet_NaN();
+            distance.mutable_data()[i * k + j] = found ? hits[i][j].distance : std::numeric_limits<G2lib::real_type>::infinity();
+        }
+    }
+    return py::make_tuple(curve, s, distance);
+}
+
+static py::tuple index_within_radius(const CurveIndex& self, py::object xy, G2lib::real_type radius, int num_threads) {
+    return hit_rows(query_points(as_points(xy), num_threads, [&](G2lib::real_type x, G2lib::real_type y, py::ssize_t, std::vector<CurveIndex::Hit>& out) {
+        self.within_radius(x, y, radius, out);
+    }));
+}
+
+static py::tuple index_within_box(const CurveIndex& self, py::object boxes, int num_threads) {
+    RealArray rows = as_rows(boxes, 4, "boxes");
+    const G2lib::real_type* b = rows.data();
+    std::vector<std::vector<CurveIndex::Hit>> hits(rows.shape(0));
+    {
+        py::gil_scoped_release release;
+        parallel_for(rows.shape(0), num_threads, [&](py::ssize_t begin, py::ssize_t end) {
+            for (py::ssize_t i = begin; i < end; ++i) self.within_box(b + 4 * i, hits[i]);
+        });
+    }
+    py::tuple result = hit_rows(hits);
+    return py::make_tuple(result[0], result[1], result[2]);
+}
+
+// Intersections between the curves of two indexes, or between distinct curves of one index.  Candidate pairs
+// come from the bounding boxes of the pieces and are intersected exactly across threads.  Returns an (R, 4)
+// array of rows (i, j, s_i, s_j) sorted by i, j and s_i.
+static RealArray index_intersect(const CurveIndex& self, const CurveIndex& other, int num_threads) {
+    typedef std::array<G2lib::real_type, 4> Row;
+    std::vector<std::pair<G2lib::int_type, G2lib::int_type>> pairs;
+    std::vector<std::vector<Row>> rows;
+    {
+        py::gil_scoped_release release;
+        self.candidate_pairs(other, pairs);
+        py::ssize_t n = static_cast<py::ssize_t>(pairs.size());
+        int chunks = num_threads < 1 ? static_cast<int>(std::max(1u, std::thread::hardware_concurrency())) : num_threads;
+        rows.resize(chunks);
+        parallel_for(chunks, chunks, [&](py::ssize_t chunk_begin, py::ssize_t chunk_end) {
+            for (py::ssize_t chunk = chunk_begin; chunk < chunk_end; ++chunk) {
+                // pairs are sorted by their first curve, which is only built once per run of pairs
+                // (assigning to a curve keeps the triangles of its old AABB tree, so each curve is a new object)
+                G2lib::int_type current = -1;
+                std::unique_ptr<G2lib::ClothoidCurve> a;
+                G2lib::IntersectList ilist;
+                for (py::ssize_t k = n * chunk / chunks; k < n * (chunk + 1) / chunks; ++k) {
+                    if (pairs[k].first != current) {
+                        current = pairs[k].first;
+                        a.reset(new G2lib::ClothoidCurve(self.curve(current)));
+                    }
+                    G2lib::ClothoidCurve b = other.curve(pairs[k].second);
+                    ilist.clear();
+                    a->intersect_ISO(0.0, b, 0.0, ilist, false);
+                    std::sort(ilist.begin(), ilist.end());
+                    G2lib::real_type tol = 1e-9 * (1 + std::abs(a->length()) + std::abs(b.length()));
+                    for (size_t m = 0; m < ilist.size(); ++m) {
+                        // neighbouring triangle pairs can converge to the same crossing
+                        if (m > 0 && std::abs(ilist[m].first - ilist[m - 1].first) <= tol && std::abs(ilist[m].second - ilist[m - 1].second) <= tol) continue;
+                        rows[chunk].push_back(Row{{G2lib::real_type(pairs[k].first), G2lib::real_type(pairs[k].second), ilist[m].first, ilist[m].second}});
+                    }
+                }
+            }
+        });
+    }
+    py::ssize_t total = 0;
+    for (const std::vector<Row>& r : rows) total += static_cast<py::ssize_t>(r.size());
+    RealArray result(std::vector<py::ssize_t>{total, 4});
+    G2lib::real_type* out = result.mutable_data();
+    for (const std::vector<Row>& r : rows) {
+        for (const Row& row : r) out = std::copy(row.begin(), row.end(), out);
+    }
+    return result;
+}
+
+// Follows a point that moves along a curve, such as a vehicle along its route, converting each new position to
+// Frenet coordinates.  Each update predicts the arc length from the last two updates and only searches the
+// curve within `window` of the prediction, falling back to a global search of the AABB tree on the first
+// update, when the closest point lies on an edge of the window, or when the distance to the curve grew by more
+// than `max_jump` since the last update.  The module runs without the GIL on free-threaded builds, so every
+// method takes the mutex of the tracker and threads sharing a tracker update it one at a time.
+class CurveTracker {
+public:
+    CurveTracker(const G2lib::ClothoidCurve& curve, G2lib::real_type window, G2lib::real_type max_jump)
+        : window(window), max_jump(max_jump) {
+        add_segment(curve);
+        finish();
+    }
+
+    CurveTracker(const G2lib::ClothoidList& list, G2lib::real_type window, G2lib::real_type max_jump)
+        : window(window), max_jump(max_jump) {
+        if (list.numSegment() == 0) {
+            throw py::value_error("cannot track an empty path");
+        }
+        for (G2lib::int_type i = 0; i < list.numSegment(); ++i) {
+            add_segment(list.get(i));
+        }
+        finish();
+    }
+
+    // Returns the arc length and signed lateral offset of (qx, qy), as to_frenet does
+    std::pair<G2lib::real_type, G2lib::real_type> update(G2lib::real_type qx, G2lib::real_type qy) {
+        std::lock_guard<std::mutex> lock(mutex);
+        return advance(qx, qy);
+    }
+
+    // Updates with every (X, Y) pair of a (2, n) array in order and returns the (2, n) Frenet coordinates
+    RealArray update_many(py::object xy) {
+        RealArray points = as_real_array(xy, "xy");
+        if (points.ndim() != 2 || points.shape(0) != 2) {
+            throw py::value_error("xy must have shape (2, n)");
+        }
+        py::ssize_t n = points.shape(1);
+        RealArray result(std::vector<py::ssize_t>{2, n});
+        const G2lib::real_type* q = points.data();
+        G2lib::real_type* out = result.mutable_data();
+        std::lock_guard<std::mutex> lock(mutex);
+        for (py::ssize_t i = 0; i < n; ++i) {
+            std::tie(out[i], out[n + i]) = advance(q[i], q[n + i]);
+        }
+        return result;
+    }
+
+    // Forgets the tracked position, or restarts the search around the arc length s
+    void reset(py::object s) {
+        G2lib::real_type start = s.is_none() ? 0 : s.cast<G2lib::real_type>();
+        std::lock_guard<std::mutex> lock(mutex);
+        tracking = !s.is_none();
+        has_position = false;
+        velocity = 0;
+        last_distance = std::numeric_limits<G2lib::real_type>::infinity();
+        if (tracking) {
+            last_s = std::min(std::max(start, G2lib::real_type(0)), stations.back());
+        }
+    }
+
+    py::object position() const {
+        std::lock_guard<std::mutex> lock(mutex);
+        if (!has_position) return py::none();
+        return py::make_tuple(last_station, last_offset);
+    }
+
+    unsigned long long get_updates() const {
+        std::lock_guard<std::mutex> lock(mutex);
+        return updates;
+    }
+
+    unsigned long long get_fallbacks() const {
+        std::lock_guard<std::mutex> lock(mutex);
+        return fallbacks;
+    }
+
+    const G2lib::real_type window, max_jump;
+
+private:
+    mutable std::mutex mutex;
+    unsigned long long updates = 0, fallbacks = 0;
+    G2lib::ClothoidList list;
+    std::vector<G2lib::ClothoidData> segments;
+    std::vector<G2lib::real_type> stations{0};
+    bool tracking = false, has_position = false;
+    G2lib::real_type last_s = 0, velocity = 0, last_distance = std::numeric_limits<G2lib::real_type>::infinity();
+    G2lib::real_type last_station = 0, last_offset = 0;
+
+    // update, with the mutex held
+    std::pair<G2lib::real_type, G2lib::real_type> advance(G2lib::real_type qx, G2lib::real_type qy) {
+        G2lib::real_type s, dst;
+        bool local = tracking && search_window(qx, qy, s, dst);
+        if (!local) {
+            search_globally(qx, qy, s, dst);
+            ++fallbacks;
+        }
+        ++updates;
+        G2lib::real_type station = s, offset;
+        frenet(qx, qy, station, offset);
+        velocity = local ? s - last_s : 0;
+        last_s = s;
+        last_distance = dst;
+        tracking = has_position = true;
+        last_station = station;
+        last_offset = offset;
+        return {station, offset};
+    }
+
+    void add_segment(const G2lib::ClothoidCurve& curve) {
+        // A fresh copy, since the AABB tree of a curve that already has one would be appended to
+        G2lib::ClothoidCurve copy(curve.xBegin(), curve.yBegin(), curve.thetaBegin(), curve.kappaBegin(), curve.dkappa(), curve.length());
+        list.push_back(copy);
+        segments.push_back(curve_data(curve));
+        stations.push_back(stations.back() + curve.length());
+    }
+
+    void finish() {
+        list.build_AABBtree_ISO(0);
+    }
+
+    // Closest point within the window around the predicted arc length.  Returns false when it lies on an
+    // edge of the window that is not an end of the curve, or when the distance jumped.
+    bool search_window(G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type& s, G2lib::real_type& dst) const {
+        G2lib::real_type length = stations.back();
+        G2lib::real_type predicted = std::min(std::max(last_s + velocity, G2lib::real_type(0)), length);
+        G2lib::real_type a = std::max(predicted - window, G2lib::real_type(0));
+        G2lib::real_type b = std::min(predicted + window, length);
+        size_t first = std::upper_bound(stations.begin() + 1, stations.end() - 1, a) - stations.begin() - 1;
+        dst = std::numeric_limits<G2lib::real_type>::infinity();
+        for (size_t i = first; i < segments.size() && stations[i] <= b; ++i) {
+            G2lib::real_type local, d;
+            closest_point_in_range(
+                segments[i], std::max(a, stations[i]) - stations[i], std::min(b, stations[i + 1]) - stations[i], qx, qy, local, d
+            );
+            if (d < dst) {
+                dst = d;
+                s = stations[i] + local;
+            }
+        }
+        G2lib::real_type edge = 1e-9 * (1 + length);
+        if ((a > 0 && s <= a + edge) || (b < length && s >= b - edge)) return false;
+        return dst <= last_distance + max_jump;
+    }
+
+    void search_globally(G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type& s, G2lib::real_type& dst) const {
+        G2lib::real_type x, y, t;
+        list.closestPoint_ISO(qx, qy, 0.0, x, y, s, t, dst);
+    }
+
+    // Converts the closest arc length s of (qx, qy) to Frenet coordinates, measuring points beyond an end of
+    // the curve along its extended tangent
+    void frenet(G2lib::real_type qx, G2lib::real_type qy, G2lib::real_type& s, G2lib::real_type& d) const {
+        size_t i = std::upper_bound(stations.begin() + 1, stations.end() - 1, s) - stations.begin() - 1;
+        G2lib::real_type local = s - stations[i], x, y;
+        segments[i].eval(local, x, y);
+        G2lib::real_type heading = segments[i].theta(local), c = std::cos(heading), sn = std::sin(heading);
+        G2lib::real_type along = (qx - x) * c + (qy - y) * sn;
+        if ((s <= 0 && along < 0) || (s >= stations.back() && along > 0)) {
+            s += along;
+        }
+        d = (qy - y) * c - (qx - x) * sn;
+    }
+};
+
+// Every binding either releases the GIL around work on its own arguments or only touches Python objects, so
+// the module can run without the GIL on free-threaded builds of CPython (pybind11 2.13 and later)
+#if PYBIND11_VERSION_HEX >= 0x020D0000
+PYBIND11_MODULE(_clothoids_cpp, m, py::mod_gil_not_used()) {
+#else
 PYBIND11_MODULE(_clothoids_cpp, m) {
+#endif
     m.doc() = "This module is a partial pybind11 wrapper of Enrico Bertolazzi's C++ library for clothoid curves.  The C++ code can be found on github and is distributed under a BSD License at https://github.com/ebertolazzi/Clothoids.";
 
     py::class_<G2lib::ClothoidCurve>(m, "ClothoidCurve")
         .def(py::init<G2lib::ClothoidCurve>())
         .def(py::init<>())
+        .def(py::init<G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type>(),
+            py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("k0"), py::arg("dk"), py::arg("L"))
         .def("build",(void (G2lib::ClothoidCurve::*)(G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type, G2lib::real_type)) &G2lib::ClothoidCurve::build,
             py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("k0"), py::arg("dk"), py::arg("L"))
         .def("build_G1", &G2lib::ClothoidCurve::build_G1,
-            py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("x1"), py::arg("y1"), py::arg("t1"), py::arg("tol"))
+            py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("x1"), py::arg("y1"), py::arg("t1"), py::arg("tol"),
+            py::call_guard<py::gil_scoped_release>())
         .def("build_forward", &G2lib::ClothoidCurve::build_forward,
-            py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("k0"), py::arg("x1"), py::arg("y1"), py::arg("tol"))
+            py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("k0"), py::arg("x1"), py::arg("y1"), py::arg("tol"),
+            py::call_guard<py::gil_scoped_release>())
 
-        .def("Theta", &G2lib::ClothoidCurve::theta, py::arg("s"))
-        .def("ThetaD", &G2lib::ClothoidCurve::theta_D, py::arg("s"))
-        .def("ThetaDD", &G2lib::ClothoidCurve::theta_DD, py::arg("s"))
-        .def("ThetaDDD", &G2lib::ClothoidCurve::theta_DDD, py::arg("s"))
+        .def("Theta", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::theta>, py::arg("s"))
+        .def("ThetaD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::theta_D>, py::arg("s"))
+        .def("ThetaDD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::theta_DD>, py::arg("s"))
+        .def("ThetaDDD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::theta_DDD>, py::arg("s"))
 
-        .def("X", &G2lib::ClothoidCurve::X, py::arg("s"))
-        .def("XD", &G2lib::ClothoidCurve::X_D, py::arg("s"))
-        .def("XDD", &G2lib::ClothoidCurve::X_DD, py::arg("s"))
-        .def("XDDD", &G2lib::ClothoidCurve::X_DDD, py::arg("s"))
+        .def("X", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::X>, py::arg("s"))
+        .def("XD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::X_D>, py::arg("s"))
+        .def("XDD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::X_DD>, py::arg("s"))
+        .def("XDDD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::X_DDD>, py::arg("s"))
 
-        .def("Y", &G2lib::ClothoidCurve::Y, py::arg("s"))
-        .def("YD", &G2lib::ClothoidCurve::Y_D, py::arg("s"))
-        .def("YDD", &G2lib::ClothoidCurve::Y_DD, py::arg("s"))
-        .def("YDDD", &G2lib::ClothoidCurve::Y_DDD, py::arg("s"))
+        .def("Y", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::Y>, py::arg("s"))
+        .def("YD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::Y_D>, py::arg("s"))
+        .def("YDD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::Y_DD>, py::arg("s"))
+        .def("YDDD", &vectorize<G2lib::ClothoidCurve, &G2lib::ClothoidCurve::Y_DDD>, py::arg("s"))
+        .def("_evaluate", &evaluate<G2lib::ClothoidCurve>, py::arg("s"), py::arg("quantities"), py::arg("offset") = py::none(), py::arg("tolerance") = 0.0)
+        .def("_sample_xy", &sample_xy<G2lib::ClothoidCurve>, py::arg("npts"), py::arg("out") = py::none(), py::arg("offset") = py::none(), py::arg("tolerance") = 0.0)
+        .def("_sample_adaptive", &sample_adaptive, py::arg("max_chord_error"), py::arg("max_angle_step"))
+        .def("_to_polyline", &to_polyline, py::arg("tol"))
 
+        .def("_parameters",
+            [](const G2lib::ClothoidCurve& c) {
+                return std::make_tuple(c.xBegin(), c.yBegin(), c.thetaBegin(), c.kappaBegin(), c.dkappa(), c.length());
+            },
+            "Returns the six StandardParams x0, y0, t0, k0, dk, L in a single call")
         .def("length", &G2lib::ClothoidCurve::length)
         .def("dk", &G2lib::ClothoidCurve::dkappa)
         .def("ThetaStart", &G2lib::ClothoidCurve::thetaBegin)
@@ -65,8 +2808,12 @@ PYBIND11_MODULE(_clothoids_cpp, m) {
         .def("_intersections",
             [](const G2lib::ClothoidCurve& self, const G2lib::ClothoidCurve& OtherClothoid) {
                 G2lib::IntersectList ilist;
-                self.intersect_ISO(0.0, OtherClothoid, 0.0, ilist, false);
-                
+                {
+                    py::gil_scoped_release release;
+                    ensure_aabb_tree(self);
+                    ensure_aabb_tree(OtherClothoid);
+                    self.intersect_ISO(0.0, OtherClothoid, 0.0, ilist, false);
+                }
                 std::vector<std::pair<G2lib::real_type, G2lib::real_type>> result(ilist.begin(), ilist.end());
                 return result;
             },
@@ -76,21 +2823,159 @@ PYBIND11_MODULE(_clothoids_cpp, m) {
         .def("_project_point_to_clothoid",
             [](const G2lib::ClothoidCurve& self, G2lib::real_type X, G2lib::real_type Y) {
                 G2lib::real_type x, y, s, t, DST;
-                G2lib::int_type result = self.closestPoint_ISO(X, Y, 0.0, x, y, s, t, DST);
-                return std::make_tuple(x, y, s, DST);
+                G2lib::int_type status;
+                {
+                    py::gil_scoped_release release;
+                    ensure_aabb_tree(self);
+                    status = self.closestPoint_ISO(X, Y, 0.0, x, y, s, t, DST);
+                }
+                // status is 1 for an orthogonal projection, 0 when there are several and -1 when the closest
+                // point is not an orthogonal projection, such as an endpoint
+                return std::make_tuple(x, y, s, DST, status);
             },
             py::arg("X"),
             py::arg("Y")
         )
+        .def("_project_points", &project_points<G2lib::ClothoidCurve>, py::arg("xy"), py::arg("num_threads") = 1)
+        .def("_project_points_offset", &project_points_offset, py::arg("xy"), py::arg("offset"), py::arg("num_threads") = 1)
+        .def("_intersect_offsets", &intersect_offsets, py::arg("other"), py::arg("offset"), py::arg("other_offset"), py::arg("num_threads") = 1)
+        .def("_distance_to", &distance_to, py::arg("other"), py::arg("max_distance"))
+        .def("_to_frenet", &to_frenet<G2lib::ClothoidCurve>, py::arg("xy"), py::arg("theta") = py::none(), py::arg("num_threads") = 1)
+        .def("_from_frenet", &from_frenet<G2lib::ClothoidCurve>, py::arg("s"), py::arg("d"), py::arg("heading_error") = py::none(),
+             py::arg("num_threads") = 1)
+        .def("_solve_for", &solve_for<G2lib::ClothoidCurve>, py::arg("quantity"), py::arg("values"), py::arg("num_threads") = 1)
+        .def("_bounding_triangles", &bounding_triangles<G2lib::ClothoidCurve>, py::arg("max_angle"), py::arg("max_size"), py::arg("offset"))
+        .def("_bounding_box", &bounding_box<G2lib::ClothoidCurve>, py::arg("offset"))
         ;
 
 
+    py::class_<G2lib::ClothoidList>(m, "ClothoidList")
+        .def(py::init<G2lib::ClothoidList>())
+        .def(py::init<>())
+        .def("push_back", (void (G2lib::ClothoidList::*)(G2lib::ClothoidCurve const&)) &G2lib::ClothoidList::push_back, py::arg("c"))
+        .def("push_back_G1", (void (G2lib::ClothoidList::*)(G2lib::real_type, G2lib::real_type, G2lib::real_type)) &G2lib::ClothoidList::push_back_G1,
+            py::arg("x1"), py::arg("y1"), py::arg("t1"))
+        .def("numSegment", &G2lib::ClothoidList::numSegment)
+        .def("get", &G2lib::ClothoidList::get, py::arg("idx"), py::return_value_policy::copy)
+
+        .def("Theta", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::theta>, py::arg("s"))
+        .def("ThetaD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::theta_D>, py::arg("s"))
+        .def("ThetaDD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::theta_DD>, py::arg("s"))
+        .def("ThetaDDD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::theta_DDD>, py::arg("s"))
+
+        .def("X", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::X>, py::arg("s"))
+        .def("XD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::X_D>, py::arg("s"))
+        .def("XDD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::X_DD>, py::arg("s"))
+        .def("XDDD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::X_DDD>, py::arg("s"))
+
+        .def("Y", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::Y>, py::arg("s"))
+        .def("YD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::Y_D>, py::arg("s"))
+        .def("YDD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::Y_DD>, py::arg("s"))
+        .def("YDDD", &vectorize<G2lib::ClothoidList, &G2lib::ClothoidList::Y_DDD>, py::arg("s"))
+        .def("_evaluate", &evaluate<G2lib::ClothoidList>, py::arg("s"), py::arg("quantities"), py::arg("offset") = py::none(), py::arg("tolerance") = 0.0)
+        .def("_sample_xy", &sample_xy<G2lib::ClothoidList>, py::arg("npts"), py::arg("out") = py::none(), py::arg("offset") = py::none(), py::arg("tolerance") = 0.0)
+
+        .def("length", &G2lib::ClothoidList::length)
+        .def("ThetaStart", &G2lib::ClothoidList::thetaBegin)
+        .def("ThetaEnd", &G2lib::ClothoidList::thetaEnd)
+        .def("XStart", &G2lib::ClothoidList::xBegin)
+        .def("XEnd", &G2lib::ClothoidList::xEnd)
+        .def("YStart", &G2lib::ClothoidList::yBegin)
+        .def("YEnd", &G2lib::ClothoidList::yEnd)
+        .def("KappaStart", &G2lib::ClothoidList::kappaBegin)
+        .def("KappaEnd", &G2lib::ClothoidList::kappaEnd)
+
+        .def("_find_segment", &find_segment, py::arg("s"))
+        .def("_segment_stations", &segment_stations)
+        .def("_project_point",
+            [](const G2lib::ClothoidList& self, G2lib::real_type X, G2lib::real_type Y) {
+                G2lib::real_type x, y, s, t, DST;
+                {
+                    py::gil_scoped_release release;
+                    ensure_aabb_tree(self);
+                    self.closestPoint_ISO(X, Y, 0.0, x, y, s, t, DST);
+                }
+                return std::make_tuple(x, y, s, DST);
+            },
+            py::arg("X"),
+            py::arg("Y")
+        )
+        .def("_project_points", &project_points<G2lib::ClothoidList>, py::arg("xy"), py::arg("num_threads") = 1)
+        .def("_to_frenet", &to_frenet<G2lib::ClothoidList>, py::arg("xy"), py::arg("theta") = py::none(), py::arg("num_threads") = 1)
+        .def("_from_frenet", &from_frenet<G2lib::ClothoidList>, py::arg("s"), py::arg("d"), py::arg("heading_error") = py::none(),
+             py::arg("num_threads") = 1)
+        .def("_solve_for", &solve_for<G2lib::ClothoidList>, py::arg("quantity"), py::arg("values"), py::arg("num_threads") = 1)
+        .def("_bounding_triangles", &bounding_triangles<G2lib::ClothoidList>, py::arg("max_angle"), py::arg("max_size"), py::arg("offset"))
+        .def("_bounding_box", &bounding_box<G2lib::ClothoidList>, py::arg("offset"))
+        .def("_to_polyline", &list_to_polyline, py::arg("tol"))
+        ;
+
     py::class_<G2lib::G2solve3arc>(m, "G2solve3arc")
         .def(py::init<>())
-        .def("build",&G2lib::G2solve3arc::build, py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("k0"), py::arg("x1"), py::arg("y1"), py::arg("t1"), py::arg("k1"), py::arg("Dmax") = 0, py::arg("dmax") = 0)
+        .def("build",&G2lib::G2solve3arc::build, py::arg("x0"), py::arg("y0"), py::arg("t0"), py::arg("k0"), py::arg("x1"), py::arg("y1"), py::arg("t1"), py::arg("k1"), py::arg("Dmax") = 0, py::arg("dmax") = 0,
+            py::call_guard<py::gil_scoped_release>())
         .def("totalLength",&G2lib::G2solve3arc::totalLength)
         .def("getS0", &G2lib::G2solve3arc::getS0)
         .def("getS1", &G2lib::G2solve3arc::getS1)
         .def("getSM", &G2lib::G2solve3arc::getSM)
         ;
-}
\ No newline at end of file
+
+    py::class_<CurveIndex>(m, "CurveIndex")
+        .def(py::init<py::object, G2lib::real_type, G2lib::real_type, int>(),
+            py::arg("params"), py::arg("max_angle"), py::arg("max_size"), py::arg("num_threads") = 0)
+        .def(py::init<py::object, py::object, py::object>(), py::arg("params"), py::arg("pieces"), py::arg("nodes"))
+        .def("_state", &CurveIndex::state)
+        .def("__len__", &CurveIndex::size)
+        .def("_num_pieces", &CurveIndex::num_pieces)
+        .def_readonly("_params", &CurveIndex::params)
+        .def("_nearest", &index_nearest, py::arg("xy"), py::arg("k"), py::arg("max_distance"), py::arg("num_threads") = 0)
+        .def("_within_radius", &index_within_radius, py::arg("xy"), py::arg("radius"), py::arg("num_threads") = 0)
+        .def("_within_box", &index_within_box, py::arg("boxes"), py::arg("num_threads") = 0)
+        .def("_intersect", &index_intersect, py::arg("other"), py::arg("num_threads") = 0)
+        ;
+
+    py::class_<G2lib::PolyLine>(m, "PolyLine")
+        .def(py::init(&make_polyline), py::arg("xy"))
+        .def("_vertices", &polyline_vertices)
+        .def("length", &G2lib::PolyLine::length)
+        .def("numPoints", &G2lib::PolyLine::numPoints)
+        .def("_project_point",
+            [](const G2lib::PolyLine& self, G2lib::real_type X, G2lib::real_type Y) {
+                G2lib::real_type x, y, s, DST;
+                Edges(self).project(X, Y, x, y, s, DST);
+                return std::make_tuple(x, y, s, DST);
+            },
+            py::arg("X"),
+            py::arg("Y")
+        )
+        .def("_intersect", &polyline_intersect, py::arg("other"), py::arg("first_only") = false)
+        .def("_intersect_clothoid", &polyline_intersect_clothoid, py::arg("curve"))
+        .def("_distance_to_clothoid", &polyline_distance_to_clothoid, py::arg("curve"))
+        ;
+
+    py::class_<CurveTracker>(m, "CurveTracker")
+        .def(py::init<const G2lib::ClothoidCurve&, G2lib::real_type, G2lib::real_type>(), py::arg("curve"), py::arg("window"), py::arg("max_jump"))
+        .def(py::init<const G2lib::ClothoidList&, G2lib::real_type, G2lib::real_type>(), py::arg("curve"), py::arg("window"), py::arg("max_jump"))
+        .def("_update", &CurveTracker::update, py::arg("X"), py::arg("Y"))
+        .def("_update_many", &CurveTracker::update_many, py::arg("xy"))
+        .def("_reset", &CurveTracker::reset, py::arg("s") = py::none())
+        .def("_position", &CurveTracker::position)
+        .def_readonly("_window", &CurveTracker::window)
+        .def_readonly("_max_jump", &CurveTracker::max_jump)
+        .def_property_readonly("_updates", &CurveTracker::get_updates)
+        .def_property_readonly("_fallbacks", &CurveTracker::get_fallbacks)
+        ;
+
+    m.def("_solve_g2_batch", &solve_g2_batch, py::arg("problems"), py::arg("num_threads") = 0);
+    m.def("_build_G1_batch", &build_G1_batch, py::arg("problems"), py::arg("tol"), py::arg("num_threads") = 0);
+    m.def("_build_forward_batch", &build_forward_batch, py::arg("problems"), py::arg("tol"), py::arg("num_threads") = 0);
+    m.def("_evaluate_columns", &evaluate_columns, py::arg("params"), py::arg("s"), py::arg("quantities"), py::arg("num_threads") = 1,
+          py::arg("tolerance") = 0.0);
+    m.def("_project_columns", &project_columns, py::arg("params"), py::arg("xy"), py::arg("num_threads") = 1);
+    m.def("_distance_columns", &distance_columns, py::arg("params"), py::arg("other_params"), py::arg("max_distance"),
+          py::arg("num_threads") = 0);
+    m.def("_polyline_columns", &polyline_columns, py::arg("params"), py::arg("tol"), py::arg("num_threads") = 0);
+    m.def("_bounding_triangles_columns", &bounding_triangles_columns, py::arg("params"), py::arg("max_angle"), py::arg("max_size"), py::arg("offset"),
+          py::arg("num_threads") = 0);
+    m.def("_bounding_box_columns", &bounding_box_columns, py::arg("params"), py::arg("offset"), py::arg("num_threads") = 0);
+}
@@ -0,0 +1,342 @@
+from .clothoid import Clothoid, G2BatchSolution
+from .path import ClothoidPath
+from .array import ClothoidArray
+from .index import ClothoidIndex
+
+import builtins
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b"CLOTHOID"
+VERSION = 1
+
+# The header is followed by the sections it points to, each starting on a multiple of ALIGNMENT bytes.  All
+# numbers are little endian:
+#
+# * magic (8 bytes), version (uint32), kind (uint32), count N of clothoids (uint64)
+# * offset of the parameter table (uint64): a float64 array of shape (6, N) whose rows are x0, y0, t0, k0,
+#   dk and L, the layout of `ClothoidArray`
+# * offset and length of the iteration counts of a `G2BatchSolution` (uint64 each): an int64 array
+# * offset and row count of the pieces and of the nodes of a spatial index (uint64 each): float64 arrays of
+#   shape (M, 7) and (K, 7), the pickled state of `ClothoidIndex`
+#
+# An offset of zero marks an absent section.
+HEADER = struct.Struct("<8sIIQQQQQQQQ")
+HEADER_SIZE = 128
+ALIGNMENT = 64
+
+(
+    KIND_CLOTHOID,
+    KIND_LIST,
+    KIND_TUPLE,
+    KIND_ARRAY,
+    KIND_INDEX,
+    KIND_PATH,
+    KIND_G2BATCH,
+) = range(7)
+
+_KIND_NAMES = (
+    "Clothoid",
+    "list",
+    "tuple",
+    "ClothoidArray",
+    "ClothoidIndex",
+    "ClothoidPath",
+    "G2BatchSolution",
+)
+
+
+def _Columns(clothoids):
+    return ClothoidArray.FromClothoids(clothoids)._Columns
+
+
+def _Align(f):
+    position = f.tell()
+    padding = -position % ALIGNMENT
+    f.write(b"\0" * padding)
+    return position + padding
+
+
+def _WriteSection(f, array, dtype):
+    offset = _Align(f)
+    np.ascontiguousarray(array, dtype=dtype).tofile(f)
+    return offset
+
+
+def save(obj, path, index=False):
+    """
+    Writes a Clothoid, a list or tuple of Clothoids such as the result of `SolveG2`, a `ClothoidPath`, a
+    `ClothoidArray`, a `ClothoidIndex` or a `G2BatchSolution` to a binary file at path, which `load` turns back
+    into an object of the same type and `open` maps into memory.
+
+    The spatial index pages of a ClothoidIndex are always stored, so that loading it does not rebuild the
+    hierarchy.  Pass `index = True` to build and store an index with the default settings of
+    `ClothoidIndex` for any other collection.
+    """
+    iterations = None
+    spatial = None
+    if isinstance(obj, Clothoid):
+        kind, columns = KIND_CLOTHOID, _Columns([obj])
+    elif isinstance(obj, ClothoidIndex):
+        kind, spatial = KIND_INDEX, obj
+        columns = obj._CurveIndex._params
+    elif isinstance(obj, ClothoidArray):
+        kind, columns = KIND_ARRAY, obj._Columns
+    elif isinstance(obj, ClothoidPath):
+        kind, columns = KIND_PATH, _Columns(obj)
+    elif isinstance(obj, G2BatchSolution):
+        kind = KIND_G2BATCH
+        columns = np.asarray(obj.Parameters, dtype=np.float64).reshape(-1, 6).T
+        iterations = np.asarray(obj.Iterations, dtype=np.int64)
+    elif isinstance(obj, (list, tuple)):
+        kind = KIND_TUPLE if isinstance(obj, tuple) else KIND_LIST
+        columns = _Columns(obj)
+    else:
+        raise TypeError(
+            "Cannot store an object of type '{}'".format(type(obj).__name__)
+        )
+    if index and spatial is None and columns.shape[1]:
+        spatial = ClothoidIndex(ClothoidArray._FromColumns(columns))
+    pieces, nodes = (
+        spatial._CurveIndex._state()[1:] if spatial is not None else (None, None)
+    )
+
+    with builtins.open(path, "wb") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        params_offset = _WriteSection(f, columns, "<f8")
+        iterations_offset = (
+            0 if iterations is None else _WriteSection(f, iterations, "<i8")
+        )
+        pieces_offset = 0 if pieces is None else _WriteSection(f, pieces, "<f8")
+        nodes_offset = 0 if nodes is None else _WriteSection(f, nodes, "<f8")
+        f.seek(0)
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                kind,
+                columns.shape[1],
+                params_offset,
+                iterations_offset,
+                0 if iterations is None else len(iterations),
+                pieces_offset,
+                0 if pieces is None else len(pieces),
+                nodes_offset,
+                0 if nodes is None else len(nodes),
+            )
+        )
+
+
+class _G2BatchWriter(object):
+    """
+    Writes the solutions of a stream of `G2BatchSolution` blocks to a file that `load` turns into a single
+    G2BatchSolution, without holding more than one block in memory.  The parameter table is stored row by
+    row, so each row is spooled to a temporary file next to path and the rows are concatenated by `Close`.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        self._path = path
+        self._rows = [tempfile.TemporaryFile(dir=directory) for _ in range(6)]
+        self._iterations = tempfile.TemporaryFile(dir=directory)
+        self._count = 0
+        self._problems = 0
+
+    def Write(self, solution):
+        columns = np.asarray(solution.Parameters, dtype="<f8").reshape(-1, 6)
+        for f, row in zip(self._rows, columns.T):
+            f.write(np.ascontiguousarray(row).tobytes())
+        self._iterations.write(np.asarray(solution.Iterations, dtype="<i8").tobytes())
+        self._count += len(columns)
+        self._problems += len(solution)
+
+    def Close(self):
+        try:
+            with builtins.open(self._path, "wb") as f:
+                f.write(b"\0" * HEADER_SIZE)
+                params_offset = _Align(f)
+                for row in self._rows:
+                    row.seek(0)
+                    shutil.copyfileobj(row, f)
+                iterations_offset = _Align(f)
+                self._iterations.seek(0)
+                shutil.copyfileobj(self._iterations, f)
+                f.seek(0)
+                f.write(
+                    HEADER.pack(
+                        MAGIC,
+                        VERSION,
+                        KIND_G2BATCH,
+                        self._count,
+                        params_offset,
+                        iterations_offset,
+                        self._problems,
+                        0,
+                        0,
+                        0,
+                        0,
+                    )
+                )
+        finally:
+            for f in self._rows + [self._iterations]:
+                f.close()
+
+
+class ClothoidStore(object):
+    """
+    A read-only view of a file written by `save`.  The file is mapped into memory rather than read, so opening
+    it is immediate whatever its size, and processes that open the same file share its pages through the
+    operating system.  Clothoid objects are only created when the store is indexed with an integer, and the
+    parameter table is available as a `ClothoidArray` that is backed by the mapping itself.
+
+    The file stays mapped as long as the store or any array taken from it is alive.
+    """
+
+    def __init__(self, path):
+        with builtins.open(path, "rb") as f:
+            size = f.seek(0, 2)
+            if size < HEADER_SIZE:
+                raise ValueError("'{}' is not a pyclothoids store".format(path))
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            self.Version,
+            self._kind,
+            count,
+            params_offset,
+            iterations_offset,
+            iterations_count,
+            self._pieces_offset,
+            self._pieces_count,
+            self._nodes_offset,
+            self._nodes_count,
+        ) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError("'{}' is not a pyclothoids store".format(path))
+        if self.Version > VERSION or self._kind >= len(_KIND_NAMES):
+            raise ValueError(
+                "'{}' was written by a newer version of pyclothoids (format version {})".format(
+                    path, self.Version
+                )
+            )
+        self._columns = self._Section(params_offset, "<f8", (6, count))
+        self._iterations = self._Section(iterations_offset, "<i8", (iterations_count,))
+        self._index = None
+
+    def _Section(self, offset, dtype, shape):
+        if not offset:
+            return None
+        count = int(np.prod(shape))
+        if offset + count * np.dtype(dtype).itemsize > len(self._mmap):
+            raise ValueError("The pyclothoids store is truncated")
+        return np.frombuffer(
+            self._mmap, dtype=dtype, count=count, offset=offset
+        ).reshape(shape)
+
+    def __len__(self):
+        return self._columns.shape[1]
+
+    def __getitem__(self, index):
+        return self.Clothoids[index]
+
+    def __iter__(self):
+        return iter(self.Clothoids)
+
+    def __str__(self):
+        return "ClothoidStore: {} clothoids saved from a {}".format(
+            len(self), self.Kind
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def Kind(self):
+        """
+        :getter: Returns the name of the type of the object that was saved, such as 'list' or 'ClothoidIndex'
+        :type: str
+        """
+        return _KIND_NAMES[self._kind]
+
+    @property
+    def Clothoids(self):
+        """
+        :getter: Returns a `ClothoidArray` of every clothoid in the file, backed by the mapped pages
+        :type: ClothoidArray
+        """
+        return ClothoidArray._FromColumns(self._columns)
+
+    @property
+    def HasIndex(self):
+        """
+        :getter: Returns True when the file holds the pages of a spatial index
+        :type: bool
+        """
+        return bool(self._pieces_offset)
+
+    @property
+    def Index(self):
+        """
+        :getter: Returns a `ClothoidIndex` over the clothoids of the file.  It is restored from a copy of the
+                 stored pages when there are some, without rebuilding the hierarchy, and built on first access
+                 otherwise.
+        :type: ClothoidIndex
+        """
+        if self._index is None:
+            if self.HasIndex:
+                index = ClothoidIndex.__new__(ClothoidIndex)
+                index.__setstate__(
+                    (
+                        self._columns,
+                        self._Section(
+                            self._pieces_offset, "<f8", (self._pieces_count, 7)
+                        ),
+                        self._Section(
+                            self._nodes_offset, "<f8", (self._nodes_count, 7)
+                        ),
+                    )
+                )
+                self._index = index
+            else:
+                self._index = ClothoidIndex(self.Clothoids)
+        return self._index
+
+    def Load(self):
+        """
+        Returns the saved object.  Arrays keep referring to the mapped pages.  Indexes and batch solutions copy
+        the data they need out of the mapping, since the index keeps its pages in C++ and a batch solution holds
+        its parameters in the transposed layout, while Clothoids, lists, tuples and paths are built in full.
+        """
+        kind = self._kind
+        if kind == KIND_CLOTHOID:
+            return self[0]
+        if kind == KIND_LIST:
+            return list(self)
+        if kind == KIND_TUPLE:
+            return tuple(self)
+        if kind == KIND_ARRAY:
+            return self.Clothoids
+        if kind == KIND_INDEX:
+            return self.Index
+        if kind == KIND_PATH:
+            return ClothoidPath(self)
+        return G2BatchSolution(self._columns.T.reshape(-1, 3, 6), self._iterations)
+
+
+def open(path):
+    """
+    Maps the file at path, written by `save`, into memory and returns a `ClothoidStore` for lazy access to it
+    """
+    return ClothoidStore(path)
+
+
+def load(path):
+    """
+    Returns the object saved at path by `save`
+    """
+    return ClothoidStore(path).Load()
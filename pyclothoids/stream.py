@@ -0,0 +1,136 @@
+from .clothoid import SolveG2Batch
+from .store import _G2BatchWriter
+
+import builtins
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+CHUNKSIZE = 65536
+
+
+def read_csv(path, chunksize=CHUNKSIZE, skiprows=0, delimiter=","):
+    """
+    Reads the G2 problems of a text file with one problem per line, the eight values x0, y0, t0, k0, x1, y1,
+    t1 and k1 separated by delimiter, after skipping skiprows header lines.  Yields float64 arrays of shape
+    (k, 8) holding up to chunksize problems each, so that only one block of the file is in memory at a time.
+    """
+    with builtins.open(path) as f:
+        lines = islice(f, skiprows, None)
+        while True:
+            block = list(islice(lines, chunksize))
+            if not block:
+                return
+            yield np.loadtxt(block, delimiter=delimiter, ndmin=2)
+
+
+def read_npy(path, chunksize=CHUNKSIZE):
+    """
+    Reads the G2 problems of a .npy file holding an array of shape (N, 8), as written by `numpy.save`.  The
+    file is mapped into memory and yields float64 copies of blocks of up to chunksize rows.
+    """
+    problems = np.load(path, mmap_mode="r")
+    if problems.ndim != 2 or problems.shape[1] != 8:
+        raise ValueError("'{}' does not hold an array of shape (N, 8)".format(path))
+    for begin in range(0, len(problems), chunksize):
+        yield np.array(problems[begin : begin + chunksize], dtype=np.float64)
+
+
+def _Blocks(chunks, chunksize):
+    # Gathers single rows into blocks of chunksize and splits longer blocks, so that every block holds at most
+    # chunksize problems
+    rows = []
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1 and chunk.shape == (8,):
+            rows.append(chunk)
+            if len(rows) == chunksize:
+                yield np.stack(rows)
+                rows = []
+            continue
+        if chunk.ndim != 2 or chunk.shape[1] != 8:
+            raise ValueError(
+                "chunks must hold blocks of shape (k, 8) or rows of 8 values, not an array of shape {}".format(
+                    chunk.shape
+                )
+            )
+        if rows:
+            yield np.stack(rows)
+            rows = []
+        for begin in range(0, len(chunk), chunksize):
+            yield chunk[begin : begin + chunksize]
+    if rows:
+        yield np.stack(rows)
+
+
+def _Solve(block, Dmax, dmax, num_threads):
+    return SolveG2Batch(*block.T, Dmax=Dmax, dmax=dmax, num_threads=num_threads)
+
+
+def solve_g2(
+    chunks, Dmax=0, dmax=0, num_threads=0, chunksize=CHUNKSIZE, prefetch=1, out=None
+):
+    """
+    Solves a stream of G2 interpolation problems block by block, yielding a `G2BatchSolution` for each block
+    in the order of the input.  chunks is an iterable of float64 blocks of shape (k, 8) whose rows are the
+    arguments x0, y0, t0, k0, x1, y1, t1, k1 of `SolveG2`, or of single rows of 8 values, or the path of a
+    .npy file or of a CSV file without a header, read by `read_npy` and `read_csv`.  Rows are gathered into
+    blocks of chunksize problems and longer blocks are split, and every block is solved by `SolveG2Batch`
+    across num_threads threads.
+
+    This is a generator: blocks are read from chunks only as the solutions are consumed.  While the caller
+    processes one block, the next prefetch blocks are solved on a background thread, so that at most
+    prefetch + 2 blocks of problems and solutions are held at once, whatever the length of the stream.  Pass
+    `prefetch = 0` to solve each block only when it is requested.
+
+    Pass the path of a file as out to also write every yielded solution to it, in the format of
+    `pyclothoids.store`, where `store.load` returns them as a single G2BatchSolution.  The file is written
+    when the generator is exhausted or closed, and holds the solutions yielded until then.
+
+    ::
+
+        for solution in stream.solve_g2('boundary_conditions.npy', out='roads.clothoids'):
+            failures += (~solution.Converged).sum()
+    """
+    if isinstance(chunks, (str, os.PathLike)):
+        path = os.fspath(chunks)
+        read = read_npy if path.endswith(".npy") else read_csv
+        chunks = read(path, chunksize)
+    if chunksize < 1 or prefetch < 0:
+        raise ValueError("chunksize must be positive and prefetch non-negative")
+    blocks = _Blocks(chunks, chunksize)
+    writer = None if out is None else _G2BatchWriter(out)
+    try:
+        if prefetch == 0:
+            for block in blocks:
+                solution = _Solve(block, Dmax, dmax, num_threads)
+                if writer is not None:
+                    writer.Write(solution)
+                yield solution
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = deque()
+            try:
+                for block in blocks:
+                    pending.append(
+                        executor.submit(_Solve, block, Dmax, dmax, num_threads)
+                    )
+                    if len(pending) > prefetch:
+                        solution = pending.popleft().result()
+                        if writer is not None:
+                            writer.Write(solution)
+                        yield solution
+                while pending:
+                    solution = pending.popleft().result()
+                    if writer is not None:
+                        writer.Write(solution)
+                    yield solution
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        if writer is not None:
+            writer.Close()
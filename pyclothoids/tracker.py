@@ -0,0 +1,94 @@
+from ._clothoids_cpp import CurveTracker
+from .clothoid import Clothoid
+from .path import ClothoidPath
+
+
+class Tracker(object):
+    """
+    Follows a point that moves along a Clothoid or ClothoidPath, such as a vehicle along its route, and converts
+    each new position to Frenet coordinates.  Consecutive positions project close to each other, so instead of
+    searching the whole curve, each update predicts the arc length from the last two updates and searches only
+    the arc lengths within window of the prediction, which takes a few Newton steps on one or two segments.
+
+    The tracker falls back to a global search of the curve on the first update, after `Reset`, when the closest
+    point lies on an edge of the window, since the point then moved farther than the window, and when the
+    distance between the point and the curve grew by more than max_jump since the last update, since a closer
+    branch of the curve may lie outside the window.  window and max_jump are in the length units of the curve.
+
+    The curve is copied when the tracker is created, so later changes to a ClothoidPath do not affect it.
+    Threads that share a tracker update it one at a time, also without the GIL, but in no particular order, so
+    each moving point should have a tracker of its own.
+    """
+
+    def __init__(self, curve, window=5.0, max_jump=1.0):
+        if isinstance(curve, Clothoid):
+            curve = curve._ClothoidCurve
+        elif isinstance(curve, ClothoidPath):
+            curve = curve._ClothoidList
+        else:
+            raise TypeError("Tracker requires a Clothoid or a ClothoidPath")
+        if not window > 0:
+            raise ValueError("window must be positive")
+        self._CurveTracker = CurveTracker(curve, window, max_jump)
+
+    def __str__(self):
+        return "Tracker: {} updates, {} global searches".format(
+            self.Updates, self.Fallbacks
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    def Update(self, X, Y):
+        """
+        Moves the tracked point to (X, Y).  Returns a tuple holding the arc length of its closest point on the
+        curve and its signed lateral offset, positive to the left, as `Clothoid.ToFrenet` does.
+        """
+        return self._CurveTracker._update(X, Y)
+
+    def UpdateMany(self, xy):
+        """
+        Moves the tracked point through every position of an array-like of shape (2, n) in order, in a single
+        call to the C++ layer.  Returns a float64 numpy array of shape (2, n) holding the arc lengths and signed
+        lateral offsets after each update.
+        """
+        return self._CurveTracker._update_many(xy)
+
+    def Reset(self, s=None):
+        """
+        Forgets the tracked position, so that the next update searches the whole curve.  Pass the arc length s
+        to restart tracking from a known position instead.
+        """
+        self._CurveTracker._reset(s)
+
+    @property
+    def Position(self):
+        """
+        The Frenet coordinates returned by the last update
+
+        :getter: Returns a tuple (s, d), or None before the first update and after `Reset`
+        :type: tuple
+        """
+        return self._CurveTracker._position()
+
+    @property
+    def Window(self):
+        return self._CurveTracker._window
+
+    @property
+    def MaxJump(self):
+        return self._CurveTracker._max_jump
+
+    @property
+    def Updates(self):
+        """
+        The number of updates since the tracker was created
+        """
+        return self._CurveTracker._updates
+
+    @property
+    def Fallbacks(self):
+        """
+        The number of updates that searched the whole curve instead of the window
+        """
+        return self._CurveTracker._fallbacks
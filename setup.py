@@ -151,11 +151,11 @@ class BuildExt(build_ext):
 
     c_opts = {
         "msvc": ["/EHsc"],
-        "unix": [],
+        "unix": ["-pthread"],
     }
     l_opts = {
         "msvc": [],
-        "unix": [],
+        "unix": ["-pthread"],
     }
 
     if sys.platform == "darwin":
@@ -196,7 +196,7 @@ setup(
     long_description_content_type="text/markdown",
     packages=["pyclothoids"],
     ext_modules=extensions,
-    install_requires=["pybind11>=2.4"],
+    install_requires=["pybind11>=2.4", "numpy"],
     setup_requires=["pybind11>=2.4"],
     cmdclass={"build_ext": BuildExt},
     zip_safe=False,
@@ -0,0 +1,40 @@
+import pytest
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray
+
+# --- Helper Functions ---
+
+
+def random_params(n, seed, extent, max_kappa, max_dk, lengths):
+    # The StandardParams x0, y0, t0, k0, dk, L of n random clothoids, one array each, drawn in that order
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-extent, extent, n),
+        rng.uniform(-extent, extent, n),
+        rng.uniform(-math.pi, math.pi, n),
+        rng.uniform(-max_kappa, max_kappa, n),
+        rng.uniform(-max_dk, max_dk, n),
+        rng.uniform(*lengths, n),
+    )
+
+
+def make_array(n=20, seed=7, extent=5, max_kappa=0.2, max_dk=0.02, lengths=(1, 10)):
+    return ClothoidArray(*random_params(n, seed, extent, max_kappa, max_dk, lengths))
+
+
+def random_clothoids(
+    n=20, seed=7, extent=5, max_kappa=0.2, max_dk=0.02, lengths=(1, 10)
+):
+    # The clothoids of make_array as a list of Clothoid objects
+    return [
+        Clothoid.StandardParams(*params)
+        for params in zip(*random_params(n, seed, extent, max_kappa, max_dk, lengths))
+    ]
+
+
+def assert_same_curves(actual, expected, abs=0):
+    # Pairwise compares the parameters of two sequences of clothoids, exactly by default
+    assert len(actual) == len(expected)
+    for clothoid, other in zip(actual, expected):
+        assert clothoid.Parameters == pytest.approx(other.Parameters, rel=0, abs=abs)
@@ -0,0 +1,136 @@
+import pytest
+import pickle
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray, TransformChain
+from conftest import make_array, assert_same_curves
+
+# --- Test Construction ---
+
+
+def test_construction():
+    clothoids = [
+        Clothoid.StandardParams(0, 0, 0, 0.1, 0.01, 5),
+        Clothoid.StandardParams(1, 2, 0.5, -0.1, 0.0, 3),
+    ]
+    array = ClothoidArray.FromClothoids(clothoids)
+    assert len(array) == 2
+    assert array.Parameters.shape == (2, 6)
+    assert array.length == pytest.approx([5, 3])
+    assert_same_curves(array, clothoids, abs=1e-9)
+    assert array[-1].Parameters == pytest.approx(clothoids[-1].Parameters)
+    assert len(array[array.length > 4]) == 1
+    with pytest.raises(IndexError):
+        array[2]
+    with pytest.raises(ValueError):
+        array.Parameters[0, 0] = 1.0
+
+
+def test_broadcast_construction():
+    array = ClothoidArray(np.arange(4), 0, 0, 0, 0, 1)
+    assert array.XStart == pytest.approx([0, 1, 2, 3])
+    assert array.length == pytest.approx([1, 1, 1, 1])
+
+
+def test_pickling():
+    array = make_array()
+    restored = pickle.loads(pickle.dumps(array))
+    np.testing.assert_array_equal(restored.Parameters, array.Parameters)
+
+
+# --- Test Evaluation ---
+
+
+def test_evaluate():
+    array = make_array()
+    s = array.length[:, np.newaxis] * np.linspace(0, 1, 7)
+    result = array.Evaluate(s, ("X", "Y", "Theta", "Kappa", "XD"))
+    assert result.shape == (5, len(array), 7)
+    for i, clothoid in enumerate(array):
+        assert result[:, i] == pytest.approx(
+            clothoid.Evaluate(s[i], ("X", "Y", "Theta", "Kappa", "XD")), abs=1e-12
+        )
+    shared = array.Evaluate(np.linspace(0, 1, 3)[np.newaxis, :], ("Y",), num_threads=0)
+    assert shared.shape == (1, len(array), 3)
+    assert array.XEnd == pytest.approx([c.XEnd for c in array])
+    assert array.ThetaEnd == pytest.approx([c.ThetaEnd for c in array])
+    assert array.KappaEnd == pytest.approx([c.KappaEnd for c in array])
+    with pytest.raises(ValueError):
+        array.Evaluate(np.zeros(len(array) + 1))
+
+
+def test_sample_xy():
+    array = make_array()
+    xy = array.SampleXY(11)
+    assert xy.shape == (2, len(array), 11)
+    for i, clothoid in enumerate(array):
+        assert xy[:, i] == pytest.approx(clothoid.SampleXY(11), abs=1e-12)
+
+
+def test_project_points():
+    array = make_array()
+    rng = np.random.default_rng(3)
+    xy = rng.uniform(-10, 10, (2, len(array)))
+    projected = array.ProjectPoints(xy)
+    for i, clothoid in enumerate(array):
+        assert projected[:, i] == pytest.approx(
+            clothoid.ProjectPoints(xy[:, i]), abs=1e-9
+        )
+    distances = array.Distance(1.0, -2.0)
+    assert distances == pytest.approx([c.Distance(1.0, -2.0) for c in array], abs=1e-9)
+
+
+# --- Test Transformations ---
+
+
+def test_transforms_match_clothoid():
+    array = make_array()
+    clothoids = list(array)
+    assert_same_curves(
+        array.Translate(1, -2), [c.Translate(1, -2) for c in clothoids], abs=1e-9
+    )
+    assert_same_curves(
+        array.Rotate(0.3, (1, 1)), [c.Rotate(0.3, (1, 1)) for c in clothoids], abs=1e-9
+    )
+    assert_same_curves(
+        array.Scale(2, (1, 0)), [c.Scale(2, (1, 0)) for c in clothoids], abs=1e-9
+    )
+    assert_same_curves(
+        array.Scale(0.5, "start"), [c.Scale(0.5, "start") for c in clothoids], abs=1e-9
+    )
+    assert_same_curves(
+        array.Trim(0.5, 1.0), [c.Trim(0.5, 1.0) for c in clothoids], abs=1e-9
+    )
+    for axis in ("x", "y", "start"):
+        assert_same_curves(
+            array.Flip(axis), [c.Flip(axis) for c in clothoids], abs=1e-9
+        )
+    reversed_array = array.Reverse()
+    for clothoid, expected in zip(reversed_array, clothoids):
+        expected = expected.Reverse()
+        assert clothoid.XStart == pytest.approx(expected.XStart)
+        assert clothoid.YStart == pytest.approx(expected.YStart)
+        assert clothoid.KappaStart == pytest.approx(expected.KappaStart)
+        assert math.cos(clothoid.ThetaStart - expected.ThetaStart) == pytest.approx(1)
+
+
+def test_transform_chain():
+    array = make_array()
+    chain = (
+        TransformChain()
+        .Rotate(math.pi / 3, (2, 0))
+        .Scale(-1.5, (0, 1))
+        .Translate(4, 5)
+        .Rotate(-0.2)
+    )
+    expected = [
+        c.Rotate(math.pi / 3, (2, 0)).Scale(-1.5, (0, 1)).Translate(4, 5).Rotate(-0.2)
+        for c in array
+    ]
+    transformed = array.Transform(chain)
+    for clothoid, other in zip(transformed, expected):
+        assert clothoid.Parameters[:2] == pytest.approx(other.Parameters[:2])
+        assert clothoid.Parameters[3:] == pytest.approx(other.Parameters[3:])
+        assert math.cos(clothoid.ThetaStart - other.ThetaStart) == pytest.approx(1)
+    with pytest.raises(ValueError):
+        TransformChain().Scale(0)
@@ -0,0 +1,132 @@
+import pytest
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray, ClothoidPath, SolveG2
+
+# --- Helper Functions ---
+
+
+def band_points(clothoid, offset, n=301):
+    # Points of the band of half width offset around the clothoid, with their arc lengths
+    s = np.linspace(0, clothoid.length, n)
+    x, y, theta = clothoid.X(s), clothoid.Y(s), clothoid.Theta(s)
+    t = np.linspace(-offset, offset, 5)[:, None]
+    return (
+        np.broadcast_to(s, (5, n)).ravel(),
+        (x - t * np.sin(theta)).ravel(),
+        (y + t * np.cos(theta)).ravel(),
+    )
+
+
+def contains(triangle, x, y, eps=1e-9):
+    corners = triangle[:6].reshape(3, 2)
+    sides = [
+        (b[0] - a[0]) * (y - a[1]) - (b[1] - a[1]) * (x - a[0])
+        for a, b in zip(corners, np.roll(corners, -1, axis=0))
+    ]
+    return np.all(np.array(sides) >= -eps, axis=0) | np.all(
+        np.array(sides) <= eps, axis=0
+    )
+
+
+def assert_covered(triangles, s, x, y):
+    for triangle in triangles:
+        inside = (s >= triangle[6]) & (s <= triangle[7])
+        assert contains(triangle, x[inside], y[inside]).all()
+
+
+CLOTHOIDS = [
+    Clothoid.StandardParams(1, 2, 0.3, 0.2, 0.05, 20),
+    Clothoid.StandardParams(0, 0, -1, 0.5, -0.08, 15),
+    Clothoid.StandardParams(0, 0, 2, 0, 0, 10),
+    Clothoid.StandardParams(-3, 1, 0, 1.5, 0, 6),
+]
+
+# --- Test Clothoid ---
+
+
+@pytest.mark.parametrize("clothoid", CLOTHOIDS)
+@pytest.mark.parametrize("offset", [0, 0.5, 2])
+@pytest.mark.parametrize("max_angle,max_size", [(math.pi / 18, math.inf), (1, 2)])
+def test_bounding_triangles_cover_band(clothoid, offset, max_angle, max_size):
+    triangles = clothoid.BoundingTriangles(max_angle, max_size, offset)
+    assert triangles.shape[1] == 8
+    assert triangles[0, 6] == 0
+    assert triangles[-1, 7] == pytest.approx(clothoid.length)
+    assert triangles[1:, 6] == pytest.approx(triangles[:-1, 7])
+    assert (triangles[:, 7] - triangles[:, 6] <= max_size + 1e-9).all()
+    turn = np.abs(clothoid.Theta(triangles[:, 7]) - clothoid.Theta(triangles[:, 6]))
+    assert (turn <= max_angle + 1e-9).all()
+    assert_covered(triangles, *band_points(clothoid, offset))
+
+
+def test_bounding_triangles_of_a_line():
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    (triangle,) = line.BoundingTriangles(offset=1)
+    xy = triangle[:6].reshape(3, 2)
+    # about twice as long as the line and four times as wide as the offset
+    assert np.ptp(xy[:, 0]) == pytest.approx(20.4, abs=0.1)
+    assert np.ptp(xy[:, 1]) == pytest.approx(4, abs=0.1)
+    assert len(line.BoundingTriangles(max_size=2.5, offset=1)) == 4
+
+
+def test_bounding_triangles_arguments():
+    clothoid = CLOTHOIDS[0]
+    with pytest.raises(ValueError):
+        clothoid.BoundingTriangles(0)
+    with pytest.raises(ValueError):
+        clothoid.BoundingTriangles(max_size=0)
+    with pytest.raises(ValueError):
+        clothoid.BoundingBox(-1)
+
+
+@pytest.mark.parametrize("clothoid", CLOTHOIDS)
+@pytest.mark.parametrize("offset", [0, 0.5, 2])
+def test_bounding_box_is_exact(clothoid, offset):
+    _, x, y = band_points(clothoid, offset, n=20001)
+    box = clothoid.BoundingBox(offset)
+    assert box == pytest.approx((x.min(), y.min(), x.max(), y.max()), abs=1e-5)
+    assert box[0] <= x.min() and box[1] <= y.min()
+    assert box[2] >= x.max() and box[3] >= y.max()
+
+
+def test_bounding_box_of_offset_cusp():
+    # A half circle of radius 0.5 swept with a half width of 2 reaches across its center
+    circle = Clothoid.StandardParams(0, 0, 0, 2, 0, math.pi / 2)
+    assert circle.BoundingBox(2) == pytest.approx((-1.5, -2, 2.5, 3))
+
+
+# --- Test Paths and Arrays ---
+
+
+def test_path_bounds():
+    path = ClothoidPath(SolveG2(0, 0, 0, 0, 10, 5, 1, 0))
+    triangles = path.BoundingTriangles(offset=1)
+    s = 0
+    for clothoid in path:
+        segment = clothoid.BoundingTriangles(offset=1)
+        segment[:, 6:] += s
+        assert triangles[: len(segment)] == pytest.approx(segment)
+        triangles = triangles[len(segment) :]
+        s += clothoid.length
+    assert len(triangles) == 0
+    boxes = np.array([clothoid.BoundingBox(1) for clothoid in path])
+    assert path.BoundingBox(1) == pytest.approx(
+        (*boxes[:, :2].min(axis=0), *boxes[:, 2:].max(axis=0))
+    )
+
+
+@pytest.mark.parametrize("num_threads", [1, 3, 0])
+def test_array_bounds(num_threads):
+    array = ClothoidArray.FromClothoids(CLOTHOIDS)
+    triangles, offsets = array.BoundingTriangles(
+        max_size=3, offset=0.5, num_threads=num_threads
+    )
+    assert offsets[0] == 0 and offsets[-1] == len(triangles)
+    boxes = array.BoundingBoxes(0.5, num_threads=num_threads)
+    assert boxes.shape == (len(CLOTHOIDS), 4)
+    for i, clothoid in enumerate(CLOTHOIDS):
+        assert triangles[offsets[i] : offsets[i + 1]] == pytest.approx(
+            clothoid.BoundingTriangles(max_size=3, offset=0.5)
+        )
+        assert boxes[i] == pytest.approx(clothoid.BoundingBox(0.5))
@@ -1,7 +1,17 @@
 import pytest
+import copy
 import pickle
 import math
-from pyclothoids import Clothoid, SolveG2
+import numpy as np
+import pyclothoids
+from pyclothoids import (
+    Clothoid,
+    SolveG2,
+    SolveG2Batch,
+    G1HermiteBatch,
+    ForwardBatch,
+    ProjectionCache,
+)
 
 # --- Helper Functions ---
 
@@ -54,6 +64,192 @@ def test_g1_hermite(x0, y0, t0, x1, y1, t1):
     )
 
 
+@pytest.mark.parametrize("num_threads", [1, 3, 0])
+def test_g1_hermite_batch(num_threads):
+    rng = np.random.default_rng(1)
+    x1, y1 = rng.uniform(1, 5, size=(2, 25))
+    t1 = rng.uniform(-1, 1, size=25)
+    parameters, converged = G1HermiteBatch(
+        0, 0, 0.2, x1, y1, t1, num_threads=num_threads
+    )
+    assert parameters.shape == (25, 6)
+    assert converged.all()
+    for row, x, y, t in zip(parameters, x1, y1, t1):
+        assert tuple(row) == pytest.approx(
+            Clothoid.G1Hermite(0, 0, 0.2, x, y, t).Parameters
+        )
+
+
+def test_forward_batch():
+    x1 = np.array([1.0, 2.0, 3.0])
+    parameters, converged = ForwardBatch(0, 0, 0, 0.1, x1, 1.0)
+    assert converged.all()
+    for row, x in zip(parameters, x1):
+        assert tuple(row) == pytest.approx(
+            Clothoid.Forward(0, 0, 0, 0.1, x, 1.0).Parameters
+        )
+        clothoid = Clothoid.StandardParams(*row)
+        assert (clothoid.XEnd, clothoid.YEnd) == pytest.approx((x, 1.0))
+
+
+def test_batch_failure_flags():
+    # coincident endpoints have no G1 solution
+    parameters, converged = G1HermiteBatch(0, 0, 0, [0, 1], 0, 0)
+    assert list(converged) == [False, True]
+    assert np.isnan(parameters[0]).all()
+
+
+def test_clothoid_is_immutable():
+    clothoid = Clothoid.StandardParams(1, 2, 0.5, 0.1, 0.01, 5)
+    assert clothoid.Parameters == (1, 2, 0.5, 0.1, 0.01, 5)
+    with pytest.raises(AttributeError):
+        clothoid.length = 3
+    with pytest.raises(AttributeError):
+        del clothoid.XStart
+    with pytest.raises(AttributeError):
+        clothoid.anything = 1
+    with pytest.raises(AttributeError):
+        clothoid.NoSuchAttribute
+    assert not hasattr(clothoid, "__dict__")
+    copied = Clothoid(clothoid)
+    assert copied.Parameters == clothoid.Parameters
+    assert copied.X(2.0) == clothoid.X(2.0)
+
+
+# --- Test Vectorized Evaluation ---
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "X",
+        "XD",
+        "XDD",
+        "XDDD",
+        "Y",
+        "YD",
+        "YDD",
+        "YDDD",
+        "Theta",
+        "ThetaD",
+        "ThetaDD",
+        "ThetaDDD",
+    ],
+)
+def test_vectorized_evaluation(name):
+    clothoid = Clothoid.StandardParams(1, 2, 0.3, 0.1, -0.05, 5)
+    s = np.linspace(0, clothoid.length, 12).reshape(3, 4)
+    values = getattr(clothoid, name)(s)
+    assert isinstance(values, np.ndarray)
+    assert values.shape == s.shape
+    expected = [getattr(clothoid, name)(i) for i in s.ravel()]
+    assert values.ravel() == pytest.approx(expected)
+    assert isinstance(getattr(clothoid, name)(1.5), float)
+
+
+def test_evaluate():
+    clothoid = Clothoid.StandardParams(1, 2, 0.3, 0.1, -0.05, 5)
+    s = [0.0, 1.0, 2.5, 5.0]
+    X, Y, Theta, Kappa = clothoid.Evaluate(s)
+    assert X == pytest.approx(clothoid.X(s))
+    assert Y == pytest.approx(clothoid.Y(s))
+    assert Theta == pytest.approx(clothoid.Theta(s))
+    assert Kappa == pytest.approx(clothoid.ThetaD(s))
+    YD, XD = clothoid.Evaluate(s, ("YD", "XD"))
+    assert XD == pytest.approx(clothoid.XD(s))
+    assert YD == pytest.approx(clothoid.YD(s))
+    with pytest.raises(ValueError):
+        clothoid.Evaluate(s, ("Z",))
+
+
+def test_evaluate_offset():
+    clothoid = Clothoid.StandardParams(1, 2, 0.3, 0.1, -0.05, 5)
+    s = np.linspace(0, 5, 7)
+    X, Y, XD, Theta, Kappa, KappaD = clothoid.Evaluate(
+        s, ("X", "Y", "XD", "Theta", "Kappa", "KappaD"), offset=0.5
+    )
+    assert np.array([X, Y]) == pytest.approx(clothoid.FromFrenet(s, 0.5))
+    assert Theta == pytest.approx(clothoid.Theta(s))
+    kappa = clothoid.ThetaD(s)
+    assert Kappa == pytest.approx(kappa / (1 - 0.5 * kappa))
+    h = 1e-6
+    ahead, behind = (
+        clothoid.Evaluate(s + d, ("X", "Kappa"), offset=0.5) for d in (h, -h)
+    )
+    assert XD == pytest.approx((ahead[0] - behind[0]) / (2 * h), abs=1e-6)
+    assert KappaD == pytest.approx((ahead[1] - behind[1]) / (2 * h), abs=1e-6)
+    # one row of offsets per lane boundary, broadcast against the arc lengths
+    offsets = np.array([[-3.5], [0], [3.5]])
+    edges = clothoid.Evaluate(s, ("X", "Y"), offset=offsets)
+    assert edges.shape == (2, 3, 7)
+    for row, offset in zip(np.moveaxis(edges, 1, 0), offsets[:, 0]):
+        assert row == pytest.approx(clothoid.FromFrenet(s, offset))
+    assert clothoid.Evaluate(s, offset=0) == pytest.approx(clothoid.Evaluate(s))
+    with pytest.raises(ValueError):
+        clothoid.Evaluate(s, offset=[1, 2])
+
+
+# --- Test Sampling ---
+
+
+def test_sample_xy():
+    clothoid = Clothoid.StandardParams(1, 2, 0.3, 0.1, -0.05, 5)
+    xy = clothoid.SampleXY(11)
+    assert xy.shape == (2, 11)
+    s = np.linspace(0, clothoid.length, 11)
+    assert xy[0] == pytest.approx(clothoid.X(s))
+    assert xy[1] == pytest.approx(clothoid.Y(s))
+    out = np.empty((2, 11))
+    assert clothoid.SampleXY(11, out=out) is out
+    assert np.array_equal(out, xy)
+    with pytest.raises(ValueError):
+        clothoid.SampleXY(11, out=np.empty((2, 10)))
+
+
+def test_sample_xy_offset():
+    clothoid = Clothoid.StandardParams(1, 2, 0.3, 0.1, -0.05, 5)
+    s = np.linspace(0, clothoid.length, 11)
+    assert clothoid.SampleXY(11, offset=-1.5) == pytest.approx(
+        clothoid.FromFrenet(s, -1.5)
+    )
+    offsets = np.linspace(-1, 1, 11)
+    assert clothoid.SampleXY(11, offset=offsets) == pytest.approx(
+        clothoid.FromFrenet(s, offsets)
+    )
+
+
+@pytest.mark.parametrize("max_chord_error", [1e-1, 1e-3, 1e-5])
+def test_sample_adaptive(max_chord_error):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.0, 0.02, 20)
+    xy = clothoid.SampleAdaptive(max_chord_error, max_angle_step=math.pi)
+    assert xy[:, 0] == pytest.approx([clothoid.XStart, clothoid.YStart])
+    assert xy[:, -1] == pytest.approx([clothoid.XEnd, clothoid.YEnd])
+    stations = [clothoid.ClosestPointArcLength(x, y) for x, y in xy.T]
+    for (x0, y0), (x1, y1), s0, s1 in zip(xy.T, xy.T[1:], stations, stations[1:]):
+        # deviation of the curve between two neighbours from the chord joining them
+        s = np.linspace(s0, s1, 101)
+        chord = math.hypot(x1 - x0, y1 - y0)
+        cross = (clothoid.X(s) - x0) * (y1 - y0) - (clothoid.Y(s) - y0) * (x1 - x0)
+        assert np.abs(cross).max() / chord <= max_chord_error * (1 + 1e-6)
+    # point density follows the curvature, which grows along this clothoid
+    spacing = np.hypot(*np.diff(xy))
+    assert spacing[0] > spacing[-2]
+
+
+def test_sample_adaptive_line():
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0, 0, 1000)
+    assert clothoid.SampleAdaptive(1e-3).shape == (2, 2)
+
+
+def test_sample_adaptive_too_many_points():
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.5, 0, 1000)
+    assert clothoid.SampleAdaptive(1e-6).shape == (2, 250001)
+    with pytest.raises(ValueError, match="requires about 250002866 points"):
+        clothoid.SampleAdaptive(1e-12)
+    with pytest.raises(ValueError, match="points"):
+        clothoid.SampleAdaptive(1e-3, max_angle_step=1e-9)
+
+
 # --- Test Pickling ---
 
 
@@ -218,6 +414,117 @@ def test_distance_to_clothoid(x, y):
     assert distance >= 0
 
 
+@pytest.mark.parametrize("num_threads", [1, 4, 0])
+def test_project_points(num_threads):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.1, 0.01, 5)
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(-2, 6, size=(2, 50))
+    px, py, s, d = clothoid.ProjectPoints(xy, num_threads=num_threads)
+    for i, (x, y) in enumerate(xy.T):
+        assert (px[i], py[i]) == pytest.approx(clothoid.ClosestPoint(x, y))
+        assert s[i] == pytest.approx(clothoid.ClosestPointArcLength(x, y))
+        assert abs(d[i]) == pytest.approx(clothoid.Distance(x, y))
+    assert clothoid.ProjectPoints([[0.0], [1.0]])[3] == pytest.approx([1.0])
+    assert clothoid.ProjectPoints([[0.0], [-1.0]])[3] == pytest.approx([-1.0])
+    assert clothoid.ProjectPoints(xy.reshape(2, 5, 10)).shape == (4, 5, 10)
+
+
+@pytest.mark.parametrize("offset", [1.5, -2.0, "per point"])
+def test_project_points_offset(offset):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.1, 0.05, 10)
+    rng = np.random.default_rng(1)
+    xy = rng.uniform(-5, 10, size=(2, 40))
+    if offset == "per point":
+        offset = rng.uniform(-3, 3, 40)
+    px, py, s, d = clothoid.ProjectPoints(xy, offset=offset)
+    offset = np.broadcast_to(offset, (40,))
+    stations = np.linspace(0, clothoid.length, 20001)
+    for i, (x, y) in enumerate(xy.T):
+        ex, ey = clothoid.Evaluate(stations, ("X", "Y"), offset=offset[i])
+        assert abs(d[i]) == pytest.approx(np.hypot(ex - x, ey - y).min(), abs=1e-5)
+        assert (px[i], py[i]) == pytest.approx(
+            tuple(clothoid.Evaluate(s[i], ("X", "Y"), offset=offset[i]))
+        )
+    # the sign tells the side of the offset curve
+    assert clothoid.ProjectPoints([[0.0], [3.0]], offset=2)[3] == pytest.approx([1])
+    assert clothoid.ProjectPoints([[0.0], [1.0]], offset=2)[3] == pytest.approx([-1])
+    # NaN points or offsets project to NaN
+    projected = clothoid.ProjectPoints(
+        [[math.nan, 0.0], [1.0, 1.0]], offset=[1, math.nan]
+    )
+    assert np.isnan(projected).all()
+
+
+@pytest.mark.parametrize("num_threads", [1, 0])
+def test_frenet_round_trip(num_threads):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.1, 0.01, 5)
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(-2, 6, size=(2, 50))
+    theta = rng.uniform(-math.pi, math.pi, 50)
+    s, d, error = clothoid.ToFrenet(xy, theta, num_threads=num_threads)
+    px, py, ps, pd = clothoid.ProjectPoints(xy)
+    inside = (s > 0) & (s < clothoid.length)
+    assert s[inside] == pytest.approx(ps[inside])
+    assert d[inside] == pytest.approx(pd[inside])
+    assert np.all(np.abs(error) <= math.pi)
+    x, y, heading = clothoid.FromFrenet(s, d, error, num_threads=num_threads)
+    assert x == pytest.approx(xy[0])
+    assert y == pytest.approx(xy[1])
+    assert np.cos(heading) == pytest.approx(np.cos(theta))
+    assert np.sin(heading) == pytest.approx(np.sin(theta))
+
+
+def test_frenet_extrapolates_past_the_ends():
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    assert line.ToFrenet([[-2.0, 13.0], [1.0, -1.0]]) == pytest.approx(
+        np.array([[-2, 13], [1, -1]])
+    )
+    assert line.ToFrenet([[5.0], [1.0]], math.pi / 2)[2] == pytest.approx([math.pi / 2])
+    assert line.FromFrenet([-2.0, 13.0], 1.0) == pytest.approx(
+        np.array([[-2, 13], [1, 1]])
+    )
+    assert line.FromFrenet(np.zeros((3, 4)), 0.0).shape == (2, 3, 4)
+
+
+@pytest.mark.parametrize("quantity", ["X", "Y", "Theta", "Kappa"])
+def test_solve_for(quantity):
+    clothoid = Clothoid.StandardParams(1, 2, 0.3, -0.4, 0.1, 10)
+    s = np.linspace(0, clothoid.length, 20001)
+    f = clothoid.Evaluate(s, (quantity,))[0]
+    # Shifted off the sampled values of the quantity
+    values = np.linspace(f.min() - 0.5, f.max() + 0.5, 13) + 1e-6 * math.pi
+    index, roots = clothoid.SolveFor(quantity, values)
+    assert np.all(np.diff(index) >= 0)
+    assert np.all((roots >= 0) & (roots <= clothoid.length))
+    for i, value in enumerate(values):
+        found = roots[index == i]
+        assert clothoid.Evaluate(found, (quantity,))[0] == pytest.approx(
+            np.full(len(found), value), abs=1e-9
+        )
+        # Each sign change of the sampled quantity holds one root
+        assert len(found) == np.count_nonzero(np.diff(np.sign(f - value)))
+        assert clothoid.SolveFor(quantity, value) == pytest.approx(found)
+
+
+def test_solve_for_theta_modulo_two_pi():
+    circle = Clothoid.StandardParams(0, 0, 0, 1, 0, 4 * math.pi)
+    assert circle.SolveFor("Theta", math.pi / 2) == pytest.approx(
+        [math.pi / 2, 5 * math.pi / 2]
+    )
+    assert circle.SolveFor("Kappa", [1, 2]) == (
+        pytest.approx([0]),
+        pytest.approx([0]),
+    )
+    line = Clothoid.StandardParams(0, 0, math.pi / 2, 0, 0, 5)
+    assert line.SolveFor("X", 0) == pytest.approx([0])
+    assert line.SolveFor("Y", [-1, 2.5, 5]) == (
+        pytest.approx([1, 2]),
+        pytest.approx([2.5, 5]),
+    )
+    with pytest.raises(ValueError):
+        line.SolveFor("Z", 0)
+
+
 # --- Intersections ---
 
 
@@ -281,6 +588,32 @@ def test_intersection_points(G1Params1, G1Params2, expectedNumIntersections):
         assert other.Distance(*p) == pytest.approx(0)
 
 
+def test_intersection_offsets():
+    centerline = Clothoid.StandardParams(0, 0, 0, 0.001, 0.0001, 100)
+    crossing = Clothoid.StandardParams(50, -50, 1.5, 0, 0, 100)
+    assert centerline.IntersectionArcLengths(crossing, 0, 0) == pytest.approx(
+        centerline.IntersectionArcLengths(crossing), abs=1e-8
+    )
+    lanes = np.arange(-10.5, 11, 3.5)
+    lane, s, s_other = centerline.IntersectionArcLengths(crossing, offset=lanes)
+    assert list(lane) == list(range(len(lanes)))
+    assert np.diff(s).min() > 0
+    for i, a, b in zip(lane, s, s_other):
+        ((s1, s2),) = centerline.IntersectionArcLengths(crossing, offset=lanes[i])
+        assert (s1, s2) == pytest.approx((a, b))
+        assert centerline.Evaluate(a, ("X", "Y"), offset=lanes[i]) == pytest.approx(
+            crossing.Evaluate(b, ("X", "Y"))
+        )
+    lane, xy = centerline.IntersectionPoints(crossing, offset=lanes, other_offset=1)
+    assert xy.shape == (2, len(lanes))
+    assert crossing.ProjectPoints(xy, offset=1)[3] == pytest.approx(0, abs=1e-8)
+    # offset curves of two parallel lines cross only when they coincide
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    slanted = Clothoid.StandardParams(0, -5, 1, 0, 0, 10)
+    ((x, y),) = line.IntersectionPoints(slanted, offset=1, other_offset=-1)
+    assert y == pytest.approx(1)
+
+
 # --- Caching ---
 
 
@@ -308,6 +641,71 @@ def test_caches_are_independent(mocker):
     assert clothoid2.ProjectPointOntoClothoid.cache_info().currsize == 0
 
 
+def test_cache_counters():
+    clothoid = Clothoid.G1Hermite(0.0, 0.0, math.pi / 4, 1, 1, 0)
+    clothoid.SetupProjectionCache(2)
+    for point in ((5, 5), (5, 5), (1, 0), (0, 1), (5, 5)):
+        clothoid.Distance(*point)
+    info = clothoid.ProjectPointOntoClothoid.cache_info()
+    assert (info.hits, info.misses, info.currsize, info.evictions) == (1, 4, 2, 2)
+
+
+def test_cache_quantization():
+    clothoid = Clothoid.G1Hermite(0.0, 0.0, math.pi / 4, 1, 1, 0)
+    clothoid.SetupProjectionCache(32, quantum=1e-3)
+    distance = clothoid.Distance(5, 5)
+    assert clothoid.Distance(5 + 1e-5, 5 - 1e-5) == distance
+    assert clothoid.ProjectPointOntoClothoid.cache_info().hits == 1
+
+
+def test_shared_cache():
+    shared = ProjectionCache(max_bytes=100 * pyclothoids.cache.ENTRY_BYTES)
+    assert shared.maxsize == 100
+    pyclothoids.cache.SetDefaultProjectionCache(shared)
+    try:
+        clothoid1 = Clothoid.G1Hermite(0.0, 0.0, math.pi / 4, 1, 1, 0)
+        clothoid2 = pickle.loads(pickle.dumps(clothoid1))
+        other = clothoid1.Translate(1, 0)
+    finally:
+        pyclothoids.cache.SetDefaultProjectionCache(None)
+    clothoid1.Distance(5, 5)
+    assert clothoid2.Distance(5, 5) == clothoid1.Distance(5, 5)
+    assert other.Distance(5, 5) != clothoid1.Distance(5, 5)
+    assert shared.cache_info()[:2] == (3, 2)
+    for i in range(150):
+        clothoid1.Distance(i, 0)
+    assert shared.cache_info().currsize == 100
+    assert shared.cache_info().evictions == 52
+    assert (
+        Clothoid(clothoid1).ProjectPointOntoClothoid.cache_info() == shared.cache_info()
+    )
+    assert (
+        Clothoid.G1Hermite(0, 0, 0, 1, 1, 0)
+        .ProjectPointOntoClothoid.cache_info()
+        .maxsize
+        == 32
+    )
+
+
+def test_cache_survives_copies():
+    clothoid = Clothoid.G1Hermite(0.0, 0.0, math.pi / 4, 1, 1, 0)
+    clothoid.SetupProjectionCache(8, quantum=0.01)
+    clothoid.Distance(5, 5)
+    for restored in (
+        pickle.loads(pickle.dumps(clothoid)),
+        copy.copy(clothoid),
+        Clothoid(clothoid),
+    ):
+        info = restored.ProjectPointOntoClothoid.cache_info()
+        assert (info.maxsize, info.currsize) == (8, 0)
+        restored.Distance(5, 5)
+        assert restored.Distance(5.001, 5) == restored.Distance(5, 5)
+    clothoid.SetupProjectionCache(None)
+    assert not hasattr(
+        pickle.loads(pickle.dumps(clothoid)).ProjectPointOntoClothoid, "cache_info"
+    )
+
+
 # --- Test G2 Solver ---
 
 
@@ -322,3 +720,35 @@ def test_solve_g2(x0, y0, t0, k0, x1, y1, t1, k1):
     clothoids = SolveG2(x0, y0, t0, k0, x1, y1, t1, k1)
     assert len(clothoids) == 3
     assert all(isinstance(clothoid, Clothoid) for clothoid in clothoids)
+
+
+@pytest.mark.parametrize("num_threads", [1, 3, 0])
+def test_solve_g2_batch(num_threads):
+    rng = np.random.default_rng(0)
+    n = 20
+    x1, y1 = rng.uniform(2, 10, size=(2, n))
+    t0, t1 = rng.uniform(-1, 1, size=(2, n))
+    k0, k1 = rng.uniform(-0.1, 0.1, size=(2, n))
+    solution = SolveG2Batch(0, 0, t0, k0, x1, y1, t1, k1, num_threads=num_threads)
+    assert len(solution) == n
+    assert solution.Parameters.shape == (n, 3, 6)
+    assert solution.Converged.all()
+    assert (solution.Iterations >= 0).all()
+    for i in range(n):
+        expected = SolveG2(0, 0, t0[i], k0[i], x1[i], y1[i], t1[i], k1[i])
+        clothoids = solution[i]
+        assert len(clothoids) == 3
+        for c, e in zip(clothoids, expected):
+            assert c.Parameters == pytest.approx(e.Parameters)
+        assert solution.TotalLength[i] == pytest.approx(sum(c.length for c in expected))
+        assert (clothoids[-1].XEnd, clothoids[-1].YEnd) == pytest.approx((x1[i], y1[i]))
+
+
+def test_solve_g2_batch_failure():
+    # coincident endpoints have no solution
+    solution = SolveG2Batch(0, 0, 0, 0, [0, 1], 0, 0, 0)
+    assert list(solution.Converged) == [False, True]
+    assert solution.Iterations[0] == -1
+    assert np.isnan(solution.Parameters[0]).all()
+    with pytest.raises(ValueError):
+        solution[0]
@@ -0,0 +1,155 @@
+import pytest
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray
+from conftest import random_clothoids
+
+# --- Helper Functions ---
+
+
+def sampled_distance(clothoid, other, n=4000):
+    # Projects dense samples of each clothoid onto the other, an upper bound on the distance
+    return min(
+        np.abs(b.ProjectPoints(a.SampleXY(n))[3]).min()
+        for a, b in ((clothoid, other), (other, clothoid))
+    )
+
+
+RANGES = dict(extent=30, max_dk=0.01, lengths=(1, 100))
+PAIRS = list(
+    zip(random_clothoids(40, 11, **RANGES), random_clothoids(40, 12, **RANGES))
+)
+
+# Pairs that took more than a thousand pairs of arcs to settle: the closest points are the start of one and
+# the middle of the other, and curves that cross ten times
+LONG_SEARCHES = [
+    (
+        Clothoid.StandardParams(0, 0, 4.321271, -0.042213, -0.004244, 290.723915),
+        Clothoid.StandardParams(
+            -1.415829, 1.285002, 5.785354, 0.105106, 0.004188, 230.801678
+        ),
+    ),
+    (
+        Clothoid.StandardParams(0, 0, 4.502188, -0.087836, -0.000296, 295.1843),
+        Clothoid.StandardParams(
+            2.769943, 1.34874, 3.247361, -0.089244, -0.006787, 292.481353
+        ),
+    ),
+]
+
+# --- Test Clothoid ---
+
+
+def test_distance_to_matches_sampling():
+    for clothoid, other in PAIRS:
+        distance, s, other_s = clothoid.DistanceTo(other)
+        assert 0 <= s <= clothoid.length and 0 <= other_s <= other.length
+        assert distance == pytest.approx(
+            math.hypot(
+                clothoid.X(s) - other.X(other_s), clothoid.Y(s) - other.Y(other_s)
+            ),
+            abs=1e-12,
+        )
+        # samples are at most 0.025 apart, which bounds how far they miss a crossing
+        expected = sampled_distance(clothoid, other)
+        assert expected - 1e-2 <= distance <= expected + 1e-9
+        if clothoid.IntersectionArcLengths(other):
+            assert distance < 1e-9
+        assert other.DistanceTo(clothoid)[0] == pytest.approx(distance, abs=1e-8)
+
+
+def test_distance_to_ends():
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    assert line.DistanceTo(Clothoid.StandardParams(13, 1, 0, 0, 0, 5)) == pytest.approx(
+        (math.hypot(3, 1), 10, 0)
+    )
+    # the end of an arc facing the middle of a line
+    arc = Clothoid.StandardParams(5, 2, math.pi / 2, 0.1, 0, 10)
+    distance, s, other_s = line.DistanceTo(arc)
+    assert distance == pytest.approx(2, abs=1e-12)
+    assert (s, other_s) == pytest.approx((5, 0), abs=1e-6)
+
+
+def test_distance_to_intersecting():
+    clothoid = Clothoid.StandardParams(0, 0, 0.2, 0.05, -0.001, 40)
+    crossing = clothoid.Rotate(math.pi / 3, (clothoid.X(20), clothoid.Y(20)))
+    distance, s, other_s = clothoid.DistanceTo(crossing)
+    assert distance == pytest.approx(0, abs=1e-9)
+    assert any(
+        abs(s - a) < 1e-6 and abs(other_s - b) < 1e-6
+        for a, b in clothoid.IntersectionArcLengths(crossing)
+    )
+
+
+def test_distance_to_concentric_arcs():
+    arc = Clothoid.StandardParams(10, 0, math.pi / 2, 0.1, 0, 30)
+    outer = Clothoid.StandardParams(12, 0, math.pi / 2, 1 / 12, 0, 30)
+    distance, s, other_s = arc.DistanceTo(outer)
+    assert distance == pytest.approx(2, abs=1e-9)
+    assert s == pytest.approx(other_s * 10 / 12, abs=1e-6)
+
+
+def test_distance_to_long_searches():
+    (clothoid, other), (crossing, crossed) = LONG_SEARCHES
+    distance, s, other_s = clothoid.DistanceTo(other)
+    expected = sampled_distance(clothoid, other, 20000)
+    assert expected - 1e-6 <= distance <= expected + 1e-9
+    assert s == 0
+    assert len(crossing.IntersectionArcLengths(crossed)) == 10
+    for max_distance in (math.inf, 0.01):
+        assert crossing.DistanceTo(crossed, max_distance)[0] < 1e-9
+
+
+def test_distance_to_max_distance():
+    clothoid, other = PAIRS[0]
+    distance = clothoid.DistanceTo(other)[0]
+    far = clothoid.DistanceTo(other, max_distance=distance / 2)
+    assert far[0] == math.inf and math.isnan(far[1]) and math.isnan(far[2])
+    assert clothoid.DistanceTo(other, max_distance=distance * 2) == clothoid.DistanceTo(
+        other
+    )
+
+
+# --- Test ClothoidArray ---
+
+
+@pytest.mark.parametrize("num_threads", [1, 0])
+def test_array_distance_to(num_threads):
+    array = ClothoidArray.FromClothoids([c for c, _ in PAIRS])
+    others = ClothoidArray.FromClothoids([o for _, o in PAIRS])
+    result = array.DistanceTo(others, num_threads=num_threads)
+    assert result.shape == (3, len(PAIRS))
+    for i, (clothoid, other) in enumerate(PAIRS):
+        assert tuple(result[:, i]) == pytest.approx(
+            clothoid.DistanceTo(other), abs=1e-9
+        )
+    # pruning by a clearance threshold
+    clearance = np.median(result[0])
+    pruned = array.DistanceTo(others, max_distance=clearance, num_threads=num_threads)
+    near = result[0] <= clearance
+    assert np.array_equal(pruned[:, near], result[:, near])
+    assert np.isinf(pruned[0, ~near]).all() and np.isnan(pruned[1:, ~near]).all()
+
+
+@pytest.mark.parametrize("max_distance", [math.inf, 0.01])
+def test_array_distance_to_long_searches(max_distance):
+    array = ClothoidArray.FromClothoids([c for c, _ in LONG_SEARCHES])
+    others = ClothoidArray.FromClothoids([o for _, o in LONG_SEARCHES])
+    result = array.DistanceTo(others, max_distance=max_distance)
+    for i, (clothoid, other) in enumerate(LONG_SEARCHES):
+        assert np.array_equal(
+            result[:, i], clothoid.DistanceTo(other, max_distance), equal_nan=True
+        )
+    assert result[0, 1] < 1e-9
+    assert (result[0, 0] == math.inf) == (max_distance == 0.01)
+
+
+def test_array_distance_to_one_clothoid():
+    array = ClothoidArray.FromClothoids([c for c, _ in PAIRS])
+    other = PAIRS[3][1]
+    expected = np.array([c.DistanceTo(other) for c, _ in PAIRS]).T
+    assert array.DistanceTo(other) == pytest.approx(expected, abs=1e-9)
+    assert array.DistanceTo(array[[3]])[0, 3] == 0
+    assert array[[0]].DistanceTo(array).shape == (3, len(PAIRS))
+    with pytest.raises(ValueError):
+        array.DistanceTo(array[:5])
@@ -0,0 +1,139 @@
+import pytest
+import pickle
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray, ClothoidIndex, IntersectSets
+import conftest
+
+# --- Helper Functions ---
+
+
+def make_array(n=200):
+    return conftest.make_array(
+        n, seed=11, extent=100, max_kappa=0.1, max_dk=0.01, lengths=(5, 40)
+    )
+
+
+def brute_force(array, x, y):
+    projected = array.ProjectPoints((x, y))
+    return projected[2], np.abs(projected[3])
+
+
+# --- Test Queries ---
+
+
+def test_nearest():
+    array = make_array()
+    index = ClothoidIndex(array)
+    assert len(index) == len(array)
+    rng = np.random.default_rng(5)
+    for x, y in rng.uniform(-120, 120, (20, 2)):
+        s, distances = brute_force(array, x, y)
+        order = np.argsort(distances)[:5]
+        ids, found_s, found_distances = index.Nearest(x, y, k=5)
+        assert found_distances == pytest.approx(distances[order], abs=1e-7)
+        assert ids[0] == order[0]
+        assert found_s[0] == pytest.approx(s[order[0]], abs=1e-5)
+
+
+def test_nearest_batch():
+    array = make_array()
+    index = ClothoidIndex(array)
+    xy = np.random.default_rng(6).uniform(-120, 120, (2, 50))
+    ids, s, distances = index.NearestBatch(xy, k=3, num_threads=2)
+    assert ids.shape == s.shape == distances.shape == (50, 3)
+    for i in range(50):
+        single = index.Nearest(*xy[:, i], k=3)
+        assert ids[i] == pytest.approx(single[0])
+        assert distances[i] == pytest.approx(single[2])
+    ids, s, distances = index.NearestBatch(xy, k=2, max_distance=1.0)
+    assert np.all((ids >= 0) == (distances <= 1.0))
+    assert np.all(np.isnan(s[ids < 0]))
+
+
+def test_within_radius():
+    array = make_array()
+    index = ClothoidIndex(array)
+    xy = np.random.default_rng(8).uniform(-120, 120, (2, 30))
+    query, ids, s, distances = index.WithinRadiusBatch(xy, 15.0)
+    for i in range(30):
+        _, expected = brute_force(array, *xy[:, i])
+        assert sorted(ids[query == i]) == sorted(np.flatnonzero(expected <= 15.0))
+        assert distances[query == i] == pytest.approx(
+            np.sort(expected[expected <= 15.0]), abs=1e-7
+        )
+    single = index.WithinRadius(*xy[:, 0], 15.0)
+    assert single[0] == pytest.approx(ids[query == 0])
+
+
+def test_within_box():
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    arc = Clothoid.StandardParams(0, 5, 0, 0.2, 0, 10)
+    index = ClothoidIndex([line, arc, line.Translate(0, 20)])
+    ids, s = index.WithinBox(2, -1, 3, 1)
+    assert list(ids) == [0]
+    assert s == pytest.approx([2.0])
+    ids, s = index.WithinBox(-5, -5, 20, 10)
+    assert list(ids) == [0, 1]
+    assert s == pytest.approx([0.0, 0.0])
+    box, ids, s = index.WithinBoxBatch(
+        [[2, -1, 3, 1], [-1, 19, 1, 21], [50, 50, 60, 60]]
+    )
+    assert list(box) == [0, 1]
+    assert list(ids) == [0, 2]
+
+
+def test_empty_and_pickling():
+    empty = ClothoidIndex([])
+    assert len(empty) == 0
+    assert len(empty.Nearest(0, 0)[0]) == 0
+    array = make_array(50)
+    index = ClothoidIndex(array, max_angle=math.pi / 36, max_size=5)
+    restored = pickle.loads(pickle.dumps(index))
+    np.testing.assert_array_equal(restored.Clothoids.Parameters, array.Parameters)
+    xy = np.random.default_rng(9).uniform(-120, 120, (2, 20))
+    for expected, result in zip(
+        index.NearestBatch(xy, k=2), restored.NearestBatch(xy, k=2)
+    ):
+        np.testing.assert_array_equal(expected, result)
+
+
+# --- Test Set Intersections ---
+
+
+def brute_force_intersections(a, b, same=False):
+    rows = []
+    for i, first in enumerate(a):
+        for j, second in enumerate(b):
+            if same and j <= i:
+                continue
+            for s_i, s_j in first.IntersectionArcLengths(second):
+                rows.append((i, j, s_i, s_j))
+    return rows
+
+
+def test_intersect_sets():
+    a = make_array(40)
+    b = make_array(60).Rotate(0.5).Translate(10, 0)
+    rows = IntersectSets(a, b, num_threads=2)
+    assert rows.shape[1] == 4
+    expected = brute_force_intersections(a, b)
+    assert len(rows) == len(expected) > 0
+    for row in rows:
+        i, j, s_i, s_j = row
+        first, second = a[int(i)], b[int(j)]
+        assert (first.X(s_i), first.Y(s_i)) == pytest.approx(
+            (second.X(s_j), second.Y(s_j)), abs=1e-6
+        )
+    assert {(int(i), int(j)) for i, j, _, _ in rows} == {
+        (i, j) for i, j, _, _ in expected
+    }
+
+
+def test_self_intersections():
+    a = make_array(80)
+    rows = IntersectSets(ClothoidIndex(a))
+    expected = brute_force_intersections(a, a, same=True)
+    assert len(rows) == len(expected) > 0
+    assert np.all(rows[:, 0] < rows[:, 1])
+    assert len(IntersectSets([])) == 0
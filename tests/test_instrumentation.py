@@ -0,0 +1,108 @@
+import pytest
+import math
+from pyclothoids import (
+    Clothoid,
+    ForwardBatch,
+    G1HermiteBatch,
+    SolveG2,
+    SolveG2Batch,
+    instrumentation,
+)
+
+# --- Helper Functions ---
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.Reset()
+    instrumentation.Enable()
+    yield
+    instrumentation.Disable()
+    instrumentation.Reset()
+
+
+# --- Test Recording ---
+
+
+def test_disabled_by_default():
+    instrumentation.Reset()
+    assert not instrumentation.IsEnabled()
+    clothoid = Clothoid.G1Hermite(0, 0, 0, 1, 1, math.pi / 2)
+    clothoid.Distance(5, 5)
+    assert clothoid.Diagnostics is None
+    assert instrumentation.Snapshot() == {}
+
+
+def test_solver_diagnostics(enabled):
+    clothoids = SolveG2(0, 0, 0, 0, 10, 5, 1, 0)
+    diagnostics = clothoids[0].Diagnostics
+    assert diagnostics.entry_point == "SolveG2"
+    assert diagnostics.converged
+    assert diagnostics.iterations >= 1
+    assert diagnostics.seconds > 0
+    assert all(c.Diagnostics == diagnostics for c in clothoids)
+
+    clothoid = Clothoid.G1Hermite(0, 0, 0, 1, 1, math.pi / 2)
+    assert clothoid.Diagnostics.entry_point == "G1Hermite"
+    assert clothoid.Diagnostics.iterations >= 1
+    assert Clothoid.Forward(0, 0, 0, 0.1, 5, 1).Diagnostics.converged
+    assert Clothoid.StandardParams(0, 0, 0, 0, 0, 1).Diagnostics is None
+
+    snapshot = instrumentation.Snapshot()
+    assert sorted(snapshot) == ["Forward", "G1Hermite", "SolveG2"]
+    stats = snapshot["SolveG2"]
+    assert stats["calls"] == 1
+    assert stats["failures"] == 0
+    assert stats["seconds"]["count"] == 1
+    assert stats["seconds"]["buckets"][float("inf")] == 1
+    assert stats["iterations"]["sum"] == diagnostics.iterations
+
+
+def test_failures(enabled):
+    with pytest.raises(Exception):
+        Clothoid.G1Hermite(0, 0, 0, 0, 0, 0)
+    solution = SolveG2Batch(0, 0, 0, 0, [10, 0], [5, 0], 1, 0)
+    snapshot = instrumentation.Snapshot()
+    assert snapshot["G1Hermite"]["failures"] == 1
+    batch = snapshot["SolveG2Batch"]
+    assert batch["calls"] == 1
+    assert batch["failures"] == int((~solution.Converged).sum())
+    assert batch["iterations"]["count"] == int(solution.Converged.sum())
+
+
+def test_batch_builders(enabled):
+    _, converged = G1HermiteBatch(0, 0, 0, [1, 0, 2], [1, 0, 0], 0.5)
+    ForwardBatch(0, 0, 0, 0, [3, 4], [1, 2])
+    snapshot = instrumentation.Snapshot()
+    g1 = snapshot["G1HermiteBatch"]
+    assert g1["calls"] == 1
+    assert g1["failures"] == int((~converged).sum()) == 1
+    assert g1["seconds"]["count"] == 1
+    assert g1["iterations"]["count"] == 0
+    assert snapshot["ForwardBatch"]["calls"] == 1
+
+
+def test_projection_outcomes(enabled):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    clothoid.Distance(5, 1)
+    clothoid.Distance(5, 1)
+    clothoid.Distance(-5, 1)
+    stats = instrumentation.Snapshot()["ProjectPoint"]
+    assert stats["calls"] == 2
+    assert stats["outcomes"] == {"orthogonal": 1, "endpoint": 1}
+
+
+# --- Test Export ---
+
+
+def test_prometheus_text(enabled):
+    SolveG2(0, 0, 0, 0, 10, 5, 1, 0)
+    text = instrumentation.PrometheusText()
+    assert "# TYPE pyclothoids_calls_total counter" in text
+    assert 'pyclothoids_calls_total{entry_point="SolveG2"} 1' in text
+    assert (
+        'pyclothoids_call_duration_seconds_bucket{entry_point="SolveG2",le="+Inf"} 1'
+        in text
+    )
+    assert 'pyclothoids_newton_iterations_count{entry_point="SolveG2"} 1' in text
+    assert text.endswith("\n")
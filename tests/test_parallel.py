@@ -0,0 +1,50 @@
+import pytest
+import math
+import numpy as np
+import pyclothoids
+from pyclothoids import Clothoid, SolveG2
+
+
+def test_map_matches_builtin():
+    values = list(range(37))
+    expected = list(map(lambda a, b: a * b, values, values[::-1]))
+    for num_threads in (1, 3, 0):
+        result = pyclothoids.parallel.map(
+            lambda a, b: a * b, values, values[::-1], num_threads=num_threads
+        )
+        assert result == expected
+    assert pyclothoids.parallel.map(abs, [], num_threads=4) == []
+
+
+def test_map_raises():
+    def fail(value):
+        if value == 5:
+            raise ValueError("five")
+        return value
+
+    with pytest.raises(ValueError):
+        pyclothoids.parallel.map(fail, range(10), num_threads=4, chunksize=1)
+
+
+def test_map_solve_g2():
+    x1 = np.linspace(5, 15, 12)
+    solutions = pyclothoids.parallel.map(
+        lambda x: SolveG2(0, 0, 0, 0, x, 2, math.pi / 4, 0), x1, num_threads=4
+    )
+    for x, segments in zip(x1, solutions):
+        assert (segments[-1].XEnd, segments[-1].YEnd) == pytest.approx((x, 2))
+
+
+def test_shared_projection():
+    # the first projections from every thread race to build the AABB tree of the same clothoid
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.05, 0.004, 60)
+    rng = np.random.default_rng(1)
+    xy = rng.uniform(-20, 40, (2, 400))
+    expected = Clothoid(clothoid).ProjectPoints(xy)
+    results = pyclothoids.parallel.map(
+        clothoid._ProjectPointOntoClothoid, *xy, num_threads=4, chunksize=100
+    )
+    for (point, s, distance), row in zip(results, expected.T):
+        assert point == pytest.approx(row[:2])
+        assert s == pytest.approx(row[2])
+        assert distance == pytest.approx(abs(row[3]))
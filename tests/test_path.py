@@ -0,0 +1,131 @@
+import pytest
+import pickle
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidPath, SolveG2
+
+# --- Helper Functions ---
+
+
+def make_path():
+    return ClothoidPath(SolveG2(0, 0, 0, 0, 10, 5, math.pi / 2, 0))
+
+
+# --- Test Construction ---
+
+
+def test_construction():
+    segments = SolveG2(0, 0, 0, 0, 10, 5, math.pi / 2, 0)
+    path = ClothoidPath(segments)
+    assert len(path) == 3
+    assert path.length == pytest.approx(sum(c.length for c in segments))
+    assert path.XStart == pytest.approx(0)
+    assert (path.XEnd, path.YEnd) == pytest.approx((10, 5))
+    assert path[-1].Parameters == pytest.approx(segments[-1].Parameters)
+    assert [c.length for c in path] == pytest.approx([c.length for c in segments])
+    with pytest.raises(IndexError):
+        path[3]
+
+
+def test_push_back_g1():
+    path = ClothoidPath([Clothoid.StandardParams(0, 0, 0, 0, 0, 1)])
+    path.PushBackG1(3, 1, 0)
+    path.PushBackG1(4, 4, math.pi / 2)
+    assert len(path) == 3
+    assert (path.XEnd, path.YEnd) == pytest.approx((4, 4))
+    assert path.ThetaEnd == pytest.approx(math.pi / 2)
+    with pytest.raises(IndexError):
+        ClothoidPath().PushBackG1(1, 1, 0)
+
+
+def test_empty_path():
+    path = ClothoidPath()
+    assert len(path) == 0
+    with pytest.raises(IndexError):
+        path.length
+
+
+# --- Test Evaluation ---
+
+
+def test_evaluation_at_global_arc_length():
+    segments = SolveG2(0, 0, 0, 0, 10, 5, math.pi / 2, 0)
+    path = ClothoidPath(segments)
+    stations = path.SegmentArcLengths
+    assert stations[0] == 0
+    assert stations[-1] == pytest.approx(path.length)
+    for i, segment in enumerate(segments):
+        s = np.linspace(stations[i], stations[i + 1], 7)[1:-1]
+        assert path.X(s) == pytest.approx(segment.X(s - stations[i]))
+        assert path.Y(s) == pytest.approx(segment.Y(s - stations[i]))
+        assert path.Theta(s) == pytest.approx(segment.Theta(s - stations[i]))
+        assert np.all(path.SegmentIndex(s) == i)
+        assert path.SegmentIndex(float(s[0])) == i
+    s = np.linspace(0, path.length, 9)
+    assert path.Evaluate(s, ("X", "Kappa")) == pytest.approx(
+        np.array([path.X(s), path.ThetaD(s)])
+    )
+    xy = path.SampleXY(9)
+    assert xy == pytest.approx(np.array([path.X(s), path.Y(s)]))
+    offsets = np.linspace(-2, 2, 9)
+    lane = path.FromFrenet(s, offsets)
+    assert path.Evaluate(s, ("X", "Y"), offset=offsets) == pytest.approx(lane)
+    assert path.SampleXY(9, offset=offsets) == pytest.approx(lane)
+
+
+# --- Test Projection ---
+
+
+def test_projection():
+    path = make_path()
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(-2, 12, size=(2, 40))
+    px, py, s, d = path.ProjectPoints(xy)
+    for i, (x, y) in enumerate(xy.T):
+        distances = [c.Distance(x, y) for c in path]
+        assert abs(d[i]) == pytest.approx(min(distances))
+        assert path.Distance(x, y) == pytest.approx(min(distances))
+        assert (path.X(s[i]), path.Y(s[i])) == pytest.approx((px[i], py[i]))
+
+
+def test_projection_after_append():
+    path = ClothoidPath([Clothoid.StandardParams(0, 0, 0, 0, 0, 1)])
+    assert path.Distance(3, 0) == pytest.approx(2)
+    path.Append(Clothoid.StandardParams(1, 0, 0, 0, 0, 2))
+    assert path.Distance(3, 0) == pytest.approx(0)
+    assert path.ClosestPointArcLength(3, 0) == pytest.approx(3)
+
+
+def test_frenet_round_trip():
+    path = make_path()
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(-2, 12, size=(2, 40))
+    s, d = path.ToFrenet(xy)
+    _, _, ps, pd = path.ProjectPoints(xy)
+    inside = (s > 0) & (s < path.length)
+    assert s[inside] == pytest.approx(ps[inside])
+    assert d[inside] == pytest.approx(pd[inside])
+    assert path.FromFrenet(s, d) == pytest.approx(xy)
+    heading = path.FromFrenet(s, 0.0, 0.1)[2]
+    assert heading == pytest.approx(path.Theta(np.clip(s, 0, path.length)) + 0.1)
+
+
+def test_solve_for():
+    path = make_path()
+    stations = path.SegmentArcLengths
+    index, s = path.SolveFor("X", [0, 5, 10])
+    assert path.X(s) == pytest.approx(np.array([0, 5, 10])[index])
+    assert path.SolveFor("X", 10) == pytest.approx([path.length])
+    # The curvature is continuous across junctions, so the root at each junction is reported once
+    kappa = path.ThetaD(stations[1])
+    assert np.count_nonzero(np.isclose(path.SolveFor("Kappa", kappa), stations[1])) == 1
+
+
+# --- Test Pickling ---
+
+
+def test_pickling():
+    path = make_path()
+    unpickled = pickle.loads(pickle.dumps(path))
+    assert len(unpickled) == len(path)
+    assert [c.Parameters for c in unpickled] == [c.Parameters for c in path]
@@ -0,0 +1,153 @@
+import pytest
+import pickle
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray, ClothoidPath, Polyline, SolveG2
+
+# --- Helper Functions ---
+
+
+def dense_distance(polyline, clothoid, n=2001):
+    # Largest distance from points of the clothoid to the polyline
+    xy = clothoid.SampleXY(n)
+    return max(polyline.Distance(x, y) for x, y in xy.T)
+
+
+# --- Test Construction ---
+
+
+@pytest.mark.parametrize("tol", [1e-1, 1e-3, 1e-5])
+def test_to_polyline_within_tolerance(tol):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0, 0.05, 20)
+    vertices = clothoid.ToPolyline(tol)
+    assert vertices[:, 0] == pytest.approx([0, 0])
+    assert vertices[:, -1] == pytest.approx([clothoid.XEnd, clothoid.YEnd])
+    assert dense_distance(Polyline(vertices), clothoid) <= tol
+    # The spacing follows the curvature, which grows from zero along the clothoid
+    spacing = np.hypot(*np.diff(vertices))
+    assert spacing[0] > spacing[-1]
+
+
+def test_to_polyline_of_a_line():
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 100)
+    assert line.ToPolyline(1e-9).shape == (2, 2)
+    with pytest.raises(ValueError):
+        line.ToPolyline(0)
+
+
+def test_to_polyline_too_many_points():
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.5, 0, 1000)
+    with pytest.raises(ValueError, match="points"):
+        clothoid.ToPolyline(1e-12)
+    # the points of all segments count together
+    with pytest.raises(ValueError, match="points"):
+        ClothoidPath([clothoid, clothoid.Reverse()]).ToPolyline(1e-9)
+    with pytest.raises(ValueError, match="points"):
+        ClothoidArray.FromClothoids([clothoid] * 3).ToPolylines(1e-12)
+
+
+def test_path_to_polyline():
+    path = ClothoidPath(SolveG2(0, 0, 0, 0, 10, 5, math.pi / 2, 0))
+    polyline = Polyline.FromCurve(path, 1e-3)
+    assert polyline.length == pytest.approx(path.length, rel=1e-3)
+    for c in path:
+        assert dense_distance(polyline, c) <= 1e-3
+        assert polyline.Distance(c.XEnd, c.YEnd) == pytest.approx(0, abs=1e-12)
+
+
+def test_to_polylines():
+    array = ClothoidArray.FromClothoids(
+        list(SolveG2(0, 0, 0, 0, 10, 5, math.pi / 2, 0))
+        + [Clothoid.StandardParams(1, 2, 3, 0, 0, 4)]
+    )
+    vertices, offsets = array.ToPolylines(1e-3)
+    assert len(offsets) == len(array) + 1
+    for i, c in enumerate(array):
+        assert vertices[:, offsets[i] : offsets[i + 1]] == pytest.approx(
+            c.ToPolyline(1e-3)
+        )
+
+
+# --- Test Queries ---
+
+
+def test_intersection_with_clothoid():
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.05, 0.01, 8)
+    polyline = Polyline([[0.5, 1.5, 2.5, 3.5, 4.5], [-1, 1, -1, 1, -1]])
+    hits = polyline.IntersectionArcLengths(clothoid)
+    assert len(hits) == 4
+    vertices = polyline.Vertices
+    stations = np.concatenate([[0], np.cumsum(np.hypot(*np.diff(vertices)))])
+    for s_polyline, s_clothoid in hits:
+        x = np.interp(s_polyline, stations, vertices[0])
+        y = np.interp(s_polyline, stations, vertices[1])
+        assert (clothoid.X(s_clothoid), clothoid.Y(s_clothoid)) == pytest.approx((x, y))
+    assert [h[0] for h in hits] == sorted(h[0] for h in hits)
+    # The same crossings are found between the clothoid and its polyline
+    other = Polyline(clothoid.ToPolyline(1e-8))
+    assert len(polyline.IntersectionArcLengths(other)) == len(hits)
+    assert polyline.Collides(other)
+    assert not polyline.Collides(Polyline([[0, 1], [10, 10]]))
+
+
+def test_project_nan_point():
+    polyline = Polyline([[0, 1, 2], [0, 1, 0]])
+    (x, y), s, distance = polyline.ProjectPointOntoPolyline(math.nan, 0.5)
+    assert all(math.isnan(v) for v in (x, y, s, distance))
+    assert math.isnan(polyline.Distance(0.5, math.nan))
+    (x, y), s, distance = polyline.ProjectPointOntoPolyline(1, 2)
+    assert (x, y, s, distance) == pytest.approx((1, 1, 2**0.5, 1))
+
+
+def test_intersection_through_a_vertex():
+    line = Clothoid.StandardParams(0, -1, math.pi / 2, 0, 0, 2)
+    polyline = Polyline([[-1, 0, 1], [0, 0, 1]])
+    assert polyline.IntersectionArcLengths(line) == [pytest.approx((1, 1))]
+
+
+@pytest.mark.parametrize(
+    "vertices",
+    [
+        [[-2, 2], [3, 3]],
+        [[-2, 0, 2, 3], [3, 2.5, 4, 5]],
+        [[7, 8, 9], [0, 1, -1]],
+    ],
+)
+def test_distance_to_clothoid(vertices):
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.1, 0.02, 6)
+    polyline = Polyline(vertices)
+    distance, s_polyline, s_clothoid = polyline.DistanceTo(clothoid)
+    # Brute force over dense samples of both curves
+    a = clothoid.SampleXY(2001)
+    dense = np.stack(
+        [
+            np.interp(
+                np.linspace(0, polyline.length, 2001),
+                np.concatenate([[0], np.cumsum(np.hypot(*np.diff(vertices)))]),
+                row,
+            )
+            for row in np.asarray(vertices, dtype=float)
+        ]
+    )
+    brute = np.min(np.hypot(*(a[:, :, None] - dense[:, None, :])))
+    assert distance == pytest.approx(brute, abs=1e-4)
+    assert distance <= brute + 1e-12
+    x, y = clothoid.X(s_clothoid), clothoid.Y(s_clothoid)
+    assert polyline.Distance(x, y) == pytest.approx(distance)
+
+
+def test_distance_when_intersecting():
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.1, 0.02, 6)
+    polyline = Polyline([[1, 1], [-1, 1]])
+    distance, s_polyline, s_clothoid = polyline.DistanceTo(clothoid)
+    assert distance == 0
+    assert clothoid.X(s_clothoid) == pytest.approx(1)
+
+
+def test_pickling():
+    polyline = Polyline([[0, 1, 2], [0, 1, 0]])
+    unpickled = pickle.loads(pickle.dumps(polyline))
+    assert unpickled.Vertices == pytest.approx(polyline.Vertices)
+    assert len(unpickled) == 3
+    with pytest.raises(ValueError):
+        Polyline([[0], [0]])
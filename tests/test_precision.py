@@ -0,0 +1,108 @@
+import pytest
+import math
+import numpy as np
+from pyclothoids import Clothoid, ClothoidArray, ClothoidPath, SolveG2, precision
+from conftest import random_clothoids
+
+# Spirals of every kind, with lines, arcs and gentle spirals from a tangent, whose expansions are special cases
+CLOTHOIDS = random_clothoids(
+    60, seed=3, extent=1e3, max_kappa=1, max_dk=0.1, lengths=(0.1, 500)
+) + [
+    Clothoid.StandardParams(10, -20, 0.3, 0, 0, 400),
+    Clothoid.StandardParams(-5, 7, 2, 0.01, 0, 300),
+    Clothoid.StandardParams(3, 3, -1, 0, 1e-5, 500),
+    Clothoid.StandardParams(-8, 1, 4, -1e-3, 2e-5, 250),
+]
+
+# --- Test Clothoid ---
+
+
+@pytest.mark.parametrize("tol", [1e-3, 1e-6, 1e-9])
+def test_evaluate_within_tolerance(tol):
+    for clothoid in CLOTHOIDS:
+        s = np.linspace(0, clothoid.length, 1000)
+        exact = clothoid.Evaluate(s, ("X", "Y", "Theta", "XD"))
+        fast = clothoid.Evaluate(s, ("X", "Y", "Theta", "XD"), precision=tol)
+        assert np.abs(fast[:2] - exact[:2]).max() <= tol
+        # only the positions are approximated
+        assert np.array_equal(fast[2:], exact[2:])
+
+
+@pytest.mark.parametrize("tol", [1e-3, 1e-9])
+def test_sample_xy_within_tolerance(tol):
+    for clothoid in CLOTHOIDS:
+        exact = clothoid.SampleXY(500, offset=1.5)
+        assert (
+            np.abs(clothoid.SampleXY(500, offset=1.5, precision=tol) - exact).max()
+            <= tol
+        )
+
+
+def test_fast_outside_and_small_batches_are_exact():
+    clothoid = CLOTHOIDS[0]
+    s = np.concatenate(
+        [[-5.0], np.linspace(0, clothoid.length, 200), [clothoid.length + 5]]
+    )
+    exact = clothoid.Evaluate(s, ("X", "Y"))
+    fast = clothoid.Evaluate(s, ("X", "Y"), precision="fast")
+    assert np.array_equal(fast[:, [0, -1]], exact[:, [0, -1]])
+    # too few points to pay for the anchors
+    assert np.array_equal(clothoid.SampleXY(2, precision="fast"), clothoid.SampleXY(2))
+
+
+def test_precision_arguments():
+    clothoid = CLOTHOIDS[1]
+    s = np.linspace(0, clothoid.length, 100)
+    assert np.array_equal(clothoid.Evaluate(s, precision="exact"), clothoid.Evaluate(s))
+    for bad in ("approximate", 0, -1e-3, True, False, math.inf, math.nan):
+        with pytest.raises(ValueError):
+            clothoid.Evaluate(s, precision=bad)
+        with pytest.raises(ValueError):
+            precision.SetDefaultPrecision(bad)
+    assert precision.GetDefaultPrecision() == "exact"
+    assert precision.Tolerance("fast") == precision.FAST_TOLERANCE
+    assert precision.Tolerance(1e-4) == 1e-4
+
+
+def test_default_precision():
+    clothoid = CLOTHOIDS[2]
+    assert precision.GetDefaultPrecision() == "exact"
+    precision.SetDefaultPrecision(1e-4)
+    try:
+        assert np.array_equal(
+            clothoid.SampleXY(300), clothoid.SampleXY(300, precision=1e-4)
+        )
+        assert np.array_equal(
+            clothoid.SampleXY(300, precision="exact"),
+            Clothoid(clothoid).SampleXY(300, precision="exact"),
+        )
+        with pytest.raises(ValueError):
+            precision.SetDefaultPrecision("approximate")
+        assert precision.GetDefaultPrecision() == 1e-4
+    finally:
+        precision.SetDefaultPrecision("exact")
+
+
+# --- Test Paths and Arrays ---
+
+
+def test_path_within_tolerance():
+    path = ClothoidPath(SolveG2(0, 0, 0, 0, 100, 50, 1, 0.01))
+    s = np.linspace(0, path.length, 2000)
+    exact = path.Evaluate(s, ("X", "Y"), offset=-2)
+    assert (
+        np.abs(path.Evaluate(s, ("X", "Y"), offset=-2, precision=1e-8) - exact).max()
+        <= 1e-8
+    )
+    assert (
+        np.abs(path.SampleXY(1000, precision=1e-8) - path.SampleXY(1000)).max() <= 1e-8
+    )
+
+
+@pytest.mark.parametrize("num_threads", [1, 0])
+def test_array_within_tolerance(num_threads):
+    array = ClothoidArray.FromClothoids(CLOTHOIDS)
+    exact = array.SampleXY(400, num_threads)
+    fast = array.SampleXY(400, num_threads, precision=1e-7)
+    assert np.abs(fast - exact).max() <= 1e-7
+    assert np.array_equal(array.SampleXY(400, num_threads, "exact"), exact)
@@ -0,0 +1,138 @@
+import pytest
+import math
+from pyclothoids import Clothoid, SolveG2, SolutionCache, cache, instrumentation
+from conftest import assert_same_curves
+
+# --- Helper Functions ---
+
+
+@pytest.fixture
+def solution_cache():
+    solutions = SolutionCache()
+    cache.SetSolutionCache(solutions)
+    yield solutions
+    cache.SetSolutionCache(None)
+
+
+def moved(problem, dx, dy, angle, scale):
+    # The G2 problem x0, y0, t0, k0, x1, y1, t1, k1 rotated by angle about the origin, scaled and translated
+    x0, y0, t0, k0, x1, y1, t1, k1 = problem
+    c, s = math.cos(angle), math.sin(angle)
+    return (
+        scale * (c * x0 - s * y0) + dx,
+        scale * (s * x0 + c * y0) + dy,
+        t0 + angle,
+        k0 / scale,
+        scale * (c * x1 - s * y1) + dx,
+        scale * (s * x1 + c * y1) + dy,
+        t1 + angle,
+        k1 / scale,
+    )
+
+
+PROBLEM = (1, 2, 0.3, 0.05, 11, 4, -0.2, -0.1)
+
+# --- Test SolveG2 ---
+
+
+def test_solveg2_hits_rigid_motions(solution_cache):
+    first = SolveG2(*PROBLEM)
+    assert solution_cache.cache_info().misses == 1
+    for dx, dy, angle, scale in [
+        (0, 0, 0, 1),
+        (-40, 7, 2.5, 1),
+        (3, 3, -1, 0.25),
+        (5, -2, 4, 30),
+    ]:
+        problem = moved(PROBLEM, dx, dy, angle, scale)
+        cached = SolveG2(*problem)
+        cache.SetSolutionCache(None)
+        assert_same_curves(cached, SolveG2(*problem), abs=1e-9 * scale * 10)
+        cache.SetSolutionCache(solution_cache)
+    info = solution_cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (4, 1, 1)
+    assert info.hit_rate == pytest.approx(0.8)
+    assert len(first) == 3
+
+
+def test_solveg2_keys(solution_cache):
+    SolveG2(*PROBLEM)
+    SolveG2(*PROBLEM, Dmax=1)
+    x0, y0, t0, k0, x1, y1, t1, k1 = PROBLEM
+    SolveG2(x0, y0, t0, k0 + 0.01, x1, y1, t1, k1)
+    SolveG2(x0, y0, t0, k0, x1, y1, -t1, k1)
+    assert solution_cache.cache_info().misses == 4
+    # the solver wraps angles, so these are the same problem
+    SolveG2(x0, y0, t0 - 2 * math.pi, k0, x1, y1, t1 + 2 * math.pi, k1)
+    assert solution_cache.cache_info().hits == 1
+    # coincident endpoints are never cached
+    SolveG2(0, 0, 0, 0, 0, 0, 1, 0)
+    assert solution_cache.cache_info().currsize == 4
+
+
+def test_quantum_reuses_nearby_solutions():
+    solutions = SolutionCache(quantum=1e-3)
+    cache.SetSolutionCache(solutions)
+    try:
+        x0, y0, t0, k0, x1, y1, t1, k1 = PROBLEM
+        SolveG2(*PROBLEM)
+        nearby = SolveG2(x0, y0, t0, k0, x1, y1, t1 + 1e-5, k1)
+    finally:
+        cache.SetSolutionCache(None)
+    assert solutions.cache_info().hits == 1
+    assert nearby[-1].ThetaEnd == pytest.approx(t1, abs=1e-9)
+
+
+def test_eviction_and_memory_cap():
+    solutions = SolutionCache(maxsize=2)
+    cache.SetSolutionCache(solutions)
+    try:
+        for k0 in (0, 0.01, 0.02, 0):
+            SolveG2(0, 0, 0, k0, 10, 1, 0, 0)
+    finally:
+        cache.SetSolutionCache(None)
+    info = solutions.cache_info()
+    assert (info.misses, info.currsize, info.evictions) == (4, 2, 2)
+    assert SolutionCache(max_bytes=cache.SOLUTION_ENTRY_BYTES * 10).maxsize == 10
+    solutions.cache_clear()
+    assert solutions.cache_info() == (0, 0, 2, 0, 0)
+    assert solutions.cache_info().hit_rate == 0
+
+
+def test_hits_are_instrumented(solution_cache):
+    instrumentation.Reset()
+    instrumentation.Enable()
+    try:
+        solved = SolveG2(*PROBLEM)
+        cached = SolveG2(*moved(PROBLEM, 1, 1, 1, 2))
+        hermite = [Clothoid.G1Hermite(1, -1, 0.4, 6, 2, 1.2) for _ in range(2)]
+    finally:
+        instrumentation.Disable()
+    assert not solved[0].Diagnostics.cached and solved[0].Diagnostics.iterations >= 1
+    for clothoid in cached:
+        diagnostics = clothoid.Diagnostics
+        assert diagnostics.entry_point == "SolveG2" and diagnostics.converged
+        assert diagnostics.cached and diagnostics.iterations is None
+    assert not hermite[0].Diagnostics.cached and hermite[1].Diagnostics.cached
+    snapshot = instrumentation.Snapshot()
+    for entry_point in ("SolveG2", "G1Hermite"):
+        stats = snapshot[entry_point]
+        assert stats["calls"] == 2 and stats["outcomes"] == {"cache_hit": 1}
+        assert stats["iterations"]["count"] == 1
+    instrumentation.Reset()
+
+
+# --- Test G1Hermite ---
+
+
+def test_g1_hermite_hits_rigid_motions(solution_cache):
+    Clothoid.G1Hermite(1, -1, 0.4, 6, 2, 1.2)
+    x0, y0, t0, _, x1, y1, t1, _ = moved((1, -1, 0.4, 0, 6, 2, 1.2, 0), 8, -3, -2, 3)
+    cached = Clothoid.G1Hermite(x0, y0, t0, x1, y1, t1)
+    assert solution_cache.cache_info().hits == 1
+    cache.SetSolutionCache(None)
+    assert_same_curves([cached], [Clothoid.G1Hermite(x0, y0, t0, x1, y1, t1)], abs=1e-8)
+    # G1 and G2 problems have separate entries
+    cache.SetSolutionCache(solution_cache)
+    SolveG2(1, -1, 0.4, 0, 6, 2, 1.2, 0)
+    assert solution_cache.cache_info().misses == 2
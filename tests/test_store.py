@@ -0,0 +1,121 @@
+import pytest
+import math
+import numpy as np
+from pyclothoids import (
+    Clothoid,
+    ClothoidArray,
+    ClothoidIndex,
+    ClothoidPath,
+    SolveG2,
+    SolveG2Batch,
+    store,
+)
+from conftest import assert_same_curves, random_clothoids
+
+# --- Helper Functions ---
+
+
+def make_clothoids(n=30):
+    return random_clothoids(
+        n, seed=11, extent=50, max_kappa=0.1, max_dk=0.01, lengths=(1, 20)
+    )
+
+
+# --- Test Round Trips ---
+
+
+def test_clothoid_round_trip(tmp_path):
+    clothoid = Clothoid.G1Hermite(0, 0, 0, 1, 1, math.pi / 2)
+    store.save(clothoid, tmp_path / "one.clothoids")
+    restored = store.load(tmp_path / "one.clothoids")
+    assert isinstance(restored, Clothoid)
+    assert restored.Parameters == clothoid.Parameters
+
+
+def test_list_and_solve_g2_round_trip(tmp_path):
+    clothoids = make_clothoids()
+    store.save(clothoids, tmp_path / "list.clothoids")
+    restored = store.load(tmp_path / "list.clothoids")
+    assert isinstance(restored, list)
+    assert_same_curves(restored, clothoids)
+
+    solution = SolveG2(0, 0, 0, 0, 10, 5, 1, 0)
+    store.save(solution, tmp_path / "g2.clothoids")
+    restored = store.load(tmp_path / "g2.clothoids")
+    assert isinstance(restored, tuple)
+    assert_same_curves(restored, solution)
+
+    store.save([], tmp_path / "empty.clothoids")
+    assert store.load(tmp_path / "empty.clothoids") == []
+
+
+def test_collection_round_trips(tmp_path):
+    clothoids = make_clothoids()
+    path = ClothoidPath(SolveG2(0, 0, 0, 0, 10, 5, 1, 0))
+    store.save(path, tmp_path / "path.clothoids")
+    restored = store.load(tmp_path / "path.clothoids")
+    assert isinstance(restored, ClothoidPath)
+    assert restored.length == pytest.approx(path.length)
+
+    array = ClothoidArray.FromClothoids(clothoids)
+    store.save(array, tmp_path / "array.clothoids")
+    restored = store.load(tmp_path / "array.clothoids")
+    np.testing.assert_array_equal(restored.Parameters, array.Parameters)
+
+    batch = SolveG2Batch(0, 0, 0, 0, [10, 0], [5, 0], 1, 0)
+    store.save(batch, tmp_path / "batch.clothoids")
+    restored = store.load(tmp_path / "batch.clothoids")
+    np.testing.assert_array_equal(restored.Parameters, batch.Parameters)
+    np.testing.assert_array_equal(restored.Converged, batch.Converged)
+    assert_same_curves(restored[0], batch[0])
+
+
+def test_index_pages(tmp_path):
+    clothoids = make_clothoids()
+    index = ClothoidIndex(clothoids)
+    store.save(index, tmp_path / "index.clothoids")
+    restored = store.load(tmp_path / "index.clothoids")
+    assert isinstance(restored, ClothoidIndex)
+    for expected, actual in zip(
+        index.NearestBatch([[0, 10], [0, -5]], k=3),
+        restored.NearestBatch([[0, 10], [0, -5]], k=3),
+    ):
+        np.testing.assert_array_equal(expected, actual)
+
+    store.save(clothoids, tmp_path / "indexed.clothoids", index=True)
+    mapped = store.open(tmp_path / "indexed.clothoids")
+    assert mapped.HasIndex
+    assert mapped.Index.Nearest(0, 0)[0] == pytest.approx(index.Nearest(0, 0)[0])
+
+
+# --- Test Mapping ---
+
+
+def test_open_is_lazy(tmp_path):
+    clothoids = make_clothoids()
+    store.save(clothoids, tmp_path / "list.clothoids")
+    mapped = store.open(tmp_path / "list.clothoids")
+    assert len(mapped) == len(clothoids)
+    assert mapped.Kind == "list"
+    assert not mapped.HasIndex
+    assert mapped[-1].Parameters == clothoids[-1].Parameters
+    parameters = mapped.Clothoids.Parameters
+    assert not parameters.flags.writeable
+    assert not parameters.flags.owndata
+    assert mapped.Index.Nearest(0, 0)[0].shape == (1,)
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "bad.clothoids").write_bytes(b"not a store" * 20)
+    with pytest.raises(ValueError):
+        store.open(tmp_path / "bad.clothoids")
+    store.save(make_clothoids(), tmp_path / "list.clothoids")
+    data = (tmp_path / "list.clothoids").read_bytes()
+    (tmp_path / "truncated.clothoids").write_bytes(data[:200])
+    with pytest.raises(ValueError):
+        store.open(tmp_path / "truncated.clothoids")
+    (tmp_path / "newer.clothoids").write_bytes(data[:8] + b"\x63" + data[9:])
+    with pytest.raises(ValueError):
+        store.open(tmp_path / "newer.clothoids")
+    with pytest.raises(TypeError):
+        store.save(object(), tmp_path / "object.clothoids")
@@ -0,0 +1,123 @@
+import pytest
+import math
+import numpy as np
+from pyclothoids import SolveG2Batch, G2BatchSolution, store, stream
+
+# --- Helper Functions ---
+
+
+def make_problems(n=50):
+    rng = np.random.default_rng(5)
+    distance = rng.uniform(5, 20, n)
+    bearing = rng.uniform(-math.pi / 6, math.pi / 6, n)
+    zeros = np.zeros(n)
+    problems = np.stack(
+        [
+            zeros,
+            zeros,
+            zeros,
+            rng.uniform(-0.05, 0.05, n),
+            distance * np.cos(bearing),
+            distance * np.sin(bearing),
+            bearing + rng.uniform(-0.5, 0.5, n),
+            rng.uniform(-0.05, 0.05, n),
+        ],
+        axis=1,
+    )
+    # coincident endpoints have no solution
+    problems[7, 4:6] = 0
+    return problems
+
+
+def assert_same_solutions(solutions, problems):
+    expected = SolveG2Batch(*problems.T)
+    parameters = np.concatenate([s.Parameters for s in solutions])
+    iterations = np.concatenate([s.Iterations for s in solutions])
+    assert np.array_equal(parameters, expected.Parameters, equal_nan=True)
+    assert np.array_equal(iterations, expected.Iterations)
+
+
+class CountingIterable(object):
+    def __init__(self, items):
+        self.items = items
+        self.pulled = 0
+
+    def __iter__(self):
+        for item in self.items:
+            self.pulled += 1
+            yield item
+
+
+# --- Test Streaming ---
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_solve_g2_blocks(prefetch):
+    problems = make_problems()
+    blocks = np.array_split(problems, 4)
+    solutions = list(stream.solve_g2(blocks, prefetch=prefetch))
+    assert [len(s) for s in solutions] == [len(b) for b in blocks]
+    assert all(isinstance(s, G2BatchSolution) for s in solutions)
+    assert not solutions[0].Converged[7]
+    assert_same_solutions(solutions, problems)
+
+
+def test_solve_g2_rows_and_splitting():
+    problems = make_problems()
+    chunks = list(problems[:10]) + [problems[10:45]] + list(problems[45:])
+    solutions = list(stream.solve_g2(chunks, chunksize=4))
+    assert [len(s) for s in solutions] == [4, 4, 2] + [4] * 8 + [3, 4, 1]
+    assert_same_solutions(solutions, problems)
+
+
+def test_solve_g2_backpressure():
+    blocks = CountingIterable(np.array_split(make_problems(), 10))
+    solutions = stream.solve_g2(blocks, prefetch=2)
+    next(solutions)
+    assert blocks.pulled == 3
+    next(solutions)
+    assert blocks.pulled == 4
+    solutions.close()
+    assert blocks.pulled == 4
+
+
+def test_solve_g2_rejects_bad_blocks():
+    with pytest.raises(ValueError):
+        list(stream.solve_g2([np.zeros((3, 6))]))
+
+
+# --- Test Files ---
+
+
+def test_solve_g2_from_files(tmp_path):
+    problems = make_problems()
+    np.save(tmp_path / "problems.npy", problems)
+    np.savetxt(tmp_path / "problems.csv", problems, delimiter=",", header="x0,y0")
+    assert_same_solutions(
+        list(stream.solve_g2(str(tmp_path / "problems.npy"), chunksize=16)), problems
+    )
+    blocks = list(stream.read_csv(tmp_path / "problems.csv", chunksize=16, skiprows=1))
+    assert [len(b) for b in blocks] == [16, 16, 16, 2]
+    assert np.concatenate(blocks) == pytest.approx(problems, rel=1e-15)
+    np.save(tmp_path / "bad.npy", problems[:, :6])
+    with pytest.raises(ValueError):
+        list(stream.read_npy(tmp_path / "bad.npy"))
+
+
+@pytest.mark.parametrize("prefetch", [0, 1])
+def test_solve_g2_writes_store(tmp_path, prefetch):
+    problems = make_problems()
+    path = tmp_path / "solutions.clothoids"
+    solutions = list(
+        stream.solve_g2(np.array_split(problems, 3), prefetch=prefetch, out=str(path))
+    )
+    restored = store.load(str(path))
+    assert isinstance(restored, G2BatchSolution)
+    assert_same_solutions([restored], problems)
+    assert len(store.open(str(path)).Clothoids) == 3 * len(problems)
+    # Closing the stream early keeps the solutions yielded so far
+    partial = stream.solve_g2(np.array_split(problems, 5), prefetch=prefetch, out=path)
+    first = next(partial)
+    partial.close()
+    assert_same_solutions([store.load(str(path))], problems[: len(first)])
+    assert len(solutions) == 3
@@ -0,0 +1,99 @@
+import pytest
+import math
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pyclothoids import Clothoid, ClothoidPath, SolveG2, Tracker
+
+# --- Helper Functions ---
+
+
+def make_route():
+    return ClothoidPath(SolveG2(0, 0, 0, 0, 100, 50, math.pi / 2, 0))
+
+
+def drive(route, n, offset=0.5):
+    # Poses of a vehicle following the route at a constant lateral offset
+    s = np.linspace(0, route.length, n)
+    x, y, theta = route.Evaluate(s, ("X", "Y", "Theta"))
+    return s, np.stack([x - offset * np.sin(theta), y + offset * np.cos(theta)])
+
+
+# --- Test Tracking ---
+
+
+def test_tracker_matches_global_projection():
+    route = make_route()
+    s, xy = drive(route, 500)
+    tracker = Tracker(route, window=2.0)
+    for i in range(xy.shape[1]):
+        assert tracker.Update(xy[0, i], xy[1, i]) == pytest.approx((s[i], 0.5))
+    assert tracker.Position == pytest.approx((route.length, 0.5))
+    assert tracker.Updates == 500
+    assert tracker.Fallbacks == 1
+    assert tracker.UpdateMany(xy[:, ::-1]) == pytest.approx(route.ToFrenet(xy[:, ::-1]))
+
+
+def test_tracker_falls_back_on_jumps():
+    route = make_route()
+    tracker = Tracker(route, window=1.0)
+    tracker.Update(*route.ClosestPoint(0, 0))
+    # The point moved farther than the window
+    assert tracker.Update(route.X(50), route.Y(50)) == pytest.approx((50, 0))
+    assert tracker.Fallbacks == 2
+    # The point moved away from the curve, to a branch of it outside the window
+    tracker.Update(route.X(50.5), route.Y(50.5))
+    x, y = route.X(route.length), route.Y(route.length) - 0.5
+    assert tracker.Update(x, y) == pytest.approx(tuple(route.ToFrenet([x, y])))
+    assert tracker.Fallbacks == 3
+
+
+def test_tracker_reset():
+    clothoid = Clothoid.StandardParams(0, 0, 0, 0.1, 0.01, 20)
+    tracker = Tracker(clothoid, window=0.5)
+    assert tracker.Position is None
+    tracker.Update(clothoid.X(3), clothoid.Y(3))
+    tracker.Reset(10)
+    assert tracker.Position is None
+    assert tracker.Update(clothoid.X(10.2), clothoid.Y(10.2)) == pytest.approx(
+        (10.2, 0), abs=1e-9
+    )
+    assert tracker.Fallbacks == 1
+    tracker.Reset()
+    tracker.Update(clothoid.X(1), clothoid.Y(1))
+    assert tracker.Fallbacks == 2
+
+
+def test_tracker_beyond_the_ends():
+    line = Clothoid.StandardParams(0, 0, 0, 0, 0, 10)
+    tracker = Tracker(line)
+    assert tracker.Update(-1, 2) == pytest.approx((-1, 2))
+    assert tracker.Update(12, -1) == pytest.approx((12, -1))
+
+
+def test_tracker_copies_the_path():
+    route = make_route()
+    tracker = Tracker(route)
+    route.PushBackG1(200, 50, 0)
+    assert tracker.Update(200, 50)[0] == pytest.approx(
+        make_route().ToFrenet([[200], [50]])[0, 0]
+    )
+
+
+def test_tracker_shared_between_threads():
+    route = make_route()
+    _, xy = drive(route, 200)
+    tracker = Tracker(route)
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: tracker.UpdateMany(xy), range(8)))
+    assert tracker.Updates == 8 * 200
+    for frenet in results:
+        assert frenet == pytest.approx(route.ToFrenet(xy))
+
+
+def test_tracker_rejects_invalid_curves():
+    with pytest.raises(TypeError):
+        Tracker([Clothoid.StandardParams(0, 0, 0, 0, 0, 1)])
+    with pytest.raises(ValueError):
+        Tracker(ClothoidPath())
+    with pytest.raises(ValueError):
+        Tracker(Clothoid.StandardParams(0, 0, 0, 0, 0, 1), window=0)